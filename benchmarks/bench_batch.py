@@ -0,0 +1,44 @@
+"""
+Batch generate_names throughput against a per-call generate_*_name loop.
+
+Run from the repo root:  python -m benchmarks.bench_batch [--count N]
+"""
+import argparse
+import time
+
+from core import diagnostics, name_generators
+from core.name_batch import generate_names
+
+# grammar race key -> per-call public generator used as the baseline
+RACES = {
+    "elf": name_generators.generate_elven_name,
+    "infernal": name_generators.generate_infernal_name,
+    "draconic": name_generators.generate_dragonborn_name,
+    "gnomish": name_generators.generate_gnome_name,
+    "common": name_generators.generate_common_name,
+}
+
+
+def main():
+    diagnostics.set_sink(diagnostics.null_sink)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Names per batch.")
+    parser.add_argument("--loop-count", type=int, default=10_000, help="Per-call iterations (extrapolated).")
+    args = parser.parse_args()
+
+    print(f"{'race':<12} {'loop names/s':>14} {'batch names/s':>14} {'speedup':>9}")
+    for race, func in RACES.items():
+        start = time.perf_counter()
+        for _ in range(args.loop_count):
+            func()
+        loop_rate = args.loop_count / (time.perf_counter() - start)
+
+        generate_names(race, 10, seed=0) # Build the batch plan outside the timing
+        start = time.perf_counter()
+        generate_names(race, args.count, seed=0)
+        batch_rate = args.count / (time.perf_counter() - start)
+        print(f"{race:<12} {loop_rate:>14,.0f} {batch_rate:>14,.0f} {batch_rate / loop_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
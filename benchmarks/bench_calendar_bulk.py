@@ -0,0 +1,47 @@
+"""
+Vectorised Tivmir date conversion and formatting for timeline exports.
+
+Run from the repo root:  python -m benchmarks.bench_calendar_bulk [--count 10000000] [--years 2000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from core import calendar_bulk
+from core.calendar_tracker import CALENDAR
+
+
+def _timed(label, count, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:7.2f}s {count / elapsed / 1e6:8.2f} M dates/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000_000)
+    parser.add_argument("--years", type=int, default=2000, help="Timeline length the dates are spread over.")
+    parser.add_argument("--format-count", type=int, help="Dates to format as strings (default: --count).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ordinals = rng.integers(0, args.years * CALENDAR.year_days, args.count)
+    years, months, days = _timed("ordinals -> dates", args.count, calendar_bulk.ordinals_to_dates, ordinals)
+    round_trip = _timed("dates -> ordinals", args.count, calendar_bulk.dates_to_ordinals, years, months, days)
+    assert (round_trip == ordinals).all()
+    n = min(args.format_count or args.count, args.count)
+    _timed("format strings", n, calendar_bulk.format_dates, years[:n], months[:n], days[:n])
+
+    sample = ordinals[:100_000].tolist()
+    start = time.perf_counter()
+    for ordinal in sample:
+        CALENDAR.format(CALENDAR.from_ordinal(ordinal))
+    elapsed = time.perf_counter() - start
+    print(f"{'scalar engine (100k)':<28} {elapsed:7.2f}s {len(sample) / elapsed / 1e6:8.2f} M dates/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Cold-start time of `import core; core.generate_npc()` in a fresh interpreter.
+
+Run from the repo root:  python -m benchmarks.bench_cold_start [--runs N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Timed inside the child so interpreter start-up itself is excluded
+_CHILD = (
+    "import time; t = time.perf_counter(); "
+    "import core; core.generate_npc(); "
+    "import sys; print((time.perf_counter() - t) * 1000, 'streamlit' in sys.modules)"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to start.")
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", _CHILD], capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(out[0]))
+        if out[1] == "True":
+            print("warning: streamlit was imported by core")
+    print(f"median {statistics.median(timings):.1f} ms, min {min(timings):.1f} ms, max {max(timings):.1f} ms over {args.runs} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Roster annotation throughput: split generated names back into their parts.
+
+Run from the repo root:  python -m benchmarks.bench_decompose [--count N] [--race drow]
+"""
+import argparse
+import time
+
+from core import diagnostics
+from core.name_generators import GRAMMARS
+from core.name_index import name_index
+
+
+def main():
+    diagnostics.set_sink(diagnostics.null_sink)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000, help="Names per race.")
+    parser.add_argument("--race", action="append", help="Grammar race keys (default: every race).")
+    args = parser.parse_args()
+
+    print(f"{'race':<14} {'build ms':>9} {'names/s':>11} {'unsplit':>8}")
+    for race_key in args.race or list(GRAMMARS):
+        grammar = GRAMMARS[race_key]
+        names = [grammar.sample("Any", i)["name"] for i in range(args.count)]
+        start = time.perf_counter()
+        index = name_index(race_key)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        unsplit = sum(1 for result in index.annotate(names, rng=0) if result.error)
+        elapsed = time.perf_counter() - start
+        print(f"{race_key:<14} {built * 1000:>9.1f} {len(names) / elapsed:>11,.0f} {unsplit:>8}")
+
+
+if __name__ == "__main__":
+    main()
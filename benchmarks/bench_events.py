@@ -0,0 +1,45 @@
+"""
+Calendar event store: bulk load, range queries and next-occurrence lookups.
+
+Run from the repo root:  python -m benchmarks.bench_events [--events 300000] [--years 800]
+"""
+import argparse
+import random
+import time
+
+from core.calendar_events import EventStore
+from core.calendar_tracker import CALENDAR
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=300_000, help="One-off events to load.")
+    parser.add_argument("--years", type=int, default=800, help="Timeline length the events are spread over.")
+    parser.add_argument("--queries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    span = args.years * CALENDAR.year_days
+    events = [(f"event {i % 1000}", start, start + rng.choice((0, 0, 0, 2, 10, 90, 3650)), "campaign")
+              for i, start in enumerate(rng.choices(range(span), k=args.events))]
+    store = EventStore(CALENDAR)
+    start = time.perf_counter()
+    store.add_many(events)
+    store.add_recurring("Market Day", "interval", category="market", every=7)
+    store.add_recurring("Midyear Festival", "yearly", category="festival", month_index=5, day=21, duration=3)
+    print(f"load {args.events:,} events: {time.perf_counter() - start:.2f}s")
+
+    for days in (1, 30, 365):
+        start = time.perf_counter()
+        hits = sum(len(store.between(low, low + days)) for low in (rng.randrange(span) for _ in range(args.queries)))
+        elapsed = time.perf_counter() - start
+        print(f"{days:>4}-day range: {elapsed / args.queries * 1e6:8.1f} us/query ({hits / args.queries:.1f} hits)")
+
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        store.next_occurrence(f"event {rng.randrange(1000)}", rng.randrange(span))
+    print(f"next occurrence: {(time.perf_counter() - start) / args.queries * 1e6:8.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Per-name latency of every public generate_*_name function.
+
+Run from the repo root:  python -m benchmarks.bench_names [--repeat N]
+"""
+import argparse
+import inspect
+import time
+
+from core import diagnostics, name_generators
+
+
+def public_generators():
+    """Yields (name, zero-arg callable) for every generate_*_name function."""
+    for name, func in sorted(inspect.getmembers(name_generators, inspect.isfunction)):
+        if not name.startswith("generate_") or not name.endswith("_name") or name == "generate_name":
+            continue # generate_name is the by-race dispatcher, not a race generator
+        if "selected_clan" in inspect.signature(func).parameters:
+            yield name, lambda f=func: f("Noste")
+        else:
+            yield name, func
+
+
+def time_per_call(func, repeat):
+    """Best-of-3 mean latency in microseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1e6
+
+
+def main():
+    diagnostics.set_sink(diagnostics.null_sink)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="Calls per timing round.")
+    args = parser.parse_args()
+
+    print(f"{'generator':<32} {'us/name':>10}")
+    total = 0.0
+    count = 0
+    for name, func in public_generators():
+        latency = time_per_call(func, args.repeat)
+        total += latency
+        count += 1
+        print(f"{name:<32} {latency:>10.2f}")
+    print(f"{'mean':<32} {total / max(count, 1):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
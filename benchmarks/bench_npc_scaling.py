@@ -0,0 +1,41 @@
+"""
+generate_npcs throughput from 1 worker up to every core.
+
+Run from the repo root:  python -m benchmarks.bench_npc_scaling [--count N] [--workers 1,2,4]
+"""
+import argparse
+import os
+import time
+
+from core import diagnostics
+from core.npc_batch import generate_npc_chunks
+
+
+def main():
+    diagnostics.set_sink(diagnostics.null_sink)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="NPCs per run.")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", help="Comma-separated worker counts (default: 1, 2, 4, ... up to every core).")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(",")]
+    else:
+        worker_counts = sorted({min(2 ** i, cores) for i in range(cores.bit_length() + 1)})
+
+    print(f"{cores} cores, {args.count:,} NPCs, chunks of {args.chunk_size:,}")
+    print(f"{'workers':>7} {'seconds':>9} {'NPCs/s':>11} {'speedup':>8}")
+    base_rate = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        produced = sum(len(chunk) for chunk in generate_npc_chunks(args.count, workers, seed=0, chunk_size=args.chunk_size))
+        elapsed = time.perf_counter() - start
+        rate = produced / elapsed
+        base_rate = base_rate or rate
+        print(f"{workers:>7} {elapsed:>9.2f} {rate:>11,.0f} {rate / base_rate:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
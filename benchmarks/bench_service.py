@@ -0,0 +1,87 @@
+"""
+Latency and throughput of the HTTP service under a local load generator.
+
+Run from the repo root:  python -m benchmarks.bench_service [--clients 64] [--requests 5000] [--windows 0,0.002]
+By default each window gets its own in-process server on a free port, so the
+load generator shares the CPU with it; pass --port to load an already-running
+`python -m core.service` instead.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from core import data_loader, diagnostics
+from core.service import GenerationService
+
+
+async def _client(host, port, body, count, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (f"POST /names HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(next(line.split(b":")[1] for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")))
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            status = int(head.split(b" ", 2)[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def _load(host, port, clients, requests, body):
+    latencies, statuses = [], {}
+    per_client = [requests // clients + (i < requests % clients) for i in range(clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, body, n, latencies, statuses) for n in per_client if n))
+    return time.perf_counter() - start, sorted(latencies), statuses
+
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+async def _run(args, body):
+    windows = [float(w) for w in args.windows.split(",")] if args.port is None else [None]
+    print(f"{args.clients} clients, {args.requests:,} requests of {args.count} name(s)")
+    print(f"{'window ms':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'batches':>8}  statuses")
+    for window in windows:
+        service = None
+        port = args.port
+        if window is not None:
+            service = GenerationService(window)
+            await service.start("127.0.0.1", 0)
+            port = service.port
+        try:
+            elapsed, latencies, statuses = await _load(args.host, port, args.clients, args.requests, body)
+        finally:
+            batches = service.batcher.batches if service else "-"
+            if service:
+                await service.close()
+        label = f"{window * 1000:.1f}" if window is not None else "remote"
+        print(f"{label:>9} {len(latencies) / elapsed:>9,.0f} {_percentile(latencies, 0.5):>8.2f} "
+              f"{_percentile(latencies, 0.95):>8.2f} {_percentile(latencies, 0.99):>8.2f} {batches:>8}  {statuses}")
+
+
+def main():
+    diagnostics.set_sink(diagnostics.null_sink)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent keep-alive connections.")
+    parser.add_argument("--requests", type=int, default=5000, help="Total requests per run.")
+    parser.add_argument("--count", type=int, default=1, help="Names per request.")
+    parser.add_argument("--race", default="Elf")
+    parser.add_argument("--windows", default="0,0.0005,0.002", help="Comma-separated batching windows in seconds.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Load an external service on this port instead.")
+    args = parser.parse_args()
+    data_loader.preload()
+    body = json.dumps({"race": args.race, "count": args.count}).encode("utf-8")
+    asyncio.run(_run(args, body))
+
+
+if __name__ == "__main__":
+    main()
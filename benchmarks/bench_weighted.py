@@ -0,0 +1,129 @@
+"""
+Weighted part selection: alias-table draw cost against the alternatives, plus distribution checks.
+
+Run from the repo root:  python -m benchmarks.bench_weighted [--draws N]
+
+Timings compare one draw from lists of growing size: uniform rng.choice,
+random.choices(weights=...) (O(n) per draw), random.choices(cum_weights=...)
+(a cached cumulative table plus bisect) and AliasTable.draw. The checks draw
+from skewed weights (zeros included) through AliasTable, a compiled grammar
+slot, a NamePartTable core and the batch pools, and compare the counts with
+the weights by a chi-square test; any failure exits with status 1.
+"""
+import argparse
+import itertools
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from core import diagnostics
+from core.name_batch import _Pools
+from core.name_grammar import compile_grammar
+from core.name_helpers import NamePartTable, alias_table
+
+SIZES = (10, 1_000, 100_000)
+Z_999 = 3.090 # Standard normal quantile for p = 0.001
+
+
+def chi_square_limit(dof):
+    """Wilson-Hilferty approximation of the chi-square critical value at p = 0.001."""
+    k = 2 / (9 * dof)
+    return dof * (1 - k + Z_999 * math.sqrt(k)) ** 3
+
+
+def check(label, counts, weights):
+    """Prints and returns whether counts fit weights; a zero-weight entry drawn even once fails."""
+    total, weight_sum = sum(counts), sum(weights)
+    if any(c for c, w in zip(counts, weights) if w == 0):
+        print(f"FAIL {label}: drew a zero-weight entry")
+        return False
+    cells = [(c, total * w / weight_sum) for c, w in zip(counts, weights) if w > 0]
+    statistic = sum((c - e) ** 2 / e for c, e in cells)
+    limit = chi_square_limit(len(cells) - 1)
+    ok = statistic <= limit
+    print(f"{'ok  ' if ok else 'FAIL'} {label:<34} chi2 {statistic:>8.1f} (limit {limit:.1f}, {len(cells) - 1} dof)")
+    return ok
+
+
+def _parts(weights, **fields):
+    return [dict(text=f"p{i}", weight=w, **fields) for i, w in enumerate(weights)]
+
+
+def run_checks(draws):
+    weights = [1, 0, 5, 0.5, 12, 3, 1, 0, 7.25, 2]
+    index = {f"p{i}": i for i in range(len(weights))}
+    results = []
+
+    table = alias_table(_parts(weights))
+    rng = random.Random(1)
+    counts = [0] * len(weights)
+    for _ in range(draws):
+        counts[table.draw(rng)] += 1
+    results.append(check("AliasTable.draw", counts, weights))
+
+    grammar = compile_grammar("weighted", "Weighted", "names(nogloss)", {"names": _parts(weights)})
+    counts = [0] * len(weights)
+    for i in range(draws):
+        counts[index[grammar.sample("Any", i)["name"]]] += 1
+    results.append(check("grammar slot (per-call seeds)", counts, weights))
+
+    prefixes = _parts(weights, ends_vowel=False)
+    suffixes = [{"text": "a", "starts_vowel": True, "gender": "Unisex"}]
+    core = NamePartTable(prefixes, [], suffixes)
+    rng = random.Random(2)
+    counts = [0] * len(weights)
+    for _ in range(draws):
+        counts[index[core.draw("Any", rng)[0]["text"]]] += 1
+    results.append(check("NamePartTable prefixes", counts, weights))
+
+    unweighted = [{"text": f"u{i}"} for i in range(4)]
+    pools = _Pools([_parts(weights), unweighted], [table, None])
+    rng = np.random.default_rng(3)
+    selector = rng.integers(0, 2, draws)
+    drawn = pools.draw(rng, selector)
+    counts = np.bincount(drawn, minlength=len(pools.texts)).tolist()
+    results.append(check("batch pools (weighted list)", counts[:len(weights)], weights))
+    results.append(check("batch pools (unweighted list)", counts[len(weights):], [1] * len(unweighted)))
+    return all(results)
+
+
+def _per_draw_ns(func, draws):
+    start = time.perf_counter()
+    for _ in itertools.repeat(None, draws):
+        func()
+    return (time.perf_counter() - start) / draws * 1e9
+
+
+def run_timings(draws):
+    print(f"{'entries':>8} {'choice ns':>10} {'choices ns':>11} {'bisect ns':>10} {'alias ns':>9} {'build ms':>9}")
+    rng = random.Random(0)
+    for size in SIZES:
+        entries = _parts([rng.uniform(0.1, 10) for _ in range(size)])
+        weights = [e["weight"] for e in entries]
+        cum_weights = list(itertools.accumulate(weights))
+        start = time.perf_counter()
+        table = alias_table(entries)
+        build_ms = (time.perf_counter() - start) * 1000
+        n = max(100, draws // max(1, size // 100)) # The O(n) draw gets fewer rounds on big lists
+        print(f"{size:>8,} {_per_draw_ns(lambda: rng.choice(entries), draws):>10,.0f}"
+              f" {_per_draw_ns(lambda: rng.choices(entries, weights), n):>11,.0f}"
+              f" {_per_draw_ns(lambda: rng.choices(entries, cum_weights=cum_weights), draws):>10,.0f}"
+              f" {_per_draw_ns(lambda: entries[table.draw(rng)], draws):>9,.0f} {build_ms:>9.2f}")
+
+
+def main():
+    diagnostics.set_sink(diagnostics.null_sink)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--draws", type=int, default=200_000, help="Draws per check and per timing.")
+    args = parser.parse_args()
+
+    run_timings(args.draws)
+    print()
+    return 0 if run_checks(args.draws) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Benchmark suite over the real and synthetically scaled corpora, with JSON baselines and a regression gate.
+
+Run from the repo root:
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json [--threshold 0.25]
+
+Each corpus is measured in a fresh interpreter: the real data/ ("x1") and a
+copy with every part list scaled by each --scales factor ("x10", "x100", ...;
+see synthetic_corpus.py). Metrics are microseconds per call unless the name
+ends in _ms. Comparing against a baseline exits with status 1 when any metric
+in it is slower than its threshold allows, or is missing from the results (a
+renamed or dropped benchmark; --allow-missing only reports those). Baselines
+are machine-specific: record them on the machine that runs the check. A
+baseline's optional "thresholds" object maps metric name patterns (fnmatch) to
+the allowed slowdown for noisier metrics, e.g. {"*/cold.*": 0.5}; it is kept
+when the baseline is re-saved.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_THRESHOLD = 0.25 # Allowed slowdown before a metric counts as a regression (0.25 = 25%)
+DEFAULT_SCALES = (10, 100)
+
+# Cold start: a fresh interpreter importing data_loader and loading every file
+_COLD_CHILD = (
+    "import sys, time; t = time.perf_counter(); import core.data_loader as d; i = time.perf_counter(); "
+    "d.DATA_DIR = sys.argv[1]; d.preload(); p = time.perf_counter(); "
+    "print((i - t) * 1000, (p - i) * 1000)"
+)
+
+
+def _best_mean_us(func, repeat, rounds=3):
+    """Best-of-rounds mean latency in microseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1e6
+
+
+def measure(repeat, include_calendar):
+    """Warm per-call metrics for whatever data directory data_loader points at (run in the child)."""
+    import random
+    from core import diagnostics, data_loader, name_helpers, npc_generator
+    from benchmarks.bench_names import public_generators
+    diagnostics.set_sink(diagnostics.null_sink)
+    metrics = {}
+
+    start = time.perf_counter()
+    generators = list(public_generators())
+    for _, func in generators:
+        func() # First call compiles the race's grammar
+    metrics["names.first_calls_ms"] = (time.perf_counter() - start) * 1000
+    for name, func in generators:
+        metrics[f"name.{name}"] = _best_mean_us(func, repeat)
+
+    metrics["npc.generate_npc"] = _best_mean_us(npc_generator.generate_npc, repeat)
+
+    elf = data_loader.name_data["elf"]
+    rng = random.Random(1)
+    metrics["name_helpers._assemble_name_parts"] = _best_mean_us(
+        lambda: name_helpers._assemble_name_parts(elf["prefixes"], elf["middles"], elf["suffixes"], rng=rng),
+        max(1, repeat // 10)) # Validates the lists on every call, so it grows with the corpus
+    parts = [elf["prefixes"][0], elf["suffixes"][0]]
+    metrics["name_helpers._generate_poetic_meaning"] = _best_mean_us(
+        lambda: name_helpers._generate_poetic_meaning(parts, elf["gloss"], rng), repeat)
+
+    if include_calendar:
+        from core import calendar_tracker
+        state = {}
+        calendar_tracker.initialize_calendar_state(state, 1478, 0, 1)
+        metrics["calendar.advance_day_1"] = _best_mean_us(lambda: calendar_tracker.advance_day(state, 1), repeat)
+        metrics["calendar.advance_day_1e6"] = _best_mean_us(lambda: calendar_tracker.advance_day(state, 10 ** 6), repeat)
+        metrics["calendar.advance_day_-1e6"] = _best_mean_us(lambda: calendar_tracker.advance_day(state, -10 ** 6), repeat)
+    return metrics
+
+
+def _child_main(data_dir, repeat, include_calendar):
+    start = time.perf_counter()
+    from core import data_loader
+    data_loader.DATA_DIR = data_dir
+    data_loader.preload()
+    metrics = {"data.preload_ms": (time.perf_counter() - start) * 1000}
+    metrics.update(measure(repeat, include_calendar))
+    print(json.dumps(metrics))
+
+
+def _run_child(data_dir, repeat, include_calendar):
+    command = [sys.executable, "-m", "benchmarks.suite", "--child", data_dir, "--repeat", str(repeat)]
+    if include_calendar:
+        command.append("--calendar")
+    out = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _cold_start(data_dir, runs):
+    imports, preloads = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _COLD_CHILD, data_dir], capture_output=True, text=True, check=True).stdout.split()
+        imports.append(float(out[0]))
+        preloads.append(float(out[1]))
+    return {"cold.import_data_loader_ms": statistics.median(imports), "cold.preload_ms": statistics.median(preloads)}
+
+
+def run_suite(scales, repeat, cold_runs, corpus_dir=None, log=print):
+    """{"x<scale>/<metric>": value} for the real corpus and every synthetic scale."""
+    from core.data_loader import DATA_DIR
+    from benchmarks.synthetic_corpus import build_scaled_corpus
+    results = {}
+    owned_dir = corpus_dir is None
+    corpus_dir = corpus_dir or tempfile.mkdtemp(prefix="tivmir_bench_")
+    try:
+        for scale in (1,) + tuple(scales):
+            if scale == 1:
+                data_dir = DATA_DIR
+            else:
+                data_dir = os.path.join(corpus_dir, f"x{scale}")
+                if not os.path.isdir(data_dir):
+                    log(f"building x{scale} corpus...")
+                    build_scaled_corpus(scale, data_dir)
+                    _cold_start(data_dir, 1) # Builds its compiled corpus, so cold runs below measure loading, not building
+            log(f"measuring x{scale}...")
+            metrics = _run_child(data_dir, repeat, include_calendar=scale == 1)
+            metrics.update(_cold_start(data_dir, cold_runs))
+            results.update({f"x{scale}/{name}": value for name, value in metrics.items()})
+    finally:
+        if owned_dir:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+    return results
+
+
+# === Baselines ===
+
+def load_baseline(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, metrics, args):
+    thresholds = {}
+    if os.path.exists(path):
+        thresholds = load_baseline(path).get("thresholds", {})
+    baseline = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPU",
+        "scales": list(args.scales),
+        "repeat": args.repeat,
+        "thresholds": thresholds,
+        "metrics": {name: round(value, 3) for name, value in sorted(metrics.items())},
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def threshold_for(name, thresholds, default):
+    for pattern, value in thresholds.items():
+        if fnmatch.fnmatchcase(name, pattern):
+            return value
+    return default
+
+
+def compare(metrics, baseline, default_threshold, allow_missing=False):
+    """
+    [(name, baseline value, current value or None, allowed slowdown, regressed)] for every
+    baseline metric. A metric missing from metrics (renamed or dropped) counts as regressed
+    unless allow_missing.
+    """
+    thresholds = baseline.get("thresholds", {})
+    rows = []
+    for name, before in sorted(baseline["metrics"].items()):
+        allowed = threshold_for(name, thresholds, default_threshold)
+        after = metrics.get(name)
+        if after is None:
+            regressed = not allow_missing
+        else:
+            regressed = before > 0 and after > before * (1 + allowed)
+        rows.append((name, before, after, allowed, regressed))
+    return rows
+
+
+def print_metrics(metrics):
+    width = max(len(name) for name in metrics)
+    for name, value in sorted(metrics.items()):
+        print(f"{name:<{width}} {value:>12,.2f}")
+
+
+def print_comparison(rows):
+    width = max(len(row[0]) for row in rows)
+    print(f"{'metric':<{width}} {'baseline':>12} {'current':>12} {'change':>8} {'allowed':>8}")
+    for name, before, after, allowed, regressed in rows:
+        if after is None:
+            print(f"{name:<{width}} {before:>12,.2f} {'missing':>12}{'  MISSING' if regressed else ''}")
+            continue
+        change = (after / before - 1) * 100 if before else 0.0
+        flag = "  REGRESSED" if regressed else ""
+        print(f"{name:<{width}} {before:>12,.2f} {after:>12,.2f} {change:>+7.1f}% {allowed * 100:>7.0f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=lambda s: tuple(int(x) for x in s.split(",") if x), default=DEFAULT_SCALES,
+                        help="Comma-separated synthetic corpus factors (e.g. 10,100,1000; empty for the real data only).")
+    parser.add_argument("--repeat", type=int, default=500, help="Calls per timing round.")
+    parser.add_argument("--cold-runs", type=int, default=5, help="Fresh interpreters per cold-start median.")
+    parser.add_argument("--corpus-dir", help="Keep synthetic corpora here and reuse them across runs.")
+    parser.add_argument("--only", help="Only report and gate metrics matching this fnmatch pattern.")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results as a baseline.")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against this baseline; exit 1 on regressions.")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="Don't fail when a baseline metric is absent from the results (e.g. a renamed benchmark).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown, e.g. 0.25 for 25%%.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--calendar", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child_main(args.child, args.repeat, args.calendar)
+        return 0
+
+    log = (lambda message: print(message, file=sys.stderr)) if args.json else print
+    metrics = run_suite(args.scales, args.repeat, args.cold_runs, args.corpus_dir, log)
+    if args.only:
+        metrics = {name: value for name, value in metrics.items() if fnmatch.fnmatchcase(name, args.only)}
+    if args.json:
+        print(json.dumps(metrics, indent=2))
+    else:
+        print_metrics(metrics)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, metrics, args)
+        log(f"Saved baseline to {args.save_baseline}")
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        if args.only:
+            baseline["metrics"] = {n: v for n, v in baseline["metrics"].items() if fnmatch.fnmatchcase(n, args.only)}
+        rows = compare(metrics, baseline, args.threshold, args.allow_missing)
+        print()
+        print_comparison(rows)
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond the allowed slowdown or missing: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Writes a copy of data/ with every name-part list scaled up by a factor.
+
+Run from the repo root:  python -m benchmarks.synthetic_corpus --factor 100 --out /tmp/tivmir_x100
+"""
+import argparse
+import json
+import os
+import shutil
+
+from core.data_loader import DATA_DIR
+
+_CODE_LETTERS = "bcdfghjklmnprstvz" # Consonants only, so inserted codes never create vowel clusters
+
+
+def _code(number):
+    """Short consonant string unique to number (number >= 1)."""
+    letters = []
+    while number:
+        number, digit = divmod(number - 1, len(_CODE_LETTERS))
+        letters.append(_CODE_LETTERS[digit])
+    return "".join(letters)
+
+
+def _is_part_list(value):
+    return isinstance(value, list) and value and all(isinstance(e, dict) and isinstance(e.get("text"), str) for e in value)
+
+
+def scale_parts(entries, factor):
+    """
+    entries plus factor - 1 copies of each with a code inserted into the text.
+    The code goes after the first letter, so starts_vowel/ends_vowel still hold;
+    meanings and genders are kept, so glosses still resolve.
+    """
+    scaled = list(entries)
+    for copy in range(1, factor):
+        code = _code(copy)
+        for entry in entries:
+            text = entry["text"]
+            new_entry = dict(entry)
+            if len(text) > 1:
+                new_entry["text"] = text[:1] + code + text[1:]
+            else:
+                new_entry["text"] = text + code
+                if "ends_vowel" in entry:
+                    new_entry["ends_vowel"] = False
+            scaled.append(new_entry)
+    return scaled
+
+
+def build_scaled_corpus(factor, out_dir, data_dir=DATA_DIR):
+    """Writes data_dir's JSON files to out_dir with each part list scaled by factor. Returns the bytes written."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = 0
+    for filename in sorted(f for f in os.listdir(data_dir) if f.endswith(".json")):
+        path = os.path.join(data_dir, filename)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        out_path = os.path.join(out_dir, filename)
+        if _is_part_list(data) and factor > 1:
+            with open(out_path, "w", encoding="utf-8") as f:
+                json.dump(scale_parts(data, factor), f, ensure_ascii=False)
+        else:
+            shutil.copyfile(path, out_path)
+        written += os.path.getsize(out_path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--factor", type=int, default=10, help="Copies of each part list entry (10, 100, 1000...).")
+    parser.add_argument("--out", required=True, help="Directory to write the scaled data files to.")
+    args = parser.parse_args()
+    written = build_scaled_corpus(args.factor, args.out)
+    print(f"Wrote {args.out}: {written / 2 ** 20:,.1f} MiB at {args.factor}x")
+
+
+if __name__ == "__main__":
+    main()
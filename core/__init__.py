@@ -0,0 +1,34 @@
+"""
+Headless Tivmir World Tools: name, NPC and calendar generators with no
+Streamlit dependency. The Streamlit app, CLI tools and worker processes all
+import from here. Diagnostics go through core.diagnostics (logging by default).
+"""
+from . import diagnostics
+from .seeding import make_rng, stream_seed, stream_rng, stream_rngs
+from .name_generators import (
+    GRAMMARS, NameResult,
+    generate_elven_name, generate_orc_name, generate_infernal_name,
+    generate_tabaxi_name, generate_drow_name, generate_dragonborn_name,
+    generate_aarakocra_name, generate_owlin_name, generate_tortle_name,
+    generate_triton_name, generate_fire_genasi_name, generate_earth_genasi_name,
+    generate_air_genasi_name, generate_water_genasi_name, generate_eladrin_name,
+    generate_kenku_name, generate_lizardfolk_name, generate_yuan_ti_name,
+    generate_goblin_name, generate_gnome_name, generate_halfling_name,
+    generate_goliath_name, generate_minotaur_name, generate_bugbear_name,
+    generate_harengon_name, generate_leonin_name, generate_loxodon_name,
+    generate_aasimar_name, generate_shifter_name, generate_githyanki_name,
+    generate_common_name,
+)
+from .npc_generator import NPC, generate_npc, generate_npc_range
+from .name_index import NameIndex, name_index, decompose_name, annotate_roster
+
+
+def __getattr__(name):
+    # The batch APIs need numpy / multiprocessing; import them only when someone asks
+    if name == "generate_names":
+        from .name_batch import generate_names
+        return generate_names
+    if name in ("generate_npcs", "generate_npc_chunks"):
+        from . import npc_batch
+        return getattr(npc_batch, name)
+    raise AttributeError(f"module 'core' has no attribute {name!r}")
@@ -0,0 +1,4 @@
+# `python -m core ...` runs the tivmir-gen command line (see cli.py)
+from .cli import main
+
+main()
@@ -0,0 +1,141 @@
+import numpy as np
+from .calendar_engine import LeapRule
+
+# === Bulk Date Conversion ===
+# Vectorised counterparts of CalendarEngine.from_ordinal / to_ordinal / format
+# for timeline exports of millions of dates. Years come from one division by
+# the mean year length plus a +-1 correction, months from searchsorted over the
+# cumulative month table (the leap-year table for leap-year rows), and strings
+# are assembled column-wise from per-unique-value pieces, so the per-date
+# Python work is a few C-level object concatenations.
+
+
+def _calendar(calendar):
+    if calendar is None:
+        from .calendar_tracker import CALENDAR # Deferred: only callers without their own engine load calendar data
+        calendar = CALENDAR
+    if calendar is None:
+        raise ValueError("Calendar data not loaded.")
+    return calendar
+
+
+def _leaps_before(leap, years):
+    """Vectorised leap.leaps_before; LeapRule in closed form, other rules element by element."""
+    if isinstance(leap, LeapRule):
+        count = -(-years // leap.every)
+        if leap.skip_every:
+            count -= -(-years // leap.skip_every)
+            if leap.keep_every:
+                count += -(-years // leap.keep_every)
+        return count
+    return np.frompyfunc(leap.leaps_before, 1, 1)(years).astype(np.int64)
+
+
+def _is_leap(leap, years):
+    if isinstance(leap, LeapRule):
+        leap_years = years % leap.every == 0
+        if leap.skip_every:
+            skipped = years % leap.skip_every == 0
+            if leap.keep_every:
+                skipped &= years % leap.keep_every != 0
+            leap_years &= ~skipped
+        return leap_years
+    return np.frompyfunc(leap.is_leap, 1, 1)(years).astype(bool)
+
+
+def year_starts(years, calendar=None):
+    """Ordinal of the first day of each year."""
+    calendar = _calendar(calendar)
+    years = np.asarray(years, dtype=np.int64)
+    starts = years * calendar.year_days
+    if calendar.leap is not None:
+        starts += _leaps_before(calendar.leap, years) * calendar.leap.extra_days
+    return starts
+
+
+def ordinals_to_dates(ordinals, calendar=None):
+    """(years, month_indices, days) int64 arrays for an array of day ordinals."""
+    calendar = _calendar(calendar)
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    years = np.floor_divide(ordinals, calendar.mean_year).astype(np.int64)
+    starts = year_starts(years, calendar)
+    # The mean-year estimate is at most a year or so out; step each row into place
+    while True:
+        early = starts > ordinals
+        if not early.any():
+            break
+        years[early] -= 1
+        starts[early] = year_starts(years[early], calendar)
+    while True:
+        next_starts = year_starts(years + 1, calendar)
+        late = next_starts <= ordinals
+        if not late.any():
+            break
+        years[late] += 1
+        starts[late] = next_starts[late]
+    day_of_year = ordinals - starts
+
+    # cumulative[m] is the day of the year month m starts on; searching the inner boundaries gives the month
+    cumulative = np.asarray(calendar.month_starts(), dtype=np.int64)
+    months = np.searchsorted(cumulative[1:-1], day_of_year, side="right")
+    month_starts = cumulative[months]
+    if calendar.leap is not None:
+        leap_rows = _is_leap(calendar.leap, years)
+        if leap_rows.any():
+            leap_cumulative = np.asarray(calendar.month_starts(leap_year=True), dtype=np.int64)
+            months[leap_rows] = np.searchsorted(leap_cumulative[1:-1], day_of_year[leap_rows], side="right")
+            month_starts[leap_rows] = leap_cumulative[months[leap_rows]]
+    return years, months, day_of_year - month_starts + 1
+
+
+def dates_to_ordinals(years, month_indices, days, calendar=None):
+    """Day ordinals for arrays of (year, month_index, day). Raises ValueError for dates that don't exist."""
+    calendar = _calendar(calendar)
+    years = np.asarray(years, dtype=np.int64)
+    month_indices = np.asarray(month_indices, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    if ((month_indices < 0) | (month_indices >= len(calendar.month_names))).any():
+        raise ValueError("Month index out of range.")
+    cumulative = np.asarray(calendar.month_starts(), dtype=np.int64)
+    month_starts = cumulative[month_indices]
+    month_lengths = cumulative[month_indices + 1] - month_starts
+    if calendar.leap is not None:
+        leap_rows = _is_leap(calendar.leap, years)
+        leap_cumulative = np.asarray(calendar.month_starts(leap_year=True), dtype=np.int64)
+        month_starts = np.where(leap_rows, leap_cumulative[month_indices], month_starts)
+        month_lengths = month_lengths + (leap_rows & (month_indices == calendar.leap.month_index)) * calendar.leap.extra_days
+    if ((days < 1) | (days > month_lengths)).any():
+        raise ValueError("Day out of range for its month.")
+    return year_starts(years, calendar) + month_starts + days - 1
+
+
+def _format_columns(calendar, years, month_indices, days):
+    month_prefixes = np.array([f"{name} " for name in calendar.month_names], dtype=object)
+    longest_month = max(calendar.month_days) + (calendar.leap.extra_days if calendar.leap is not None else 0)
+    day_strings = np.array([f"{day}, " for day in range(longest_month + 1)], dtype=object)
+    # Timelines repeat years heavily; format each distinct year once
+    unique_years, year_rows = np.unique(years, return_inverse=True)
+    year_strings = np.array([f"{year} {calendar.year_suffix}" for year in unique_years.tolist()], dtype=object)
+    return month_prefixes[month_indices] + day_strings[days] + year_strings[year_rows]
+
+
+def _format(calendar, ordinals, dates=None):
+    if ordinals.size:
+        low, high = int(ordinals.min()), int(ordinals.max())
+        if high - low < ordinals.size: # Dense timeline: format every day in the span once, then index
+            table = _format_columns(calendar, *ordinals_to_dates(np.arange(low, high + 1), calendar))
+            return table[ordinals - low]
+    return _format_columns(calendar, *(dates if dates is not None else ordinals_to_dates(ordinals, calendar)))
+
+
+def format_dates(years, month_indices, days, calendar=None):
+    """'Month Day, Year LD' strings (as get_current_date_string formats them), as an object array."""
+    calendar = _calendar(calendar)
+    dates = tuple(np.asarray(column, dtype=np.int64) for column in (years, month_indices, days))
+    return _format(calendar, dates_to_ordinals(*dates, calendar=calendar), dates)
+
+
+def format_ordinals(ordinals, calendar=None):
+    """format_dates for an array of day ordinals."""
+    calendar = _calendar(calendar)
+    return _format(calendar, np.asarray(ordinals, dtype=np.int64))
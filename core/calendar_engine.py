@@ -0,0 +1,171 @@
+from bisect import bisect_right
+
+# === Calendar Arithmetic ===
+# Dates are (year, month_index, day) tuples with day starting at 1. Every date
+# also has an ordinal: the number of days since month 0, day 1 of year 0
+# (negative before that). Converting either way is O(1) arithmetic over a
+# cumulative month-length table, so jumping a thousand years costs the same as
+# jumping one day.
+
+WEEK_LENGTH = 7
+
+
+class LeapRule:
+    """
+    Gregorian-style leap years: every `every` years, except every `skip_every`
+    years, except again every `keep_every` years. A leap year adds `extra_days`
+    to month `month_index`. Any object with the same is_leap/leaps_before
+    methods can be passed to CalendarEngine instead.
+    """
+    __slots__ = ("month_index", "every", "skip_every", "keep_every", "extra_days")
+
+    def __init__(self, month_index, every, skip_every=None, keep_every=None, extra_days=1):
+        if every <= 0 or (skip_every is not None and skip_every <= 0) or (keep_every is not None and keep_every <= 0):
+            raise ValueError("Leap year periods ('every', 'skip_every', 'keep_every') must be positive.")
+        if extra_days < 1:
+            raise ValueError("A leap year must add at least one day.")
+        self.month_index = month_index
+        self.every = every
+        self.skip_every = skip_every
+        self.keep_every = keep_every
+        self.extra_days = extra_days
+
+    def is_leap(self, year):
+        if year % self.every:
+            return False
+        if self.skip_every and not year % self.skip_every:
+            return bool(self.keep_every) and not year % self.keep_every
+        return True
+
+    def leaps_before(self, year):
+        """Leap years in [0, year) (negative for years before 0)."""
+        def multiples(period): # Multiples of period in [0, year)
+            return -(-year // period)
+        count = multiples(self.every)
+        if self.skip_every:
+            count -= multiples(self.skip_every)
+            if self.keep_every:
+                count += multiples(self.keep_every)
+        return count
+
+
+class CalendarEngine:
+    """O(1) conversion between dates and day ordinals for one calendar."""
+    __slots__ = ("month_names", "month_days", "year_suffix", "leap", "year_days", "_mean_year", "_cumulative", "_leap_cumulative")
+
+    def __init__(self, month_names, month_days, year_suffix="", leap=None):
+        if not month_names or len(month_names) != len(month_days) or min(month_days) < 1:
+            raise ValueError("A calendar needs at least one month, each with at least one day.")
+        if leap is not None and not 0 <= leap.month_index < len(month_names):
+            raise ValueError(f"Leap month index {leap.month_index} is out of range.")
+        self.month_names = list(month_names)
+        self.month_days = list(month_days)
+        self.year_suffix = year_suffix
+        self.leap = leap
+        self.year_days = sum(self.month_days)
+        # _cumulative[m] = days in the year before month m (common years); the last entry is the year length
+        cumulative = [0]
+        for days in self.month_days:
+            cumulative.append(cumulative[-1] + days)
+        self._cumulative = tuple(cumulative)
+        self._mean_year = self.year_days
+        self._leap_cumulative = None
+        if leap is not None:
+            self._mean_year += leap.extra_days * leap.leaps_before(10 ** 6) / 10 ** 6
+            self._leap_cumulative = tuple(total + (leap.extra_days if month > leap.month_index else 0)
+                                          for month, total in enumerate(cumulative))
+
+    @classmethod
+    def from_data(cls, calendar_data):
+        """
+        Builds the engine from tivmir_calendar.json's structure. An optional
+        "leap" object ({"month": name, "every": 4, "skip_every": 100,
+        "keep_every": 400, "extra_days": 1}) turns on leap years.
+        """
+        months = calendar_data["months"]
+        names = [month["name"] for month in months]
+        leap = None
+        leap_data = calendar_data.get("leap")
+        if leap_data:
+            leap = LeapRule(names.index(leap_data["month"]), leap_data["every"], leap_data.get("skip_every"),
+                            leap_data.get("keep_every"), leap_data.get("extra_days", 1))
+        return cls(names, [month["days"] for month in months], calendar_data.get("year_suffix", ""), leap)
+
+    # --- Years and months ---
+    def is_leap(self, year):
+        return self.leap is not None and self.leap.is_leap(year)
+
+    def days_in_year(self, year):
+        return self.year_days + (self.leap.extra_days if self.is_leap(year) else 0)
+
+    def days_in_month(self, year, month_index):
+        days = self.month_days[month_index]
+        if self.leap is not None and month_index == self.leap.month_index and self.leap.is_leap(year):
+            days += self.leap.extra_days
+        return days
+
+    @property
+    def mean_year(self):
+        """Average days per year over leap cycles; a year estimate for an ordinal is ordinal // mean_year."""
+        return self._mean_year
+
+    def month_starts(self, leap_year=False):
+        """
+        Tuple of the day of the year each month starts on, ending with the year
+        length, for common years or (leap_year=True) leap years.
+        """
+        if leap_year and self._leap_cumulative is not None:
+            return self._leap_cumulative
+        return self._cumulative
+
+    def year_start(self, year):
+        """Ordinal of the first day of year."""
+        start = year * self.year_days
+        if self.leap is not None:
+            start += self.leap.leaps_before(year) * self.leap.extra_days
+        return start
+
+    def _cumulative_for(self, year):
+        return self._leap_cumulative if self.is_leap(year) else self._cumulative
+
+    # --- Conversion ---
+    def to_ordinal(self, year, month_index, day):
+        """Day ordinal of a date; raises ValueError for a month or day that doesn't exist."""
+        if not 0 <= month_index < len(self.month_names):
+            raise ValueError(f"Month index {month_index} is out of range.")
+        if not 1 <= day <= self.days_in_month(year, month_index):
+            raise ValueError(f"{self.month_names[month_index]} {year} has no day {day}.")
+        return self.year_start(year) + self._cumulative_for(year)[month_index] + day - 1
+
+    def from_ordinal(self, ordinal):
+        """(year, month_index, day) of a day ordinal."""
+        year = int(ordinal // self._mean_year) # Off by at most a year or two; corrected below
+        while self.year_start(year) > ordinal:
+            year -= 1
+        while self.year_start(year + 1) <= ordinal:
+            year += 1
+        day_of_year = ordinal - self.year_start(year)
+        cumulative = self._cumulative_for(year)
+        month_index = bisect_right(cumulative, day_of_year) - 1
+        return year, month_index, day_of_year - cumulative[month_index] + 1
+
+    # --- Date arithmetic ---
+    def add_days(self, date, days):
+        return self.from_ordinal(self.to_ordinal(*date) + days)
+
+    def add_months(self, date, months):
+        """The first day of the month `months` after date's month (negative goes back)."""
+        year, month_index = divmod(date[0] * len(self.month_names) + date[1] + months, len(self.month_names))
+        return year, month_index, 1
+
+    def days_between(self, start, end):
+        """Days from start to end (negative if end is earlier)."""
+        return self.to_ordinal(*end) - self.to_ordinal(*start)
+
+    def weekday(self, date):
+        """0..WEEK_LENGTH-1, counted from month 0, day 1 of year 0."""
+        return self.to_ordinal(*date) % WEEK_LENGTH
+
+    def format(self, date):
+        year, month_index, day = date
+        return f"{self.month_names[month_index]} {day}, {year} {self.year_suffix}"
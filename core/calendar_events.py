@@ -0,0 +1,298 @@
+from bisect import bisect_left, bisect_right
+from types import MappingProxyType
+
+# === Calendar Events ===
+# Events are stored by day ordinal (see calendar_engine.py). One-off events sit
+# in duration buckets: bucket k holds events lasting under 2**k days, sorted by
+# start, so the events overlapping [a, b] in bucket k all start within
+# [a - 2**k + 1, b] and are found by bisection. A per-name sorted index answers
+# "next occurrence of X". Recurring events (festivals, holy days, market days)
+# are rules, expanded by arithmetic only over the range being queried. Rules
+# are indexed too: yearly ones by month and monthly ones by day, so a query
+# shorter than a year (or a month) only expands the rules whose month (or
+# day) it touches; interval rules, typically few, are always expanded.
+#
+# Deities in deities.json may carry "holy_days": [{"name": ..., "month": ...,
+# "day": ...}]; add_holy_days turns each into a yearly rule.
+
+_NO_DATA = MappingProxyType({}) # Shared by events without extra data, so bulk loads don't allocate a dict each
+
+
+class Event:
+    """A one-off event spanning ordinals start..end (inclusive)."""
+    __slots__ = ("name", "start", "end", "category", "data")
+
+    def __init__(self, name, start, end, category="event", data=None):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.category = category
+        self.data = data or _NO_DATA
+
+    def __repr__(self):
+        return f"Event({self.name!r}, {self.start}, {self.end}, {self.category!r})"
+
+
+class RecurringEvent:
+    """
+    A rule-based event. kind is "yearly" (month_index, day), "monthly" (day) or
+    "interval" (every `every` days from the ordinal `anchor`). Occurrences
+    last `duration` days and are limited to ordinals first..last when given.
+    Yearly/monthly occurrences are skipped in months too short for their day.
+    """
+    __slots__ = ("name", "kind", "month_index", "day", "every", "anchor", "duration", "first", "last", "category", "data")
+
+    def __init__(self, name, kind, month_index=None, day=None, every=None, anchor=0, duration=1,
+                 first=None, last=None, category="event", data=None):
+        if kind not in ("yearly", "monthly", "interval"):
+            raise ValueError(f"Unknown recurrence kind: {kind!r}")
+        if kind == "interval" and (not every or every < 1):
+            raise ValueError("Interval events need every >= 1.")
+        if kind != "interval" and (day is None or (kind == "yearly" and month_index is None)):
+            raise ValueError(f"{kind.capitalize()} events need a day" + (" and month_index." if kind == "yearly" else "."))
+        self.name = name
+        self.kind = kind
+        self.month_index = month_index
+        self.day = day
+        self.every = every
+        self.anchor = anchor
+        self.duration = duration
+        self.first = first
+        self.last = last
+        self.category = category
+        self.data = data or _NO_DATA
+
+    def __repr__(self):
+        return f"RecurringEvent({self.name!r}, {self.kind!r})"
+
+    def starts(self, calendar, low, high):
+        """Yields occurrence start ordinals in [low, high], in order."""
+        if self.first is not None:
+            low = max(low, self.first)
+        if self.last is not None:
+            high = min(high, self.last)
+        if low > high:
+            return
+        if self.kind == "interval":
+            start = self.anchor + -(-(low - self.anchor) // self.every) * self.every
+            yield from range(start, high + 1, self.every)
+            return
+        year, month_index, _ = calendar.from_ordinal(low)
+        end_year, end_month, _ = calendar.from_ordinal(high)
+        if self.kind == "yearly":
+            months = ((y, self.month_index) for y in range(year, end_year + 1))
+        else:
+            n_months = len(calendar.month_names)
+            months = (divmod(m, n_months) for m in range(year * n_months + month_index, end_year * n_months + end_month + 1))
+        for y, m in months:
+            if self.day <= calendar.days_in_month(y, m):
+                ordinal = calendar.to_ordinal(y, m, self.day)
+                if low <= ordinal <= high:
+                    yield ordinal
+
+    def next_start(self, calendar, after):
+        """First occurrence start on or after `after`, or None."""
+        if self.first is not None:
+            after = max(after, self.first)
+        if self.kind == "interval":
+            start = self.anchor + -(-(after - self.anchor) // self.every) * self.every
+            return start if self.last is None or start <= self.last else None
+        leap = calendar.leap
+        lengths = [days + (leap.extra_days if leap is not None and month == leap.month_index else 0)
+                   for month, days in enumerate(calendar.month_days)] # Each month's leap-year length
+        longest = lengths[self.month_index] if self.kind == "yearly" else max(lengths)
+        if not 1 <= self.day <= longest:
+            return None # This day never exists
+        window = calendar.year_days
+        for _ in range(100): # A leap-only day can be years away (8 for Gregorian Feb 29)
+            if self.last is not None and after > self.last:
+                return None
+            for start in self.starts(calendar, after, after + window):
+                return start
+            after += window + 1
+        return None
+
+
+def _event_start(event):
+    return event.start
+
+
+def _index_keys(event):
+    """(duration bucket, name): the keys an Event is filed under in EventStore's two indexes."""
+    return (event.end - event.start + 1).bit_length(), event.name
+
+
+class EventStore:
+    """Events and recurring rules on one CalendarEngine. Dates may be (year, month_index, day) tuples or ordinals."""
+
+    def __init__(self, calendar):
+        self.calendar = calendar
+        self._buckets = {} # k -> (sorted starts, events in the same order)
+        self._by_name = {} # name -> (sorted starts, events in the same order)
+        self._rules = []
+        self._yearly = {} # month_index -> rules
+        self._monthly = {} # day -> rules
+        self._interval = []
+        self._rules_by_name = {} # name -> rules
+        self._longest_rule = 1 # Longest rule duration, for widening queries to occurrences that started earlier
+        self._count = 0
+
+    def ordinal(self, date):
+        return date if isinstance(date, int) else self.calendar.to_ordinal(*date)
+
+    def __len__(self):
+        """One-off events plus recurring rules."""
+        return self._count + len(self._rules)
+
+    # --- Adding and removing ---
+    def add(self, name, start, end=None, category="event", **data):
+        """Adds a one-off event from start to end (inclusive; defaults to start)."""
+        start = self.ordinal(start)
+        end = start if end is None else self.ordinal(end)
+        if end < start:
+            raise ValueError(f"Event {name!r} ends before it starts.")
+        event = Event(name, start, end, category, data)
+        for index, key in zip((self._buckets, self._by_name), _index_keys(event)):
+            starts, events = index.setdefault(key, ([], []))
+            position = bisect_right(starts, start)
+            starts.insert(position, start)
+            events.insert(position, event)
+        self._count += 1
+        return event
+
+    def add_many(self, events):
+        """Bulk add (name, start, end, category) tuples; each index is sorted once instead of inserted into per event."""
+        added = []
+        for name, start, end, category in events:
+            start = self.ordinal(start)
+            end = start if end is None else self.ordinal(end)
+            if end < start:
+                raise ValueError(f"Event {name!r} ends before it starts.")
+            added.append(Event(name, start, end, category))
+        groups = ({}, {}) # new events per duration bucket, per name
+        for event in added:
+            bucket, name = _index_keys(event)
+            groups[0].setdefault(bucket, []).append(event)
+            groups[1].setdefault(name, []).append(event)
+        for index, new_groups in zip((self._buckets, self._by_name), groups):
+            for key, new_events in new_groups.items():
+                if key in index:
+                    new_events = index[key][1] + new_events
+                if len(new_events) > 1:
+                    new_events.sort(key=_event_start)
+                index[key] = ([event.start for event in new_events], new_events)
+        self._count += len(added)
+        return added
+
+    def add_recurring(self, name, kind, category="event", **rule):
+        """Adds a RecurringEvent; see that class for the rule arguments. first/last may be dates."""
+        for bound in ("first", "last", "anchor"):
+            if rule.get(bound) is not None:
+                rule[bound] = self.ordinal(rule[bound])
+        event = RecurringEvent(name, kind, category=category, **rule)
+        self._rules.append(event)
+        for rules in self._rule_lists(event):
+            rules.append(event)
+        self._longest_rule = max(self._longest_rule, event.duration)
+        return event
+
+    def _rule_lists(self, rule):
+        """The index lists rule is filed in (created if missing)."""
+        if rule.kind == "yearly":
+            by_kind = self._yearly.setdefault(rule.month_index, [])
+        elif rule.kind == "monthly":
+            by_kind = self._monthly.setdefault(rule.day, [])
+        else:
+            by_kind = self._interval
+        return by_kind, self._rules_by_name.setdefault(rule.name, [])
+
+    def remove(self, event):
+        """Removes a one-off Event or a RecurringEvent added to this store."""
+        if isinstance(event, RecurringEvent):
+            self._rules.remove(event)
+            for rules in self._rule_lists(event):
+                rules.remove(event)
+            self._longest_rule = max((rule.duration for rule in self._rules), default=1)
+            return
+        for index, key in zip((self._buckets, self._by_name), _index_keys(event)):
+            starts, events = index[key]
+            position = bisect_left(starts, event.start)
+            while events[position] is not event:
+                position += 1
+            del starts[position], events[position]
+        self._count -= 1
+
+    # --- Queries ---
+    def between(self, start, end):
+        """(start, end, event) for every occurrence overlapping start..end, by start."""
+        low, high = self.ordinal(start), self.ordinal(end)
+        found = []
+        for k, (starts, events) in self._buckets.items():
+            # Events in bucket k last under 2**k days, so overlapping ones start after low - 2**k
+            for position in range(bisect_left(starts, low - (1 << k) + 1), bisect_right(starts, high)):
+                event = events[position]
+                if event.end >= low:
+                    found.append((event.start, event.end, event))
+        for rule in self._candidate_rules(low - self._longest_rule + 1, high):
+            for occurrence in rule.starts(self.calendar, low - rule.duration + 1, high):
+                found.append((occurrence, occurrence + rule.duration - 1, rule))
+        found.sort(key=lambda item: (item[0], item[2].name))
+        return found
+
+    def _candidate_rules(self, low, high):
+        """The rules that can have an occurrence starting in low..high."""
+        calendar = self.calendar
+        n_months = len(calendar.month_names)
+        candidates = list(self._interval)
+        if high - low + 1 >= calendar.year_days: # Touches every month
+            candidates.extend(rule for rules in self._yearly.values() for rule in rules)
+        elif self._yearly:
+            year, month_index, _ = calendar.from_ordinal(low)
+            end_year, end_month, _ = calendar.from_ordinal(high)
+            for month in range(year * n_months + month_index, end_year * n_months + end_month + 1):
+                candidates.extend(self._yearly.get(month % n_months, ()))
+        if high - low + 1 >= max(calendar.month_days): # Touches every day number a month can have
+            candidates.extend(rule for rules in self._monthly.values() for rule in rules)
+        elif self._monthly:
+            year, month_index, day = calendar.from_ordinal(low)
+            for _ in range(high - low + 1):
+                candidates.extend(self._monthly.get(day, ()))
+                day += 1
+                if day > calendar.days_in_month(year, month_index):
+                    year, month_index = divmod(year * n_months + month_index + 1, n_months)
+                    day = 1
+        return candidates
+
+    def next_occurrence(self, name, after):
+        """(start, end, event) of the first occurrence of name starting on or after `after`, or None."""
+        after = self.ordinal(after)
+        best = None
+        starts, events = self._by_name.get(name, ((), ()))
+        position = bisect_left(starts, after)
+        if position < len(starts):
+            event = events[position]
+            best = (event.start, event.end, event)
+        for rule in self._rules_by_name.get(name, ()):
+            start = rule.next_start(self.calendar, after)
+            if start is not None and (best is None or start < best[0]):
+                best = (start, start + rule.duration - 1, rule)
+        return best
+
+
+def add_holy_days(store, deities):
+    """Adds a yearly "holy_day" rule for each holy day listed in deities.json entries."""
+    month_names = store.calendar.month_names
+    added = []
+    for deity in deities or ():
+        if not isinstance(deity, dict):
+            continue
+        for holy_day in deity.get("holy_days") or ():
+            try:
+                month_index = month_names.index(holy_day["month"])
+                added.append(store.add_recurring(
+                    holy_day.get("name") or f"Holy day of {deity.get('name', 'an unknown deity')}", "yearly",
+                    category="holy_day", month_index=month_index, day=holy_day["day"],
+                    duration=holy_day.get("duration", 1), data={"deity": deity.get("name")}))
+            except (KeyError, ValueError, TypeError):
+                continue
+    return added
@@ -0,0 +1,189 @@
+from . import diagnostics
+from . import data_loader
+from .calendar_engine import CalendarEngine
+from .calendar_events import EventStore, add_holy_days
+from .campaign_clock import DEFAULT_CLOCK
+
+# --- Calendar Constants ---
+# Set from tivmir_calendar.json by _set_calendar_data, again after a hot reload of that file
+MONTHS = []
+YEAR_SUFFIX = "LD"
+DAYS_IN_MONTH = {}
+MONTH_NAMES = []
+CALENDAR = None # Date arithmetic (and any leap-year rule in tivmir_calendar.json) lives in the engine
+
+
+def _set_calendar_data(calendar_data):
+    global MONTHS, YEAR_SUFFIX, DAYS_IN_MONTH, MONTH_NAMES, CALENDAR
+    months = calendar_data.get("months", [])
+    engine = None
+    if months:
+        try:
+            engine = CalendarEngine.from_data(calendar_data)
+        except (KeyError, ValueError, TypeError) as e:
+            diagnostics.error(f"Invalid calendar data: {e}")
+            if CALENDAR is not None:
+                return # A reload broke the calendar; keep the working one
+    MONTHS = months
+    YEAR_SUFFIX = calendar_data.get("year_suffix", "LD")
+    DAYS_IN_MONTH = {month["name"]: month["days"] for month in months}
+    MONTH_NAMES = [month["name"] for month in months]
+    CALENDAR = engine
+
+
+def _on_data_reload(event):
+    if "calendar_data" in event.globals:
+        _set_calendar_data(data_loader.calendar_data)
+
+
+_set_calendar_data(data_loader.calendar_data)
+data_loader.add_reload_listener(_on_data_reload)
+
+# The functions below read and write the date in `state`: any mutable mapping
+# holding 'current_year', 'current_month_index' and 'current_day'. The Streamlit
+# app passes st.session_state; scripts and workers can pass a plain dict.
+
+# --- State Initialization ---
+def initialize_calendar_state(state, start_year=1478, start_month_index=0, start_day=1):
+    """Initializes the calendar date in state if not already present."""
+    if 'current_year' not in state:
+        state['current_year'] = start_year
+    if 'current_month_index' not in state:
+        state['current_month_index'] = start_month_index # Index (0-11)
+    if 'current_day' not in state:
+        state['current_day'] = start_day
+
+# --- Core Logic Functions ---
+def get_current_date_string(state):
+    """Formats the current date from state into a string."""
+    if not MONTH_NAMES: return "Error: Calendar not loaded"
+    try:
+        year = state['current_year']
+        month_index = state['current_month_index']
+        day = state['current_day']
+        month_name = MONTH_NAMES[month_index]
+        return f"{month_name} {day}, {year} {YEAR_SUFFIX}"
+    except (KeyError, IndexError, TypeError) as e:
+        diagnostics.error(f"Error retrieving date state: {e}")
+        return "Error: Date State Invalid"
+    except Exception as e:
+        diagnostics.error(f"Unexpected error formatting date: {e}")
+        return "Error: Date Format Error"
+
+
+def get_current_date(state):
+    """The date in state as a (year, month_index, day) tuple."""
+    return state['current_year'], state['current_month_index'], state['current_day']
+
+
+def set_current_date(state, date):
+    state['current_year'], state['current_month_index'], state['current_day'] = date
+
+
+def _change_date(state, change):
+    """Applies change(date) to state's date; through the shared clock, atomically, when one is attached."""
+    store = state.get('clock_store')
+    if store is None:
+        set_current_date(state, change(get_current_date(state)))
+        return
+    result = store.update(state['clock_name'], change)
+    if result is None: # Clock was deleted elsewhere; recreate it from this session's date
+        store.create(state['clock_name'], change(get_current_date(state)))
+        result = store.get(state['clock_name'])
+    set_current_date(state, result[0])
+    state['clock_version'] = result[1]
+
+
+def advance_day(state, days_to_advance=1):
+    """Advances the date in state by a number of days (negative goes back)."""
+    if CALENDAR is None:
+        diagnostics.error("Cannot advance day: Calendar data not loaded.")
+        return
+    try:
+        _change_date(state, lambda date: CALENDAR.add_days(date, days_to_advance))
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        diagnostics.error(f"Error advancing date state: {e}")
+    except Exception as e:
+        diagnostics.error(f"Unexpected error advancing date: {e}")
+
+# --- Optional Convenience Functions ---
+def advance_week(state):
+    """Advances the date by 7 days."""
+    advance_day(state, 7)
+
+def advance_month(state):
+    """Advances the date to the 1st of the next month."""
+    if CALENDAR is None:
+        diagnostics.error("Cannot advance month: Calendar data not loaded.")
+        return
+    try:
+        _change_date(state, lambda date: CALENDAR.add_months(date, 1))
+    except (KeyError, IndexError, TypeError) as e:
+        diagnostics.error(f"Error advancing month state: {e}")
+    except Exception as e:
+        diagnostics.error(f"Unexpected error advancing month: {e}")
+
+# --- Shared Campaign Clock ---
+# A state attached to a ClockStore (campaign_clock.py) reads its date from a
+# named persistent clock and writes every advance through to it, so all
+# sessions attached to the same clock share one date.
+def attach_clock(state, store, name=DEFAULT_CLOCK):
+    """Attaches state to clock `name`, creating it at state's current date if it is new."""
+    state['clock_store'] = store
+    state['clock_name'] = name
+    state['clock_token'] = store.change_token()
+    date, version = store.create(name, get_current_date(state))
+    set_current_date(state, date)
+    state['clock_version'] = version
+
+def sync_clock(state):
+    """Pulls the attached clock's date into state if it changed since the last sync. Returns True if it did."""
+    store = state.get('clock_store')
+    if store is None:
+        return False
+    token = store.change_token() # One cheap query; the row is only read after a change
+    if token == state.get('clock_token'):
+        return False
+    state['clock_token'] = token
+    current = store.get(state['clock_name'])
+    if current is None or current[1] == state.get('clock_version'):
+        return False
+    set_current_date(state, current[0])
+    state['clock_version'] = current[1]
+    return True
+
+# --- Events ---
+def get_event_store(state):
+    """The EventStore kept in state['calendar_events'], created with the deities' holy days on first use."""
+    store = state.get('calendar_events')
+    if store is None and CALENDAR is not None:
+        store = state['calendar_events'] = EventStore(CALENDAR)
+        add_holy_days(store, data_loader.deities)
+    return store
+
+def add_event(state, name, starts_in=0, duration=1, category="campaign"):
+    """Adds a one-off event starting `starts_in` days after the current date."""
+    store = get_event_store(state)
+    if store is None:
+        diagnostics.error("Cannot add event: Calendar data not loaded.")
+        return None
+    try:
+        start = CALENDAR.to_ordinal(*get_current_date(state)) + starts_in
+        return store.add(name, start, start + duration - 1, category)
+    except (KeyError, TypeError, ValueError) as e:
+        diagnostics.error(f"Error adding event: {e}")
+        return None
+
+def upcoming_events(state, days=30):
+    """(date string, event) for every occurrence from the current date through `days` days ahead."""
+    store = get_event_store(state)
+    if store is None:
+        return []
+    try:
+        today = CALENDAR.to_ordinal(*get_current_date(state))
+    except (KeyError, TypeError, ValueError) as e:
+        diagnostics.error(f"Error reading date state: {e}")
+        return []
+    return [(CALENDAR.format(CALENDAR.from_ordinal(max(start, today))), event)
+            for start, _, event in store.between(today, today + days)]
+
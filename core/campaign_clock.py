@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import threading
+import time
+from . import diagnostics
+from .data_loader import DATA_DIR
+
+# === Persistent Campaign Clocks ===
+# Named campaign dates shared by every session and process on this machine,
+# kept in one SQLite database in WAL mode, so readers never block the writer.
+# Each clock is one row; a write updates that row and bumps its version. To
+# see whether anything changed, a reader compares change_token() with the
+# value it saw last: PRAGMA data_version (bumped by other connections'
+# commits) plus a counter of this process's own writes, so a poll costs one
+# tiny query and rows are only re-read after a real change.
+#
+# The database is mutable runtime state, so it lives in state/ next to the app
+# rather than in data/, which holds the JSON sources the data watcher and the
+# corpus manifest scan.
+
+STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "state")
+CLOCK_DB_FILENAME = "campaign_clocks.sqlite3"
+DEFAULT_CLOCK = "default"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clocks (
+    name        TEXT PRIMARY KEY,
+    year        INTEGER NOT NULL,
+    month_index INTEGER NOT NULL,
+    day         INTEGER NOT NULL,
+    version     INTEGER NOT NULL DEFAULT 1,
+    updated_at  REAL NOT NULL
+)
+"""
+
+
+def default_clock_path():
+    """$TIVMIR_CLOCK_DB, or campaign_clocks.sqlite3 in the state folder."""
+    return os.environ.get("TIVMIR_CLOCK_DB") or os.path.join(STATE_DIR, CLOCK_DB_FILENAME)
+
+
+def _move_legacy_db(path, legacy_path=os.path.join(DATA_DIR, CLOCK_DB_FILENAME)):
+    """Moves clocks saved in the data folder by earlier versions to path, once, with their WAL sidecars."""
+    if os.path.exists(path) or not os.path.exists(legacy_path):
+        return
+    try:
+        for suffix in ("-wal", "-shm", ""): # The main file last: while it is missing, this runs again
+            if os.path.exists(legacy_path + suffix):
+                os.replace(legacy_path + suffix, path + suffix)
+    except OSError as e:
+        diagnostics.warning(f"Could not move {legacy_path} to {path}; starting with no saved clocks: {e}")
+
+
+class ClockStore:
+    """
+    Named campaign clocks in SQLite. One connection is shared by the threads of
+    a process (e.g. all Streamlit sessions), guarded by a lock; other processes
+    open their own. Dates are (year, month_index, day) tuples.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_clock_path()
+        if self.path == os.path.join(STATE_DIR, CLOCK_DB_FILENAME):
+            os.makedirs(STATE_DIR, exist_ok=True)
+            _move_legacy_db(self.path)
+        self._lock = threading.Lock()
+        self._local_writes = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL") # WAL + NORMAL: durable up to the last checkpoint, no fsync per write
+        self._conn.execute(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Reading ---
+    def change_token(self):
+        """A value that changes whenever any clock changes; compare with the last one seen."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0], self._local_writes
+
+    def get(self, name=DEFAULT_CLOCK):
+        """(date, version) of a clock, or None if it doesn't exist."""
+        with self._lock:
+            row = self._conn.execute("SELECT year, month_index, day, version FROM clocks WHERE name = ?", (name,)).fetchone()
+        return ((row[0], row[1], row[2]), row[3]) if row else None
+
+    def names(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM clocks ORDER BY name")]
+
+    # --- Writing ---
+    def create(self, name, date):
+        """Creates a clock at date unless it already exists; returns its (date, version)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO clocks (name, year, month_index, day, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (name, *date, time.time()))
+            if cursor.rowcount:
+                self._local_writes += 1
+        return self.get(name)
+
+    def set(self, name, date):
+        """Sets (or creates) a clock; returns its new version."""
+        with self._lock:
+            row = self._conn.execute(
+                "INSERT INTO clocks (name, year, month_index, day, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET year = excluded.year, month_index = excluded.month_index, "
+                "day = excluded.day, version = version + 1, updated_at = excluded.updated_at RETURNING version",
+                (name, *date, time.time())).fetchone()
+            self._local_writes += 1
+        return row[0]
+
+    def update(self, name, change):
+        """
+        Atomically replaces a clock's date with change(date), even against other
+        processes (so two GMs advancing at once both count). Returns (date, version),
+        or None if the clock doesn't exist.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT year, month_index, day FROM clocks WHERE name = ?", (name,)).fetchone()
+                if row is None:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                date = tuple(change(tuple(row)))
+                version = self._conn.execute(
+                    "UPDATE clocks SET year = ?, month_index = ?, day = ?, version = version + 1, updated_at = ? "
+                    "WHERE name = ? RETURNING version", (*date, time.time(), name)).fetchone()[0]
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._local_writes += 1
+        return date, version
+
+    def delete(self, name):
+        with self._lock:
+            self._conn.execute("DELETE FROM clocks WHERE name = ?", (name,))
+            self._local_writes += 1
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_clock_store(path=None):
+    """The process-wide ClockStore for path (default_clock_path() if None)."""
+    global _store
+    path = path or default_clock_path()
+    with _store_lock:
+        if _store is None or _store.path != path:
+            _store = ClockStore(path)
+        return _store
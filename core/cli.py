@@ -0,0 +1,180 @@
+"""
+tivmir-gen: stream names or NPCs as JSONL or CSV.
+
+Run from the repo root:
+    python -m core names --race Elf --race Drow --count 100000 --seed 7 > elves.jsonl
+    python -m core npcs --rarity Rare --count 50000 --format csv --workers 4 -o npcs.csv
+    python -m core names --list-races
+
+Output is produced and written one chunk at a time, so memory use does not grow
+with --count. Item i of a seeded run always draws from stream_rng(seed, i): the
+same seed gives the same rows for any --workers or --chunk-size.
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+
+from . import data_loader
+from .name_generators import NAME_GENERATOR_MAP, GENASI_GENERATORS, generate_name
+from .npc_batch import DEFAULT_CHUNK_SIZE, job_seed, map_chunks
+from .npc_generator import generate_npc_range
+from .seeding import stream_rngs
+
+NAME_COLUMNS = ["index", "race", "name", "parts", "meanings", "poetic", "clan", "error"]
+NPC_COLUMNS = ["index", "name", "race", "rarity", "region", "clan", "poetic", "error"]
+
+
+# === Race Selection ===
+
+def name_races():
+    """Display race -> (NAME_GENERATOR_MAP key, element). Genasi is listed per element, as in races.json."""
+    selectable = {}
+    for race, race_config in NAME_GENERATOR_MAP.items():
+        if race_config.get("needs_element"):
+            for element in GENASI_GENERATORS:
+                selectable[f"{element} {race}"] = (race, element)
+        else:
+            selectable[race] = (race, None)
+    return selectable
+
+
+def _select(available, races, rarities):
+    """Filters available race names by --race and --rarity (both case-insensitive)."""
+    by_lower = {name.lower(): name for name in available}
+    selected = list(available)
+    if races:
+        unknown = [r for r in races if r.lower() not in by_lower]
+        if unknown:
+            raise SystemExit(f"Unknown race(s): {', '.join(unknown)}. Use --list-races to see the options.")
+        wanted = {r.lower() for r in races}
+        selected = [name for name in selected if name.lower() in wanted]
+    if rarities:
+        wanted = {r.lower() for r in rarities}
+        in_rarity = {r["name"].lower() for r in data_loader.races
+                     if isinstance(r, dict) and "name" in r and str(r.get("rarity", "")).lower() in wanted}
+        selected = [name for name in selected if name.lower() in in_rarity]
+    if not selected:
+        raise SystemExit("No races match the given --race/--rarity filters.")
+    return selected
+
+
+# === Chunk Writers (run in worker processes) ===
+
+def _rows_to_text(rows, fmt, columns):
+    if fmt == "jsonl":
+        return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _name_chunk(start, stop, seed, races, gender, clan, fmt):
+    selectable = name_races()
+    rows = []
+    for index, rng in zip(range(start, stop), stream_rngs(seed, start, stop)):
+        race = races[0] if len(races) == 1 else rng.choice(races)
+        race_key, element = selectable[race]
+        result = generate_name(race_key, gender, rng, clan=clan, element=element).to_dict()
+        del result["race"] # Internal race key; rows use the display name
+        row = {"index": index, "race": race, **result}
+        if fmt == "csv":
+            row["meanings"] = "|".join(p["meaning"] or "" for p in row["parts"])
+            row["parts"] = "|".join(p["text"] for p in row["parts"])
+        rows.append(row)
+    return _rows_to_text(rows, fmt, NAME_COLUMNS)
+
+
+def _npc_chunk(start, stop, seed, gender, race_names, fmt, columns):
+    rows = []
+    for index, npc in enumerate(generate_npc_range(start, stop, seed, gender, race_names), start):
+        row = {"index": index, **npc.to_dict()}
+        if fmt == "csv":
+            row.update(row.pop("attributes", {}))
+            row.pop("name_parts", None)
+        rows.append(row)
+    return _rows_to_text(rows, fmt, columns)
+
+
+# === Command Line ===
+
+def _non_negative_int(text):
+    """argparse type for --seed; numpy seeds must be non-negative."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"expected a non-negative integer, got {text!r}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tivmir-gen", description="Stream Tivmir names or NPCs as JSONL or CSV.")
+    parser.add_argument("kind", choices=["names", "npcs"], help="What to generate.")
+    parser.add_argument("-n", "--count", type=int, default=10, help="How many rows to write (default 10).")
+    parser.add_argument("--seed", type=_non_negative_int, help="Seed for reproducible output (default: fresh entropy).")
+    parser.add_argument("--race", action="append", help="Only these races (repeatable, case-insensitive).")
+    parser.add_argument("--rarity", action="append", help="Only races of these rarities, e.g. Common, 'Very Rare' (repeatable).")
+    parser.add_argument("--gender", choices=["Any", "Male", "Female"], default="Any", help="Gender for races that use one.")
+    parser.add_argument("--clan", help="Tabaxi clan for names (default: a random clan per name).")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout).")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default 1; 0 = every core).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows generated and written per chunk.")
+    parser.add_argument("--list-races", action="store_true", help="Print the races available for KIND and exit.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.count < 0 or args.chunk_size < 1:
+        raise SystemExit("--count must be >= 0 and --chunk-size >= 1.")
+
+    if args.kind == "names":
+        available = list(name_races())
+    else:
+        available = [r["name"] for r in data_loader.races if isinstance(r, dict) and "name" in r]
+    if args.list_races:
+        _write(sys.stdout, ["\n".join(available) + "\n"])
+        return
+    races = _select(available, args.race, args.rarity)
+
+    seed = job_seed(args.seed)
+    if args.kind == "names":
+        columns = NAME_COLUMNS
+        chunks = map_chunks(_name_chunk, args.count, seed, races, args.gender, args.clan, args.format,
+                            workers=args.workers, chunk_size=args.chunk_size)
+    else:
+        categories = [c.strip() for c in data_loader.npc_attributes]
+        columns = NPC_COLUMNS + categories
+        race_names = tuple(races) if len(races) < len(available) else None
+        chunks = map_chunks(_npc_chunk, args.count, seed, args.gender, race_names, args.format, columns,
+                            workers=args.workers, chunk_size=args.chunk_size)
+
+    header = [_rows_to_text([dict(zip(columns, columns))], "csv", columns)] if args.format == "csv" else []
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        _write(out, itertools.chain(header, chunks))
+    finally:
+        chunks.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+def _write(out, texts):
+    try:
+        for text in texts:
+            out.write(text)
+        out.flush()
+    except BrokenPipeError: # e.g. piped into `head`; stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno()) # Python flushes stdout again at exit
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Packed corpus: every data/*.json file compiled into one binary artifact that
+processes mmap and share through the page cache.
+
+Layout (little endian):
+    header      magic, version, sha256 of the source JSON, section offsets
+    manifest    JSON list of [filename, size, mtime_ns] used for cheap staleness checks
+    strings     interned string table: u32 count, u32 byte length, NUL-joined UTF-8 blob
+    directory   u32 count, then (u32 filename id, u8 kind, 3 pad, u64 offset) per file
+    files       KIND_PARTS: columnar name-part list (text/meaning/gender string ids
+                and a flag byte per entry: has/starts_vowel, has/ends_vowel bits)
+                KIND_VALUE: any other JSON value in a small tagged encoding
+
+Build explicitly with `python -m core.corpus`, or let data_loader rebuild it
+automatically the first time it finds the artifact missing or stale.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from . import diagnostics
+
+MAGIC = b"TVMC"
+VERSION = 1
+_HEADER = struct.Struct("<4sHH32sQQQ") # magic, version, reserved, sha256, manifest/strings/directory offsets
+_DIR_ENTRY = struct.Struct("<IB3xQ")
+_U32 = struct.Struct("<I")
+_NONE = 0xFFFFFFFF # String id used for a missing meaning/gender
+
+KIND_PARTS, KIND_VALUE = 1, 2
+_PART_KEYS = {"text", "meaning", "gender", "starts_vowel", "ends_vowel"}
+_HAS_STARTS, _STARTS, _HAS_ENDS, _ENDS = 1, 2, 4, 8
+
+# Tags of the generic value encoding
+_T_NULL, _T_FALSE, _T_TRUE, _T_INT, _T_FLOAT, _T_STR, _T_LIST, _T_DICT = range(8)
+
+CORPUS_FILENAME = "compiled_corpus.bin"
+
+
+# === Source Fingerprints ===
+
+def source_files(data_dir):
+    return sorted(f for f in os.listdir(data_dir) if f.endswith(".json"))
+
+
+def source_manifest(data_dir):
+    """[filename, size, mtime_ns] for every source file; compared before hashing."""
+    manifest = []
+    for filename in source_files(data_dir):
+        st = os.stat(os.path.join(data_dir, filename))
+        manifest.append([filename, st.st_size, st.st_mtime_ns])
+    return manifest
+
+
+def source_hash(data_dir):
+    """sha256 over every source file's name and bytes."""
+    import hashlib # Only needed when building or when file stats changed
+    digest = hashlib.sha256()
+    for filename in source_files(data_dir):
+        digest.update(filename.encode("utf-8") + b"\0")
+        with open(os.path.join(data_dir, filename), "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0")
+    return digest.digest()
+
+
+# === Writer ===
+
+class _StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, text):
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def pack(self):
+        # One blob split in a single call on open; ids are positions in the split
+        if any("\0" in text for text in self.strings):
+            raise ValueError("Strings in the corpus may not contain NUL characters")
+        blob = "\0".join(self.strings).encode("utf-8")
+        return struct.pack("<II", len(self.strings), len(blob)) + blob
+
+
+def _is_part_list(value):
+    return (
+        isinstance(value, list) and value
+        and all(isinstance(e, dict) and isinstance(e.get("text"), str) and e.keys() <= _PART_KEYS for e in value)
+        and all(isinstance(e.get(k, ""), str) for e in value for k in ("meaning", "gender"))
+        and all(isinstance(e.get(k, False), bool) for e in value for k in ("starts_vowel", "ends_vowel"))
+    )
+
+
+def _pack_parts(entries, strings):
+    texts, meanings, genders, flags = array("I"), array("I"), array("I"), bytearray()
+    for entry in entries:
+        texts.append(strings.intern(entry["text"]))
+        meanings.append(strings.intern(entry["meaning"]) if "meaning" in entry else _NONE)
+        genders.append(strings.intern(entry["gender"]) if "gender" in entry else _NONE)
+        bits = 0
+        if "starts_vowel" in entry:
+            bits |= _HAS_STARTS | (_STARTS if entry["starts_vowel"] else 0)
+        if "ends_vowel" in entry:
+            bits |= _HAS_ENDS | (_ENDS if entry["ends_vowel"] else 0)
+        flags.append(bits)
+    return struct.pack("<I", len(entries)) + texts.tobytes() + meanings.tobytes() + genders.tobytes() + bytes(flags)
+
+
+def _pack_value(value, strings, out):
+    if value is None:
+        out.append(_T_NULL)
+    elif value is True or value is False:
+        out.append(_T_TRUE if value else _T_FALSE)
+    elif isinstance(value, int):
+        out += struct.pack("<Bq", _T_INT, value)
+    elif isinstance(value, float):
+        out += struct.pack("<Bd", _T_FLOAT, value)
+    elif isinstance(value, str):
+        out += struct.pack("<BI", _T_STR, strings.intern(value))
+    elif isinstance(value, list):
+        out += struct.pack("<BI", _T_LIST, len(value))
+        for item in value:
+            _pack_value(item, strings, out)
+    elif isinstance(value, dict):
+        out += struct.pack("<BI", _T_DICT, len(value))
+        for key, item in value.items():
+            out += struct.pack("<I", strings.intern(key))
+            _pack_value(item, strings, out)
+    else:
+        raise TypeError(f"Cannot pack {type(value).__name__}")
+
+
+def build_corpus(data_dir, out_path=None):
+    """Compiles data_dir/*.json into one artifact, written atomically. Returns its path."""
+    out_path = out_path or os.path.join(data_dir, CORPUS_FILENAME)
+    manifest = source_manifest(data_dir)
+    digest = source_hash(data_dir)
+
+    strings = _StringTable()
+    sections = []
+    for filename, _, _ in manifest:
+        with open(os.path.join(data_dir, filename), "r", encoding="utf-8") as f:
+            value = json.load(f)
+        if _is_part_list(value):
+            sections.append((strings.intern(filename), KIND_PARTS, _pack_parts(value, strings)))
+        else:
+            packed = bytearray()
+            _pack_value(value, strings, packed)
+            sections.append((strings.intern(filename), KIND_VALUE, bytes(packed)))
+
+    manifest_blob = json.dumps(manifest).encode("utf-8")
+    manifest_blob = struct.pack("<I", len(manifest_blob)) + manifest_blob
+    strings_blob = strings.pack()
+
+    manifest_off = _HEADER.size
+    strings_off = manifest_off + len(manifest_blob)
+    dir_off = strings_off + len(strings_blob)
+    data_off = dir_off + 4 + _DIR_ENTRY.size * len(sections)
+
+    directory = bytearray(struct.pack("<I", len(sections)))
+    body = bytearray()
+    for name_id, kind, blob in sections:
+        while (data_off + len(body)) % 4: # Keep u32 columns aligned for memoryview.cast
+            body.append(0)
+        directory += _DIR_ENTRY.pack(name_id, kind, data_off + len(body))
+        body += blob
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, digest, manifest_off, strings_off, dir_off))
+            f.write(manifest_blob)
+            f.write(strings_blob)
+            f.write(directory)
+            f.write(body)
+        os.replace(tmp_path, out_path) # Readers see either the old or the new artifact, never a partial one
+    except BaseException: # e.g. a full disk, or Windows refusing to replace a corpus that is still mapped
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return out_path
+
+
+# === Reader ===
+
+class CompiledCorpus:
+    """Read-only view over an mmap'd artifact. load(filename) returns plain JSON-like data."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = self._buf = memoryview(self._map)
+        magic, version, _, self.source_hash, manifest_off, strings_off, dir_off = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Tivmir corpus")
+
+        (manifest_len,) = struct.unpack_from("<I", buf, manifest_off)
+        self.manifest = json.loads(bytes(buf[manifest_off + 4:manifest_off + 4 + manifest_len]))
+
+        count, length = struct.unpack_from("<II", buf, strings_off)
+        blob = str(buf[strings_off + 8:strings_off + 8 + length], "utf-8")
+        self._strings = blob.split("\0") if count else [] # One shared str object per id
+
+        (count,) = struct.unpack_from("<I", buf, dir_off)
+        self._directory = {}
+        for i in range(count):
+            name_id, kind, offset = _DIR_ENTRY.unpack_from(buf, dir_off + 4 + i * _DIR_ENTRY.size)
+            self._directory[self.string(name_id)] = (kind, offset)
+
+    def string(self, string_id):
+        return self._strings[string_id]
+
+    def __contains__(self, filename):
+        return filename in self._directory
+
+    def load(self, filename):
+        kind, offset = self._directory[filename]
+        if kind == KIND_PARTS:
+            return self._load_parts(offset)
+        return self._load_value(offset)[0]
+
+    def part_columns(self, filename):
+        """Raw (texts, meanings, genders, flags) columns of a part list, as memoryviews."""
+        kind, offset = self._directory[filename]
+        if kind != KIND_PARTS:
+            raise ValueError(f"{filename} is not a part list")
+        return self._part_columns_at(offset)
+
+    def _part_columns_at(self, offset):
+        (n,) = struct.unpack_from("<I", self._buf, offset)
+        start = offset + 4
+        return (
+            self._buf[start:start + 4 * n].cast("I"),
+            self._buf[start + 4 * n:start + 8 * n].cast("I"),
+            self._buf[start + 8 * n:start + 12 * n].cast("I"),
+            self._buf[start + 12 * n:start + 13 * n],
+        )
+
+    def _load_parts(self, offset):
+        string = self._strings
+        entries = []
+        for text_id, meaning_id, gender_id, bits in zip(*self._part_columns_at(offset)):
+            entry = {"text": string[text_id]}
+            if bits & _HAS_STARTS:
+                entry["starts_vowel"] = bool(bits & _STARTS)
+            if bits & _HAS_ENDS:
+                entry["ends_vowel"] = bool(bits & _ENDS)
+            if meaning_id != _NONE:
+                entry["meaning"] = string[meaning_id]
+            if gender_id != _NONE:
+                entry["gender"] = string[gender_id]
+            entries.append(entry)
+        return entries
+
+    def _load_value(self, offset):
+        """Decodes one tagged value. Returns (value, next offset)."""
+        buf, strings, unpack_u32 = self._buf, self._strings, _U32.unpack_from
+        tag = buf[offset]
+        offset += 1
+        if tag == _T_STR:
+            return strings[unpack_u32(buf, offset)[0]], offset + 4
+        if tag == _T_LIST:
+            count = unpack_u32(buf, offset)[0]
+            offset += 4
+            items = []
+            for _ in range(count):
+                if buf[offset] == _T_STR: # Gloss lists are almost all strings
+                    items.append(strings[unpack_u32(buf, offset + 1)[0]])
+                    offset += 5
+                else:
+                    item, offset = self._load_value(offset)
+                    items.append(item)
+            return items, offset
+        if tag == _T_DICT:
+            count = unpack_u32(buf, offset)[0]
+            offset += 4
+            result = {}
+            for _ in range(count):
+                key = strings[unpack_u32(buf, offset)[0]]
+                if buf[offset + 4] == _T_STR:
+                    result[key] = strings[unpack_u32(buf, offset + 5)[0]]
+                    offset += 9
+                else:
+                    result[key], offset = self._load_value(offset + 4)
+            return result, offset
+        if tag == _T_INT:
+            return struct.unpack_from("<q", buf, offset)[0], offset + 8
+        if tag == _T_FLOAT:
+            return struct.unpack_from("<d", buf, offset)[0], offset + 8
+        return {_T_NULL: None, _T_FALSE: False, _T_TRUE: True}[tag], offset
+
+
+def open_corpus(data_dir, rebuild=True):
+    """
+    Opens data_dir's compiled corpus. If the JSON files' stats no longer match its
+    manifest it is rebuilt first; if that isn't possible (e.g. read-only data
+    directory) the old artifact is kept only when its content hash still matches.
+    Returns None when no usable corpus exists, including when a source file can't
+    be compiled, and callers read the JSON directly (so only that file fails).
+    """
+    path = os.path.join(data_dir, CORPUS_FILENAME)
+    corpus = None
+    try:
+        corpus = CompiledCorpus(path)
+    except (OSError, ValueError, struct.error):
+        pass
+
+    if corpus is not None and corpus.manifest == source_manifest(data_dir):
+        return corpus
+    if rebuild:
+        try:
+            build_corpus(data_dir, path)
+            return CompiledCorpus(path)
+        except OSError:
+            pass
+        except (ValueError, TypeError, struct.error) as e: # e.g. one malformed JSON file
+            diagnostics.error(f"Could not build the compiled corpus; reading JSON files one by one: {e}")
+            return None
+    if corpus is not None and corpus.source_hash == source_hash(data_dir):
+        return corpus # Only timestamps moved
+    return None
+
+
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    path = build_corpus(data_dir)
+    corpus = CompiledCorpus(path)
+    print(f"Wrote {path}: {os.path.getsize(path):,} bytes, {len(corpus.manifest)} files, sha256 {corpus.source_hash.hex()[:16]}")
@@ -0,0 +1,487 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from . import diagnostics
+from . import instrumentation
+
+# Data files live in the repo-level 'data' folder, next to the core package
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# === Load Data Functions ===
+# Parsed files are kept here so shared files (e.g. auran_poetic_gloss.json, used
+# by aarakocra, owlin and air_genasi) are read once and the same object is shared.
+_json_cache = {}
+_MISSING = object()
+_load_lock = threading.RLock()
+
+# Files are read from the packed corpus (data/compiled_corpus.bin, see corpus.py)
+# when it can be opened or rebuilt; otherwise, or for files it doesn't contain,
+# from the JSON itself. Set USE_CORPUS = False before first load to skip it.
+USE_CORPUS = True
+_corpus = None
+_corpus_checked = False
+
+
+def get_corpus():
+    """The shared CompiledCorpus for DATA_DIR, rebuilt if stale, or None if unavailable."""
+    global _corpus, _corpus_checked
+    if not _corpus_checked:
+        with _load_lock:
+            if not _corpus_checked:
+                if USE_CORPUS:
+                    from . import corpus # Keeps `python -m core.corpus` free of a runpy double import
+                    _corpus = corpus.open_corpus(DATA_DIR)
+                    if _corpus is None:
+                        diagnostics.debug("Compiled corpus unavailable; reading JSON files directly.")
+                _corpus_checked = True
+    return _corpus
+
+
+def load_json(filename):
+    """Loads a JSON file from the 'data' directory, once per process."""
+    data = _json_cache.get(filename, _MISSING)
+    if data is _MISSING:
+        with _load_lock:
+            data = _json_cache.get(filename, _MISSING)
+            if data is _MISSING: # Not None: a file holding JSON null is cached too
+                data = _json_cache[filename] = _read_json(filename)
+    return data
+
+
+def _read_json(filename):
+    """Reads and parses one data file, returning an empty list/dict on failure."""
+    if not instrumentation.enabled():
+        return _parse_json(filename)[0]
+    start = time.perf_counter_ns()
+    data, source = _parse_json(filename)
+    elapsed = time.perf_counter_ns() - start
+    try:
+        size = os.path.getsize(os.path.join(DATA_DIR, filename))
+    except OSError:
+        size = 0
+    instrumentation.record_load(filename, elapsed, size, source)
+    return data
+
+
+def _parse_json(filename):
+    """Returns (data, source), where source ("corpus" or "json") is where data was read from."""
+    compiled = get_corpus()
+    if compiled is not None and filename in compiled:
+        return compiled.load(filename), "corpus"
+    try:
+        path = os.path.join(DATA_DIR, filename)
+        diagnostics.debug(f"Attempting to load: {path}")
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        diagnostics.debug(f"Successfully loaded: {filename}")
+        return data, "json"
+    except FileNotFoundError:
+        diagnostics.error(f"Error loading {filename}: File not found at {path}")
+        return ([] if "names" in filename or "clans" in filename or "given" in filename or "family" in filename or "personal" in filename else {}), "json" # More robust default based on expected type
+    except json.JSONDecodeError:
+        diagnostics.error(f"Error loading {filename}: File is not valid JSON.")
+        return ([] if "names" in filename or "clans" in filename or "given" in filename or "family" in filename or "personal" in filename else {}), "json"
+    except Exception as e:
+        diagnostics.error(f"An unexpected error occurred loading {filename}: {e}")
+        return ([] if "names" in filename or "clans" in filename or "given" in filename or "family" in filename or "personal" in filename else {}), "json"
+
+# === Race Name Data Files ===
+# race_key -> {field: filename}. Nothing is read until a race is first accessed.
+RACE_FILES = {
+    "tabaxi": {
+        "prefixes": "tabaxi_prefixes.json",
+        "middles": "tabaxi_middles.json",
+        "suffixes": "tabaxi_suffixes.json",
+        "gloss": "tabaxi_poetic_gloss.json",
+        "clans": "tabaxi_clans.json",
+    },
+    "elf": {
+        "prefixes": "elven_prefixes.json",
+        "middles": "elven_middles.json",
+        "suffixes": "elven_suffixes.json",
+        "gloss": "elven_poetic_gloss.json",
+    },
+    "common": { # For Human/Common names; no gloss needed
+        "first_names": "common_first_names.json",
+        "surnames": "common_surnames.json",
+    },
+    "orc": {
+        "prefixes": "orcish_prefixes.json",
+        "middles": "orcish_middles.json",
+        "suffixes": "orcish_suffixes.json",
+        "gloss": "orcish_poetic_gloss.json",
+        "surnames": "orcish_surnames.json",
+    },
+    "infernal": { # Using 'infernal' as the key for Tiefling
+        "prefixes": "infernal_prefixes.json",
+        "middles": "infernal_middles.json",
+        "suffixes": "infernal_suffixes.json",
+        "gloss": "infernal_poetic_gloss.json",
+        "surnames": "infernal_surnames.json",
+    },
+    "drow": {
+        "prefixes": "drow_prefixes.json",
+        "middles": "drow_middles.json",
+        "suffixes": "drow_suffixes.json",
+        "gloss": "drow_poetic_gloss.json",
+        "surnames": "drow_surnames.json",
+    },
+    "draconic": { # Dragonborn
+        "clans": "draconic_clans.json",
+        "prefixes": "draconic_prefixes.json",
+        "middles": "draconic_middles.json",
+        "suffixes": "draconic_suffixes.json",
+        "gloss": "draconic_poetic_gloss.json",
+    },
+    "aarakocra": {
+        "lineages": "aarakocra_lineages.json",
+        "prefixes": "aarakocra_prefixes.json",
+        "middles": "aarakocra_middles.json",
+        "suffixes": "aarakocra_suffixes.json",
+        "gloss": "auran_poetic_gloss.json",
+    },
+    "owlin": {
+        "personal": "owlin_personal.json",
+        "descriptors": "owlin_descriptors.json",
+        "gloss": "auran_poetic_gloss.json",
+    },
+    "tortle": {
+        "given": "tortle_given.json",
+        "descriptors": "tortle_descriptors.json",
+        "gloss": "aquan_poetic_gloss.json",
+    },
+    "triton": {
+        "given": "triton_given.json",
+        "markers": "triton_markers.json",
+        "gloss": "aquan_poetic_gloss.json",
+    },
+    "ignan": { # Fire Genasi
+        "prefixes": "ignan_prefixes.json",
+        "middles": "ignan_middles.json",
+        "suffixes": "ignan_suffixes.json",
+        "gloss": "ignan_poetic_gloss.json",
+    },
+    "terran": { # Earth Genasi
+        "prefixes": "terran_prefixes.json",
+        "middles": "terran_middles.json",
+        "suffixes": "terran_suffixes.json",
+        "gloss": "terran_poetic_gloss.json",
+    },
+    "air_genasi": {
+        "prefixes": "air_genasi_prefixes.json",
+        "middles": "air_genasi_middles.json",
+        "suffixes": "air_genasi_suffixes.json",
+        "gloss": "auran_poetic_gloss.json",
+    },
+    "water_genasi": {
+        "prefixes": "water_genasi_prefixes.json",
+        "middles": "water_genasi_middles.json",
+        "suffixes": "water_genasi_suffixes.json",
+        "gloss": "aquan_poetic_gloss.json",
+    },
+    "sylvan": { # Eladrin
+        "prefixes": "sylvan_prefixes.json",
+        "middles": "sylvan_middles.json",
+        "suffixes": "sylvan_suffixes.json",
+        "gloss": "sylvan_poetic_gloss.json",
+    },
+    "gnomish": {
+        "male_first": "gnome_male_first.json",
+        "female_first": "gnome_female_first.json",
+        "clans": "gnome_clans.json",
+        "descriptors": "gnome_descriptors.json",
+        "gloss": "gnomish_poetic_gloss.json",
+    },
+    "halfling": {
+        "male_first": "halfling_male_first.json",
+        "female_first": "halfling_female_first.json",
+        "family": "halfling_family.json",
+        "gloss": "halfling_poetic_gloss.json",
+    },
+    "goliath": {
+        "given": "goliath_given.json",
+        "titles": "goliath_titles.json",
+        "gloss": "giant_poetic_gloss.json",
+    },
+    "minotaur": {
+        "male_first": "minotaur_male_first.json",
+        "female_first": "minotaur_female_first.json",
+        "descriptors": "minotaur_descriptors.json",
+        "gloss": "giant_poetic_gloss.json",
+    },
+    "bugbear": {
+        "given": "bugbear_given.json",
+        "epithets": "bugbear_epithets.json",
+        "gloss": "bugbear_poetic_gloss.json",
+    },
+    "harengon": {
+        "given": "harengon_given.json",
+        "family": "harengon_family.json",
+        "gloss": "harengon_poetic_gloss.json",
+    },
+    "leonin": {
+        "male_first": "leonin_male_first.json",
+        "female_first": "leonin_female_first.json",
+        "pridenames": "leonin_pridenames.json",
+        "gloss": "leonin_poetic_gloss.json",
+    },
+    "loxodon": {
+        "male_first": "loxodon_male_first.json",
+        "female_first": "loxodon_female_first.json",
+        "herdnames": "loxodon_herdnames.json",
+        "gloss": "loxodon_poetic_gloss.json",
+    },
+    "aasimar": {
+        "prefixes": "aasimar_base_prefixes.json",
+        "middles": "aasimar_base_middles.json",
+        "suffixes": "aasimar_base_suffixes.json",
+        "titles": "aasimar_celestial_titles.json",
+        "gloss": "aasimar_poetic_gloss.json",
+    },
+    "githyanki": {
+        "male_first": "githyanki_male_first.json",
+        "female_first": "githyanki_female_first.json",
+        "titles": "githyanki_titles.json",
+        "gloss": "githyanki_poetic_gloss.json",
+    },
+}
+
+
+def _load_race(race_key, fresh=None):
+    """
+    Loads and validates one race's files. Lists must be lists, the gloss a dict.
+    fresh maps filename -> newly parsed content to use instead of the cache (hot reload).
+    """
+    race_data = {}
+    for field, filename in RACE_FILES[race_key].items():
+        value = fresh[filename] if fresh and filename in fresh else load_json(filename)
+        expected = dict if field == "gloss" else list
+        if value and not isinstance(value, expected):
+            diagnostics.error(f"{filename} should contain a JSON {expected.__name__}; ignoring it.")
+            value = None
+        race_data[field] = value if value else expected() # Use loaded data or an empty default
+    return race_data
+
+
+class LazyRaceData(Mapping):
+    """
+    Read-only mapping of race_key -> race data dict that loads each race's files
+    on first access. Membership tests and iteration never touch the disk.
+    """
+
+    def __init__(self, race_files):
+        self._race_files = race_files
+        self._loaded = {}
+
+    def __getitem__(self, race_key):
+        race_data = self._loaded.get(race_key)
+        if race_data is None:
+            if race_key not in self._race_files:
+                raise KeyError(race_key)
+            with _load_lock:
+                race_data = self._loaded.get(race_key)
+                if race_data is None:
+                    race_data = self._loaded[race_key] = _load_race(race_key)
+        return race_data
+
+    def __contains__(self, race_key):
+        return race_key in self._race_files
+
+    def __iter__(self):
+        return iter(self._race_files)
+
+    def __len__(self):
+        return len(self._race_files)
+
+    def loaded_races(self):
+        """Race keys whose files have been read so far."""
+        return list(self._loaded)
+
+
+name_data = LazyRaceData(RACE_FILES)
+
+
+# === Load Base Data (on first use) ===
+# Module-level names such as `races` or `kenku_names` are resolved on first
+# access through __getattr__ below and then cached as ordinary globals.
+def _check_calendar_data(calendar_data):
+    if not calendar_data or "months" not in calendar_data:
+         diagnostics.error("Failed to load valid calendar data! Tracker will not work.")
+         calendar_data = {"months": [], "year_suffix": "ERR"}
+    return calendar_data
+
+
+def _check_deities(deities):
+    if not deities or not isinstance(deities, list):
+         diagnostics.error("Failed to load valid deity data! Lore tab might be empty.")
+         deities = [] # Set to empty list on failure
+    return deities
+
+
+# name -> (filename, check applied to the parsed file or None)
+_LAZY_GLOBALS = {
+    "races": ("races.json", None),
+    "npc_attributes": ("npc_attributes.json", None),
+    "calendar_data": ("tivmir_calendar.json", _check_calendar_data),
+    "deities": ("deities.json", _check_deities),
+    # Single name lists
+    "kenku_names": ("kenku_names.json", None),
+    "lizardfolk_names": ("lizardfolk_names.json", None),
+    "yuan_ti_names": ("yuan-ti_names.json", None),
+    "goblin_names": ("goblin_names.json", None),
+    "shifter_names": ("shifter_names.json", None),
+}
+
+
+def _load_global(name, value=None):
+    filename, check = _LAZY_GLOBALS[name]
+    value = load_json(filename) if value is None else value
+    return check(value) if check else value
+
+
+def __getattr__(name):
+    if name not in _LAZY_GLOBALS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _load_lock:
+        if name not in globals():
+            globals()[name] = _load_global(name)
+    return globals()[name]
+
+
+def preload():
+    """Loads every race and base data file now, e.g. for servers that want everything warm."""
+    for race_key in name_data:
+        name_data[race_key]
+    for name in _LAZY_GLOBALS:
+        __getattr__(name)
+
+
+def index_by_name(entries, key="name"):
+    """{entry[key]: entry} for the dict entries that have one; the first entry wins on duplicates."""
+    index = {}
+    for entry in entries or ():
+        if isinstance(entry, dict) and key in entry:
+            index.setdefault(entry[key], entry)
+    return index
+
+
+# === Hot Reload ===
+# reload_files() re-reads changed data files and swaps them in without a
+# restart (see data_watch.py for the watcher that calls it). Each file is
+# parsed and type-checked first; one that fails keeps its old content. Only
+# the races and globals that use a changed file are rebuilt, each as a new
+# object, so code already holding the old race dict or a grammar compiled from
+# it finishes with a consistent snapshot. Everything is swapped in under the
+# load lock, then the reload listeners (grammars, name indexes, the calendar)
+# update what they derived from the old data.
+
+_reload_listeners = []
+
+
+class DataReload:
+    """What a reload_files() call swapped in: filenames, race keys and module global names."""
+    __slots__ = ("files", "races", "globals")
+
+    def __init__(self, files, races, globals_):
+        self.files = frozenset(files)
+        self.races = frozenset(races)
+        self.globals = frozenset(globals_)
+
+    def __repr__(self):
+        return f"DataReload(files={sorted(self.files)}, races={sorted(self.races)}, globals={sorted(self.globals)})"
+
+
+def add_reload_listener(listener):
+    """Calls listener(DataReload) after every reload that changed something."""
+    if listener not in _reload_listeners:
+        _reload_listeners.append(listener)
+
+
+def _expected_type(filename):
+    """The JSON type every user of filename expects (dict or list), or None if unknown."""
+    for name, (global_file, _) in _LAZY_GLOBALS.items():
+        if global_file == filename:
+            return dict if name in ("npc_attributes", "calendar_data") else list
+    for fields in RACE_FILES.values():
+        for field, race_file in fields.items():
+            if race_file == filename:
+                return dict if field == "gloss" else list
+    return None
+
+
+def _parse_fresh(filename):
+    """Parses filename straight from disk for a reload. Returns None (after reporting why) if it can't be used."""
+    path = os.path.join(DATA_DIR, filename)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            value = json.load(f)
+    except (OSError, ValueError) as e:
+        diagnostics.error(f"Not reloading {filename}, keeping the previous version: {e}")
+        return None
+    expected = _expected_type(filename)
+    if expected is not None and not isinstance(value, expected):
+        diagnostics.error(f"Not reloading {filename}: it should contain a JSON {expected.__name__}; keeping the previous version.")
+        return None
+    return value
+
+
+def reload_files(filenames):
+    """
+    Re-reads the given data files and atomically swaps them in. Returns the
+    DataReload passed to the listeners, or None if no file could be reloaded.
+    """
+    global _corpus, _corpus_checked
+    fresh = {}
+    for filename in filenames:
+        value = _parse_fresh(filename)
+        if value is not None:
+            fresh[filename] = value
+    if not fresh:
+        return None
+
+    # Rebuild only what was already loaded; anything else will load the new files on first use
+    races = {race_key: _load_race(race_key, fresh) for race_key in name_data.loaded_races()
+             if not fresh.keys().isdisjoint(RACE_FILES[race_key].values())}
+    loaded_globals = [name for name in _LAZY_GLOBALS if name in globals()]
+    new_globals = {name: _load_global(name, fresh[_LAZY_GLOBALS[name][0]])
+                   for name in loaded_globals if _LAZY_GLOBALS[name][0] in fresh}
+
+    # Rebuilt on every reload that swaps something in, so a corpus switched off
+    # by an earlier bad file comes back with the first reload after it is fixed
+    new_corpus = None
+    if USE_CORPUS:
+        from . import corpus
+        try:
+            new_corpus = corpus.open_corpus(DATA_DIR)
+        except (OSError, ValueError, TypeError) as e:
+            diagnostics.warning(f"Could not rebuild the compiled corpus; reading JSON files directly: {e}")
+
+    with _load_lock:
+        _json_cache.update(fresh)
+        name_data._loaded.update(races)
+        globals().update(new_globals)
+        _corpus, _corpus_checked = new_corpus, True
+
+    event = DataReload(fresh, races, new_globals)
+    diagnostics.info(f"Reloaded {', '.join(sorted(fresh))}")
+    for listener in list(_reload_listeners):
+        try:
+            listener(event)
+        except Exception as e:
+            diagnostics.error(f"Reload listener {getattr(listener, '__qualname__', listener)} failed: {e}")
+    return event
+
+
+# Emoji Icons
+icons = {
+    "Appearance": "👁️",
+    "Worships": "🙏",
+    "Quirk": "🎭",
+    "Secret": "🔒",
+    "Goal": "🎯",
+    "Fear": "😨",
+    "Profession": "🔮",
+    "Ally": "🧡"
+}
\ No newline at end of file
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import threading
+from . import data_loader
+from . import diagnostics
+
+# === Data File Watcher ===
+# Polls data/*.json for edits and hands changed files to
+# data_loader.reload_files. A poll stats every file (well under a millisecond
+# for the ~110 files); only files whose size or mtime moved are read and
+# hashed, and only those whose content actually differs are reloaded, so
+# saving a file unchanged or touching it costs nothing downstream.
+
+DEFAULT_INTERVAL = 2.0
+
+
+def _digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+class DataWatcher:
+    """Detects changed data files by stat, confirms by content hash, and reloads them."""
+
+    def __init__(self, data_dir=None, interval=DEFAULT_INTERVAL):
+        self.data_dir = data_dir or data_loader.DATA_DIR
+        self.interval = interval
+        self._stats = {} # filename -> (size, mtime_ns)
+        self._digests = {} # filename -> sha256 of the content last seen
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        for filename, stat in self._scan().items():
+            self._remember(filename, stat)
+
+    def _scan(self):
+        stats = {}
+        for entry in os.scandir(self.data_dir):
+            if entry.name.endswith(".json") and entry.is_file():
+                st = entry.stat()
+                stats[entry.name] = (st.st_size, st.st_mtime_ns)
+        return stats
+
+    def _remember(self, filename, stat):
+        try:
+            self._digests[filename] = _digest(os.path.join(self.data_dir, filename))
+            self._stats[filename] = stat
+        except OSError:
+            pass # Vanished between scan and read; seen as changed next poll
+
+    def changed_files(self):
+        """Filenames whose content changed (or that appeared or disappeared) since the last call."""
+        stats = self._scan()
+        changed = set()
+        for filename, stat in stats.items():
+            if self._stats.get(filename) == stat:
+                continue
+            old_digest = self._digests.get(filename)
+            self._remember(filename, stat)
+            if self._digests.get(filename) != old_digest:
+                changed.add(filename)
+        for filename in self._stats.keys() - stats.keys():
+            del self._stats[filename]
+            self._digests.pop(filename, None)
+            changed.add(filename)
+        return changed
+
+    def poll(self):
+        """Reloads whatever changed since the last poll. Returns the DataReload, or None."""
+        with self._poll_lock:
+            changed = self.changed_files()
+            if not changed:
+                return None
+            return data_loader.reload_files(sorted(changed))
+
+    # --- Background thread ---
+    def start(self):
+        """Polls every `interval` seconds on a daemon thread until stop()."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="tivmir-data-watch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e: # Keep watching; one bad poll shouldn't end hot reload for the process
+                diagnostics.error(f"Data watcher poll failed: {e}")
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def watch_data(interval=DEFAULT_INTERVAL):
+    """Starts (once per process) and returns the shared DataWatcher for data_loader.DATA_DIR."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = DataWatcher(interval=interval).start()
+        return _watcher
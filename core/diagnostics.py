@@ -0,0 +1,45 @@
+import logging
+
+# === Diagnostics Sink ===
+# Core modules report problems through error()/warning()/info()/debug() here
+# instead of calling Streamlit directly. The active sink decides where they go:
+# the default logs them, the Streamlit app installs one that renders st.error
+# and friends, and batch jobs can install null_sink to drop them entirely.
+
+logger = logging.getLogger("tivmir")
+
+
+def logging_sink(level, message):
+    """Default sink: forwards to the 'tivmir' logger."""
+    logger.log(level, message)
+
+
+def null_sink(level, message):
+    """Discards every message."""
+
+
+_sink = logging_sink
+
+
+def set_sink(sink):
+    """Installs sink(level, message) and returns the previous one. None restores logging."""
+    global _sink
+    previous = _sink
+    _sink = sink or logging_sink
+    return previous
+
+
+def error(message):
+    _sink(logging.ERROR, message)
+
+
+def warning(message):
+    _sink(logging.WARNING, message)
+
+
+def info(message):
+    _sink(logging.INFO, message)
+
+
+def debug(message):
+    _sink(logging.DEBUG, message)
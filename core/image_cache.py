@@ -0,0 +1,129 @@
+"""
+Pre-sized derivatives of the images in images/ (deity symbols are 1024px PNGs
+of 2-3 MB, shown at 100px), so pages ship a few KB instead of megabytes.
+
+Derivatives are written to images/derived/ as
+    <stem>-<first 16 hex digits of the source's sha256>-<variant>.<format>
+so a changed source gets new files, and derivatives of older content are
+removed when the new ones are written. Sources are only re-hashed when their
+size or mtime changes. Each variant exists as WebP (smallest) and PNG.
+
+Build everything ahead of time with `python -m core.image_cache`, or let
+image_path() create each derivative the first time it is asked for.
+"""
+import os
+import sys
+import threading
+from . import diagnostics
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+DERIVED_DIRNAME = "derived"
+
+# Variant -> longest side in pixels. "thumb" is twice the 100px the Lore tab shows, for high-DPI screens.
+VARIANTS = {"thumb": 200, "medium": 512}
+FORMATS = ("webp", "png")
+_SAVE_OPTIONS = {"webp": {"quality": 85, "method": 4}, "png": {"optimize": True}}
+
+_lock = threading.Lock()
+_hashes = {} # source path -> (size, mtime_ns, hex digest)
+_pillow_missing = False
+
+
+def derived_dir(images_dir=IMAGES_DIR):
+    return os.path.join(images_dir, DERIVED_DIRNAME)
+
+
+def source_digest(path):
+    """First 16 hex digits of path's sha256, cached until its size or mtime changes."""
+    st = os.stat(path)
+    cached = _hashes.get(path)
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest = digest.hexdigest()[:16]
+    _hashes[path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def _derivative_name(filename, digest, variant, fmt):
+    return f"{os.path.splitext(filename)[0]}-{digest}-{variant}.{fmt}"
+
+
+def _render(source_path, out_dir, filename, digest, variant, fmt):
+    """Writes one derivative of a source, then removes derivatives of its older content."""
+    from PIL import Image
+    os.makedirs(out_dir, exist_ok=True)
+    with Image.open(source_path) as image:
+        size = VARIANTS[variant]
+        # reducing_gap lets Pillow shrink by whole factors first, then resample the rest
+        image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        path = os.path.join(out_dir, _derivative_name(filename, digest, variant, fmt))
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        image.save(tmp_path, format=fmt.upper(), **_SAVE_OPTIONS[fmt])
+        os.replace(tmp_path, path) # Readers see either no file or a complete one
+    stem = os.path.splitext(filename)[0] + "-"
+    for old in os.listdir(out_dir):
+        if old.startswith(stem) and old[len(stem):].count("-") == 1 and not old[len(stem):].startswith(digest):
+            try:
+                os.remove(os.path.join(out_dir, old))
+            except OSError:
+                pass
+
+
+def image_path(filename, variant="thumb", fmt="webp", images_dir=IMAGES_DIR):
+    """
+    Path of filename's derivative, created on first use. Falls back to the
+    original when Pillow is unavailable or the derivative can't be written,
+    and returns None if the source itself doesn't exist.
+    """
+    global _pillow_missing
+    if variant not in VARIANTS or fmt not in FORMATS:
+        raise ValueError(f"Unknown image variant {variant!r} or format {fmt!r}.")
+    source_path = os.path.join(images_dir, filename)
+    if not os.path.isfile(source_path):
+        return None
+    if _pillow_missing:
+        return source_path
+    digest = source_digest(source_path)
+    out_dir = derived_dir(images_dir)
+    path = os.path.join(out_dir, _derivative_name(filename, digest, variant, fmt))
+    if os.path.exists(path):
+        return path
+    with _lock:
+        if not os.path.exists(path):
+            try:
+                _render(source_path, out_dir, filename, digest, variant, fmt)
+            except ImportError:
+                _pillow_missing = True
+                diagnostics.warning("Pillow is not installed; serving full-size images.")
+                return source_path
+            except OSError as e:
+                diagnostics.warning(f"Could not write image derivatives for '{filename}': {e}")
+                return source_path
+    return path
+
+
+def preload(filenames, variant="thumb", fmt="webp", images_dir=IMAGES_DIR):
+    """Makes sure derivatives exist for every filename (e.g. before a gallery is shown). Returns {filename: path}."""
+    return {filename: image_path(filename, variant, fmt, images_dir) for filename in filenames if filename}
+
+
+def build_all(images_dir=IMAGES_DIR):
+    """Builds every derivative for every image in images_dir. Returns the number of sources processed."""
+    filenames = sorted(f for f in os.listdir(images_dir) if f.lower().endswith((".png", ".jpg", ".jpeg", ".webp")))
+    for variant in VARIANTS:
+        for fmt in FORMATS:
+            preload(filenames, variant, fmt, images_dir)
+    return len(filenames)
+
+
+if __name__ == "__main__":
+    images_dir = sys.argv[1] if len(sys.argv) > 1 else IMAGES_DIR
+    count = build_all(images_dir)
+    out_dir = derived_dir(images_dir)
+    total = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir))
+    print(f"Wrote derivatives of {count} images to {out_dir}: {total:,} bytes")
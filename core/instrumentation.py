@@ -0,0 +1,222 @@
+import functools
+import json
+import os
+import time
+
+# === Hot-Path Instrumentation ===
+# Call counts and latency histograms for the generators, plus how long each
+# data file took to load. Off by default; turn it on with enable() or by
+# setting TIVMIR_INSTRUMENT=1 before import. Disabled, a timed function costs
+# one extra call and a global flag check, so the hooks stay in production
+# code permanently.
+#
+# Histograms are HDR-style: values (nanoseconds) are counted in log-linear
+# buckets with SUB_BUCKETS steps per power of two, so every recorded value is
+# kept to within 1/SUB_BUCKETS (~3%) in a few hundred integers, whatever the
+# range. Recording is lock-free: concurrent threads can very rarely lose an
+# increment, which is fine for profiling.
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_SUB_BUCKET_SHIFT = SUB_BUCKET_BITS + 1 # Values below 2**this are counted exactly
+
+_enabled = os.environ.get("TIVMIR_INSTRUMENT", "") not in ("", "0")
+_clock = time.perf_counter_ns
+_histograms = {} # name -> Histogram
+_loads = {} # filename -> (nanoseconds, bytes, source)
+
+
+def enabled():
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Drops every recorded timing."""
+    _histograms.clear()
+    _loads.clear()
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integer values."""
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def bucket_index(value):
+        shift = value.bit_length() - _SUB_BUCKET_SHIFT
+        if shift <= 0:
+            return value
+        return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+    @staticmethod
+    def bucket_range(index):
+        """(lowest, highest) value counted in bucket index."""
+        shift = max((index >> SUB_BUCKET_BITS) - 1, 0)
+        mantissa = index - (shift << SUB_BUCKET_BITS)
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        index = self.bucket_index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def percentile(self, percent):
+        """Value at or below which `percent` of recorded values fall (midpoint of its bucket)."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                low, high = self.bucket_range(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        return {
+            "count": self.count, "total_ns": self.total, "mean_ns": round(self.mean()),
+            "min_ns": self.min or 0, "p50_ns": self.percentile(50), "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99), "max_ns": self.max,
+        }
+
+
+def histogram(name):
+    hist = _histograms.get(name)
+    if hist is None:
+        hist = _histograms.setdefault(name, Histogram())
+    return hist
+
+
+def record(name, nanoseconds):
+    """Adds one timing to the histogram `name` (if instrumentation is on)."""
+    if _enabled:
+        histogram(name).record(nanoseconds)
+
+
+def timed(name=None):
+    """Decorator: records each call's duration under `name` (default module.qualname)."""
+    def decorate(func):
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = _clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram(label).record(_clock() - start)
+        return wrapper
+    return decorate
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = _clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        histogram(self.name).record(_clock() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """Context manager that records the duration of its block under `name`."""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def record_load(filename, nanoseconds, size, source):
+    """Records one data file load (source is "corpus" or "json")."""
+    if _enabled:
+        _loads[filename] = (nanoseconds, size, source)
+
+
+# === Reports ===
+
+def snapshot():
+    """Everything recorded so far as plain data: {"timers": {name: summary}, "loads": {filename: ...}}."""
+    return {
+        "enabled": _enabled,
+        "timers": {name: hist.summary() for name, hist in sorted(_histograms.items())},
+        "loads": {filename: {"ns": ns, "bytes": size, "source": source}
+                  for filename, (ns, size, source) in sorted(_loads.items(), key=lambda item: -item[1][0])},
+    }
+
+
+def report_json(indent=2):
+    return json.dumps(snapshot(), indent=indent)
+
+
+def _us(nanoseconds):
+    return f"{nanoseconds / 1000:,.1f}"
+
+
+def report_text():
+    """Fixed-width tables of the timers (by total time) and file loads (slowest first)."""
+    lines = []
+    if not _enabled and not _histograms and not _loads:
+        return "Instrumentation is off (enable() or TIVMIR_INSTRUMENT=1)."
+    if _histograms:
+        width = max(len(name) for name in _histograms)
+        lines.append(f"{'timer':<{width}} {'calls':>9} {'mean us':>10} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'max us':>10} {'total ms':>10}")
+        for name, hist in sorted(_histograms.items(), key=lambda item: -item[1].total):
+            lines.append(f"{name:<{width}} {hist.count:>9,} {_us(hist.mean()):>10} {_us(hist.percentile(50)):>10} "
+                         f"{_us(hist.percentile(90)):>10} {_us(hist.percentile(99)):>10} {_us(hist.max):>10} "
+                         f"{hist.total / 1e6:>10,.1f}")
+    if _loads:
+        if lines:
+            lines.append("")
+        width = max(len(filename) for filename in _loads)
+        lines.append(f"{'file':<{width}} {'source':>6} {'KiB':>9} {'load ms':>9}")
+        for filename, (ns, size, source) in sorted(_loads.items(), key=lambda item: -item[1][0]):
+            lines.append(f"{filename:<{width}} {source:>6} {size / 1024:>9,.1f} {ns / 1e6:>9,.2f}")
+        total_ns = sum(ns for ns, _, _ in _loads.values())
+        lines.append(f"{len(_loads)} files, {total_ns / 1e6:,.1f} ms")
+    return "\n".join(lines) if lines else "Nothing recorded yet."
@@ -0,0 +1,193 @@
+import random
+import numpy as np
+from .name_generators import GRAMMARS
+from .name_grammar import _LITERAL, _PICK, _CORE
+from .name_helpers import _generate_poetic_meaning
+
+# === Batch Name Generation ===
+# Vectorised counterpart of CompiledGrammar.sample for rosters of many names.
+# Every index for the batch is drawn as a NumPy integer array and the strings
+# are assembled column by column with object-array concatenation, so the
+# per-name Python work is a handful of C-level string adds. generate_samples
+# also keeps each step's chosen entries as a column (with a presence mask for
+# optional middles and groups) and only the poetic meaning is built per name.
+
+
+class _Pools:
+    """
+    Several part lists concatenated into one object array, drawn by selector.
+    When any list has an alias table, the tables are concatenated too (prob,
+    and alias as an index into the whole array; unweighted lists get prob 1).
+    """
+    __slots__ = ("entries", "texts", "ends_vowel", "offsets", "lengths", "prob", "alias")
+
+    def __init__(self, lists, tables=None):
+        entries = [entry for entry_list in lists for entry in entry_list]
+        self.entries = np.empty(len(entries), dtype=object)
+        self.entries[:] = entries
+        self.texts = np.array([e["text"] for e in entries], dtype=object)
+        self.ends_vowel = np.array([bool(e.get("ends_vowel", False)) for e in entries], dtype=bool)
+        self.lengths = np.array([len(entry_list) for entry_list in lists], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64)
+        self.prob = self.alias = None
+        if tables is not None and any(table is not None for table in tables):
+            prob, alias = [], []
+            for offset, entry_list, table in zip(self.offsets.tolist(), lists, tables):
+                prob.extend(table.prob if table is not None else [1.0] * len(entry_list))
+                alias.extend(offset + i for i in (table.alias if table is not None else range(len(entry_list))))
+            self.prob = np.array(prob, dtype=np.float64)
+            self.alias = np.array(alias, dtype=np.int64)
+
+    def draw(self, rng, selector):
+        """Draws one entry per row from pool selector[row]. Returns entry indices."""
+        lengths = self.lengths[selector]
+        if self.prob is None:
+            return self.offsets[selector] + rng.integers(0, lengths)
+        # Alias method, as AliasTable.draw: integer part picks the column, fraction the coin
+        u = rng.random(len(lengths)) * lengths
+        column = u.astype(np.int64)
+        index = self.offsets[selector] + column
+        return np.where(u - column < self.prob[index], index, self.alias[index])
+
+
+class _BatchPlan:
+    """Per-grammar arrays built on first use and reused by every batch."""
+    __slots__ = ("grammar", "pools")
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.pools = {} # (id(step), gender) -> _Pools or tuple of _Pools
+
+    def pick_pools(self, step, gender):
+        key = (id(step), gender)
+        pools = self.pools.get(key)
+        if pools is None:
+            aliases = step[3] and (step[3].get(gender) or step[3]["Any"])
+            pools = self.pools[key] = _Pools(step[1].get(gender) or step[1]["Any"], aliases)
+        return pools
+
+    def core_pools(self, step, gender):
+        key = (id(step), gender)
+        pools = self.pools.get(key)
+        if pools is None:
+            table = step[1]
+            middles = _Pools([table.middle_buckets[False], table.middle_buckets[True]],
+                             [table.middle_aliases[False], table.middle_aliases[True]]) if table.middles else None
+            suffixes = _Pools([table.suffix_bucket(gender, False), table.suffix_bucket(gender, True)],
+                              [table.suffix_aliases[(gender, False)], table.suffix_aliases[(gender, True)]])
+            pools = self.pools[key] = (_Pools([table.prefixes], [table.prefix_alias]), middles, suffixes)
+        return pools
+
+
+_plans = {}
+
+
+def _plan_for(race_key):
+    grammar = GRAMMARS.get(race_key)
+    if grammar is None:
+        raise KeyError(f"Unknown race grammar: {race_key!r}")
+    plan = _plans.get(race_key)
+    if plan is None or plan.grammar is not grammar:
+        plan = _plans[race_key] = _BatchPlan(grammar)
+    return plan
+
+
+def _draw_core(pools, n, rng, parts=None):
+    """Vectorised P[M]S: 30% middle coin flip, then smooth middle and suffix buckets."""
+    prefixes, middles, suffixes = pools
+    zeros = np.zeros(n, dtype=np.int64)
+
+    use_middle = rng.random(n) < 0.3
+    prefix_idx = prefixes.draw(rng, zeros)
+    column = prefixes.texts[prefix_idx]
+    ends_vowel = prefixes.ends_vowel[prefix_idx]
+    if parts is not None:
+        parts.append((prefixes.entries[prefix_idx], None, True))
+
+    if middles is not None:
+        # Middle bucket 1 holds parts that join smoothly after a vowel
+        middle_idx = middles.draw(rng, ends_vowel.astype(np.int64))
+        column = np.where(use_middle, column + middles.texts[middle_idx], column)
+        ends_vowel = np.where(use_middle, middles.ends_vowel[middle_idx], ends_vowel)
+        if parts is not None:
+            parts.append((middles.entries[middle_idx], use_middle, True))
+
+    suffix_idx = suffixes.draw(rng, ends_vowel.astype(np.int64))
+    if parts is not None:
+        parts.append((suffixes.entries[suffix_idx], None, True))
+    return column + suffixes.texts[suffix_idx]
+
+
+def _draw_steps(plan, steps, n, gender, rng, parts=None):
+    """
+    The name column for steps. If parts is a list, (entries column, presence mask
+    or None, glossed) is appended to it for every part-drawing step.
+    """
+    column = np.full(n, "", dtype=object)
+    for step in steps:
+        op = step[0]
+        if op == _LITERAL:
+            column = column + step[1]
+        elif op == _PICK:
+            pools = plan.pick_pools(step, gender)
+            # Gendered "Any" slots hold two lists; pick the list first, as the single path does
+            selector = rng.integers(0, len(pools.lengths), n) if len(pools.lengths) > 1 else np.zeros(n, dtype=np.int64)
+            drawn = pools.draw(rng, selector)
+            column = column + pools.texts[drawn]
+            if parts is not None:
+                parts.append((pools.entries[drawn], None, step[2]))
+        elif op == _CORE:
+            column = column + _draw_core(plan.core_pools(step, gender), n, rng, parts)
+        else: # _GROUP
+            include = rng.random(n) < step[1]
+            group_parts = [] if parts is not None else None
+            group = _draw_steps(plan, step[2], n, gender, rng, group_parts)
+            column = np.where(include, column + group, column)
+            if parts is not None:
+                parts.extend((entries, include if mask is None else include & mask, glossed)
+                             for entries, mask, glossed in group_parts)
+    return column
+
+
+def generate_names(race, n, gender="Any", seed=None):
+    """
+    Generates n names for the grammar race key `race` (e.g. "elf", "draconic").
+    Returns a list of name strings; poetic meanings are not computed in batch.
+    seed may be an int, a SeedSequence (e.g. seeding.stream_seed(job_seed, shard))
+    or a numpy Generator. The stream is reproducible but differs from the per-call path.
+    """
+    plan = _plan_for(race)
+    if plan.grammar.error:
+        raise ValueError(plan.grammar.error)
+    if n <= 0:
+        return []
+    rng = np.random.default_rng(seed)
+    return _draw_steps(plan, plan.grammar.steps, n, gender, rng).tolist()
+
+
+def generate_samples(race, n, gender="Any", seed=None):
+    """
+    Like generate_names, but returns sample()-style dicts ('name', 'parts',
+    'poetic', 'error'), as CompiledGrammar.sample does. Draws stay vectorised;
+    only the poetic meanings are built name by name.
+    """
+    plan = _plan_for(race)
+    if plan.grammar.error:
+        raise ValueError(plan.grammar.error)
+    if n <= 0:
+        return []
+    rng = np.random.default_rng(seed)
+    columns = []
+    names = _draw_steps(plan, plan.grammar.steps, n, gender, rng, columns).tolist()
+    columns = [(entries.tolist(), mask.tolist() if mask is not None else None, glossed) for entries, mask, glossed in columns]
+    gloss = plan.grammar.gloss
+    poetic_rng = random.Random(int(rng.integers(2 ** 63))) # Templates are picked with the stdlib API
+    samples = []
+    for row, name in enumerate(names):
+        parts = [entries[row] for entries, mask, _ in columns if mask is None or mask[row]]
+        poetic = ""
+        if gloss is not None:
+            glossed = [entries[row] for entries, mask, is_glossed in columns if is_glossed and (mask is None or mask[row])]
+            poetic = _generate_poetic_meaning(glossed, gloss, poetic_rng)
+        samples.append({"name": name, "parts": parts, "poetic": poetic, "error": None})
+    return samples
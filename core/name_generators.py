@@ -0,0 +1,432 @@
+# Import data and core helpers from other modules in the core package
+from . import diagnostics
+from . import data_loader
+from . import instrumentation
+from .data_loader import index_by_name, name_data
+from .name_grammar import compile_grammars
+from .name_helpers import alias_table, forget_gloss_index, weighted_choice
+from .seeding import make_rng
+
+# === Race Grammars ===
+# race_key -> (label used in error messages, grammar spec). See name_grammar for the syntax.
+RACE_GRAMMARS = {
+    "elf": ("Elven", "P[M]S"),
+    "orc": ("Orcish", "P[M]S (' ' surnames(nogloss)?)"),
+    "infernal": ("Infernal", "P[M]S (' ' surnames(nogloss)?)"),
+    "tabaxi": ("Tabaxi", "P[M]S"),
+    "drow": ("Drow", "P[M]S (' ' surnames(nogloss)?)"),
+    "draconic": ("Draconic", "clans '-k-' P[M]S"),
+    "aarakocra": ("Aarakocra", "lineages ' ' P[M]S"),
+    "owlin": ("Owlin", "personal + descriptors"),
+    "tortle": ("Tortle", "given ' ' descriptors(gendered)"),
+    "triton": ("Triton", "given '-' markers"),
+    "ignan": ("Ignan (Fire Genasi)", "P[M]S"),
+    "terran": ("Terran (Earth Genasi)", "P[M]S"),
+    "air_genasi": ("Air Genasi", "P[M]S"),
+    "water_genasi": ("Water Genasi", "P[M]S"),
+    "sylvan": ("Sylvan (Eladrin)", "P[M]S"),
+    "gnomish": ("Gnomish", "first(gendered) ' ' clans (' ' descriptors)@0.5"),
+    "halfling": ("Halfling", "first(gendered) ' ' family"),
+    "goliath": ("Goliath", "given ' ' titles"),
+    "minotaur": ("Minotaur", "first(gendered) ' ' descriptors"),
+    "bugbear": ("Bugbear", "given ' ' epithets"),
+    "harengon": ("Harengon", "given ' ' family"),
+    "leonin": ("Leonin", "first(gendered) + ' ' + pridenames"),
+    "loxodon": ("Loxodon", "first(gendered) ' ' herdnames"),
+    "aasimar": ("Aasimar", "P[M]S (' ' titles)@0.4"),
+    "githyanki": ("Githyanki", "first(gendered) ' ' titles"),
+    "common": ("Common", "first_names(gendered, nogloss) ' ' surnames(nogloss)"),
+    "kenku": ("Kenku", "names(nogloss)"),
+    "lizardfolk": ("Lizardfolk", "names(nogloss)"),
+    "yuan_ti": ("Yuan-Ti", "names(nogloss)"),
+    "goblin": ("Goblin", "names(nogloss)"),
+    "shifter": ("Shifter", "names(nogloss)"),
+}
+
+# Single-list races live outside name_data; wrap them so they compile like the rest
+_SINGLE_NAME_LISTS = {
+    "kenku": "kenku_names",
+    "lizardfolk": "lizardfolk_names",
+    "yuan_ti": "yuan_ti_names",
+    "goblin": "goblin_names",
+    "shifter": "shifter_names",
+}
+
+
+def _grammar_source(race_key):
+    if race_key in _SINGLE_NAME_LISTS:
+        return {"names": getattr(data_loader, _SINGLE_NAME_LISTS[race_key])}
+    return name_data.get(race_key)
+
+
+# Each race is compiled once, on first use; the generate_* functions below only sample from these
+GRAMMARS = compile_grammars(RACE_GRAMMARS, _grammar_source)
+
+
+def reloaded_race_keys(event):
+    """Grammar race keys whose data a data_loader.DataReload replaced."""
+    return set(event.races) | {race_key for race_key, name in _SINGLE_NAME_LISTS.items() if name in event.globals}
+
+
+def _on_data_reload(event):
+    for old, new in GRAMMARS.refresh(reloaded_race_keys(event)):
+        if old.gloss is not None and old.gloss is not new.gloss:
+            forget_gloss_index(old.gloss)
+
+
+data_loader.add_reload_listener(_on_data_reload)
+
+
+# === Name Results ===
+# race_key -> (icon, poetic label). A label of None means "(First Name)" is
+# only added when a surname was actually appended.
+_MARKDOWN_STYLES = {
+    "elf": ("🌿", "Poetic Meaning:"),
+    "orc": ("⚙️", "Poetic Meaning (First Name):"),
+    "infernal": ("🔥", None),
+    "tabaxi": ("🐾", "Poetic Meaning:"),
+    "drow": ("🕷️", None),
+    "draconic": ("🐉", "Poetic Meaning:"),
+    "aarakocra": ("🐦", "Poetic Meaning:"),
+    "owlin": ("🦉", "Poetic Meaning:"),
+    "tortle": ("🐢", "Poetic Meaning:"),
+    "triton": ("🔱", "Poetic Meaning:"),
+    "ignan": ("🔥", "Poetic Meaning:"),
+    "terran": ("⛰️", "Poetic Meaning:"),
+    "air_genasi": ("💨", "Poetic Meaning:"),
+    "water_genasi": ("💧", "Poetic Meaning:"),
+    "sylvan": ("✨", "Poetic Meaning:"),
+    "gnomish": ("🍄", "Poetic Meaning:"),
+    "halfling": ("🧑‍🌾", "Poetic Meaning:"),
+    "goliath": ("🗿", "Poetic Meaning:"),
+    "minotaur": ("🐂", "Poetic Meaning:"),
+    "bugbear": ("🐻", "Poetic Meaning:"),
+    "harengon": ("🐇", "Poetic Meaning:"),
+    "leonin": ("🦁", "Poetic Meaning:"),
+    "loxodon": ("🐘", "Poetic Meaning:"),
+    "aasimar": ("😇", "Poetic Meaning:"),
+    "githyanki": ("⚔️", "Poetic Meaning:"),
+    "common": ("👤", None),
+    "kenku": ("🐦‍⬛", "No description available."), # Single-list races: label is the default meaning
+    "lizardfolk": ("🦎", "No description available."),
+    "yuan_ti": ("🐍", "Derived from Draconic/Ignan roots."),
+    "goblin": ("👺", "No description available."),
+    "shifter": ("🐺", "No description available."),
+}
+
+
+class NameResult:
+    """
+    One generated name: the name, the part entries it was built from, its poetic
+    meaning and (Tabaxi only) the clan name. The UI's markdown is only built when
+    markdown() or str() is called.
+    """
+    __slots__ = ("race_key", "name", "parts", "poetic", "clan", "error")
+
+    def __init__(self, race_key, name=None, parts=(), poetic="", clan=None, error=None):
+        self.race_key = race_key
+        self.name = name
+        self.parts = parts
+        self.poetic = poetic
+        self.clan = clan
+        self.error = error
+
+    @classmethod
+    def from_sample(cls, race_key, data, clan=None):
+        return cls(race_key, data["name"], data["parts"], data["poetic"], clan, data["error"])
+
+    def markdown(self):
+        if self.error: return f"Error: {self.error}"
+        if not self.name: return "Error: Name generation failed silently."
+        if self.race_key == "common": return _common_markdown(self)
+        if self.race_key in _SINGLE_NAME_LISTS: return _single_name_markdown(self)
+        markdown = _name_markdown(self)
+        if self.clan is not None:
+            markdown += _clan_markdown(self.clan)
+        return markdown
+
+    __str__ = markdown
+
+    def __repr__(self):
+        return f"NameResult({self.race_key!r}, {self.name!r})" if not self.error else f"NameResult({self.race_key!r}, error={self.error!r})"
+
+    def to_dict(self):
+        """Plain, JSON-serialisable form."""
+        return {
+            "race": self.race_key,
+            "name": self.name,
+            "parts": [{"text": p["text"], "meaning": p.get("meaning")} for p in self.parts],
+            "poetic": self.poetic,
+            "clan": self.clan,
+            "error": self.error,
+        }
+
+
+def _name_markdown(result):
+    """Formats a sampled name as the markdown block shown in the UI."""
+    icon, poetic_label = _MARKDOWN_STYLES[result.race_key]
+    if poetic_label is None:
+        poetic_label = _surname_label(result.race_key, result.parts)
+    meaning_lines = [f"- **{p['text']}** = {p.get('meaning', 'N/A')}" for p in result.parts]
+    return (f"{icon} **Name:** {result.name}\n\n" + "\n".join(meaning_lines) + f"\n\n➔ **{poetic_label}** {result.poetic}")
+
+
+def _single_name_markdown(result):
+    """Formats a name drawn from a single flat list (Kenku, Goblin, ...)."""
+    icon, default_meaning = _MARKDOWN_STYLES[result.race_key]
+    name_entry = result.parts[0]
+    return (f"{icon} **Name:** {name_entry['text']}\n\n" + f"*{name_entry.get('meaning', default_meaning)}*")
+
+
+def _common_markdown(result):
+    """Common names list each part's meaning; surnames may have none, and there is no poetic line."""
+    first_name_entry, surname_entry = result.parts
+    meaning_lines = []
+    meaning_lines.append(f"- **{first_name_entry['text']}** = {first_name_entry.get('meaning', 'N/A')}")
+    if 'meaning' in surname_entry:
+        meaning_lines.append(f"- **{surname_entry['text']}** = {surname_entry['meaning']}")
+    else:
+        meaning_lines.append(f"- **{surname_entry['text']}**")
+    return (
+        f"👤 **Name:** {result.name}\n\n" +
+        "\n".join(meaning_lines) +
+        "")
+
+
+def _clan_markdown(clan_name):
+    clan_info = _tabaxi_clan(clan_name)
+    if clan_info:
+        return (f"\n\n🏡 **Clan:** {clan_info['name']}\n\n" + f"• **Region:** {clan_info['region']}\n\n" + f"• **Traits:** {clan_info['traits']}\n\n" + f"• **Twist:** {clan_info['twist']}")
+    return f"\n\n🏡 **Clan:** {clan_name} (Details not found)"
+
+
+_clan_index = (None, {}) # (the clan list it was built from, clan name -> clan)
+
+
+def _tabaxi_clan(clan_name):
+    global _clan_index
+    clans = name_data["tabaxi"]["clans"]
+    if _clan_index[0] is not clans: # Rebuilt only if the clan data itself was replaced
+        _clan_index = (clans, index_by_name(clans))
+    return _clan_index[1].get(clan_name)
+
+
+_clan_choices = (None, [], None) # (the clan list it was built from, its valid clans, their alias table)
+
+
+def tabaxi_clan_choices(clans):
+    """(clans with a name, alias table over their weights or None); rebuilt only when clans is replaced."""
+    global _clan_choices
+    if _clan_choices[0] is not clans:
+        valid = [c for c in clans if isinstance(c, dict) and "name" in c]
+        _clan_choices = (clans, valid, alias_table(valid))
+    return _clan_choices[1], _clan_choices[2]
+
+
+def _surname_label(race_key, parts):
+    """Poetic meaning only covers the first name when a surname was appended."""
+    has_surname = len(parts) > 1 and bool(name_data.get(race_key, {}).get("surnames"))
+    return "Poetic Meaning (First Name):" if has_surname else "Poetic Meaning:"
+
+
+def _generate(race_key, gender="Any", rng=None):
+    return NameResult.from_sample(race_key, GRAMMARS[race_key].sample(gender, rng))
+
+
+# === Wrapper Functions (Public Interface) ===
+# Each returns a NameResult; str(result) gives the markdown the UI displays.
+
+def generate_elven_name(gender="Any", rng=None):
+    return _generate("elf", gender, rng)
+
+def generate_orc_name(gender="Any", rng=None):
+    return _generate("orc", gender, rng)
+
+def generate_infernal_name(gender="Any", rng=None):
+    return _generate("infernal", gender, rng)
+
+def generate_tabaxi_name(selected_clan, rng=None):
+    race_key = "tabaxi"
+    if race_key not in name_data: return NameResult(race_key, error="Tabaxi name data not loaded.")
+    if "clans" not in name_data[race_key] or not name_data[race_key]["clans"]:
+        diagnostics.error("Missing required Tabaxi clan data.")
+        return NameResult(race_key, error="Missing clan data.")
+    data = GRAMMARS[race_key].sample(rng=rng)
+    if data["error"] or not data["name"]: return NameResult.from_sample(race_key, data)
+    if _tabaxi_clan(selected_clan) is None:
+        diagnostics.warning(f"Could not find details for clan: {selected_clan}")
+    return NameResult.from_sample(race_key, data, clan=selected_clan)
+
+def generate_drow_name(gender="Any", rng=None):
+    return _generate("drow", gender, rng)
+
+def generate_dragonborn_name(rng=None):
+    return _generate("draconic", rng=rng)
+
+def generate_aarakocra_name(gender="Any", rng=None):
+    return _generate("aarakocra", gender, rng)
+
+def generate_owlin_name(rng=None):
+    return _generate("owlin", rng=rng)
+
+def generate_tortle_name(gender="Any", rng=None):
+    return _generate("tortle", gender, rng)
+
+def generate_triton_name(rng=None):
+    return _generate("triton", rng=rng)
+
+def generate_fire_genasi_name(rng=None):
+    return _generate("ignan", rng=rng)
+
+def generate_earth_genasi_name(rng=None):
+    return _generate("terran", rng=rng)
+
+def generate_air_genasi_name(rng=None):
+    return _generate("air_genasi", rng=rng)
+
+def generate_water_genasi_name(rng=None):
+    return _generate("water_genasi", rng=rng)
+
+def generate_eladrin_name(rng=None):
+    return _generate("sylvan", rng=rng)
+
+def generate_kenku_name(rng=None):
+    return _generate("kenku", rng=rng)
+
+def generate_lizardfolk_name(rng=None):
+    return _generate("lizardfolk", rng=rng)
+
+def generate_yuan_ti_name(rng=None):
+    return _generate("yuan_ti", rng=rng)
+
+def generate_goblin_name(rng=None):
+    return _generate("goblin", rng=rng)
+
+def generate_gnome_name(gender="Any", rng=None):
+    return _generate("gnomish", gender, rng)
+
+def generate_halfling_name(gender="Any", rng=None):
+    return _generate("halfling", gender, rng)
+
+def generate_goliath_name(rng=None):
+    return _generate("goliath", rng=rng)
+
+def generate_minotaur_name(gender="Any", rng=None):
+    return _generate("minotaur", gender, rng)
+
+def generate_bugbear_name(rng=None):
+    return _generate("bugbear", rng=rng)
+
+def generate_harengon_name(rng=None):
+    return _generate("harengon", rng=rng)
+
+def generate_leonin_name(gender="Any", rng=None):
+    return _generate("leonin", gender, rng)
+
+def generate_loxodon_name(gender="Any", rng=None):
+    return _generate("loxodon", gender, rng)
+
+def generate_aasimar_name(rng=None):
+    return _generate("aasimar", rng=rng)
+
+def generate_shifter_name(rng=None):
+    return _generate("shifter", rng=rng)
+
+def generate_githyanki_name(gender="Any", rng=None):
+    return _generate("githyanki", gender, rng)
+
+def generate_common_name(gender="Any", rng=None):
+    """Generates a Common name with meanings for the Name Generator tab."""
+    return _generate("common", gender, rng)
+
+
+def unique_names(race_key, gender="Any", seed=None, position=0):
+    """
+    Yields NameResults for race_key without repeats until its combination space
+    runs out. Use GRAMMARS[race_key].unique(...) directly to see `remaining`.
+    """
+    for data in GRAMMARS[race_key].unique(gender, seed, position):
+        yield NameResult.from_sample(race_key, data)
+
+
+# Per-generator call counts and latencies (see instrumentation.py); free while instrumentation is off
+for _function_name in [n for n in globals() if n.startswith("generate_") and n.endswith("_name")]:
+    globals()[_function_name] = instrumentation.timed(f"name.{_function_name}")(globals()[_function_name])
+del _function_name
+
+# === Name Generator Map ===
+# Maps Race Name -> { func: generator_function, needs_gender: bool, grammar: GRAMMARS key, needs_clan: bool, needs_element: bool }
+# Use generate_common_name for Human
+# Use None for func if special handling is needed (like Genasi composite)
+NAME_GENERATOR_MAP = {
+    "Elf": {"func": generate_elven_name, "needs_gender": False, "grammar": "elf"},
+    "Eladrin": {"func": generate_eladrin_name, "needs_gender": False, "grammar": "sylvan"},
+    "Tabaxi": {"func": generate_tabaxi_name, "needs_gender": False, "grammar": "tabaxi", "needs_clan": True},
+    "Human": {"func": generate_common_name, "needs_gender": True, "grammar": "common"},
+    "Halfling": {"func": generate_halfling_name, "needs_gender": True, "grammar": "halfling"},
+    "Orc": {"func": generate_orc_name, "needs_gender": True, "grammar": "orc"},
+    "Tiefling": {"func": generate_infernal_name, "needs_gender": True, "grammar": "infernal"},
+    "Drow": {"func": generate_drow_name, "needs_gender": True, "grammar": "drow"},
+    "Dragonborn": {"func": generate_dragonborn_name, "needs_gender": False, "grammar": "draconic"},
+    "Aarakocra": {"func": generate_aarakocra_name, "needs_gender": True, "grammar": "aarakocra"},
+    "Owlin": {"func": generate_owlin_name, "needs_gender": False, "grammar": "owlin"},
+    "Tortle": {"func": generate_tortle_name, "needs_gender": True, "grammar": "tortle"},
+    "Triton": {"func": generate_triton_name, "needs_gender": False, "grammar": "triton"},
+    "Genasi": {"func": None, "needs_gender": False, "needs_element": True}, # Special case
+    "Kenku": {"func": generate_kenku_name, "needs_gender": False, "grammar": "kenku"},
+    "Lizardfolk": {"func": generate_lizardfolk_name, "needs_gender": False, "grammar": "lizardfolk"},
+    "Yuan-Ti": {"func": generate_yuan_ti_name, "needs_gender": False, "grammar": "yuan_ti"},
+    "Goblin": {"func": generate_goblin_name, "needs_gender": False, "grammar": "goblin"},
+    "Bugbear": {"func": generate_bugbear_name, "needs_gender": False, "grammar": "bugbear"},
+    "Gnome": {"func": generate_gnome_name, "needs_gender": True, "grammar": "gnomish"},
+    "Goliath": {"func": generate_goliath_name, "needs_gender": False, "grammar": "goliath"},
+    "Minotaur": {"func": generate_minotaur_name, "needs_gender": True, "grammar": "minotaur"},
+    "Harengon": {"func": generate_harengon_name, "needs_gender": False, "grammar": "harengon"},
+    "Leonin": {"func": generate_leonin_name, "needs_gender": True, "grammar": "leonin"},
+    "Loxodon": {"func": generate_loxodon_name, "needs_gender": True, "grammar": "loxodon"},
+    "Aasimar": {"func": generate_aasimar_name, "needs_gender": False, "grammar": "aasimar"},
+    "Shifter": {"func": generate_shifter_name, "needs_gender": False, "grammar": "shifter"},
+    "Githyanki": {"func": generate_githyanki_name, "needs_gender": True, "grammar": "githyanki"},
+}
+
+# Element -> generator for the composite "Genasi" entry
+GENASI_GENERATORS = {
+    "Air": generate_air_genasi_name,
+    "Water": generate_water_genasi_name,
+    "Fire": generate_fire_genasi_name,
+    "Earth": generate_earth_genasi_name,
+}
+GENASI_GRAMMARS = {"Air": "air_genasi", "Water": "water_genasi", "Fire": "ignan", "Earth": "terran"}
+
+
+def direct_grammar(race, element=None):
+    """
+    The GRAMMARS key that generate_name(race, element=element) only samples from,
+    or None when it does more (a Tabaxi clan, or a Genasi element left to chance).
+    """
+    race_config = NAME_GENERATOR_MAP[race]
+    if race_config.get("needs_element"):
+        return GENASI_GRAMMARS.get(element)
+    if race_config.get("needs_clan"):
+        return None
+    return race_config["grammar"]
+
+
+def generate_name(race, gender="Any", rng=None, clan=None, element=None):
+    """
+    Generates a name for a NAME_GENERATOR_MAP race. Options a race doesn't take
+    are ignored; a missing Tabaxi clan or Genasi element is drawn from rng.
+    """
+    race_config = NAME_GENERATOR_MAP[race]
+    rng = make_rng(rng)
+    if race_config.get("needs_element"):
+        return GENASI_GENERATORS[element or rng.choice(list(GENASI_GENERATORS))](rng=rng)
+    if race_config.get("needs_clan"):
+        if clan is None:
+            valid_clans, clan_alias = tabaxi_clan_choices(name_data["tabaxi"]["clans"])
+            if not valid_clans: return NameResult("tabaxi", error="No valid Tabaxi clans found.")
+            clan = weighted_choice(valid_clans, clan_alias, rng)["name"]
+        return race_config["func"](clan, rng=rng)
+    if race_config.get("needs_gender"):
+        return race_config["func"](gender=gender, rng=rng)
+    return race_config["func"](rng=rng)
@@ -0,0 +1,504 @@
+import re
+import threading
+from collections.abc import Mapping
+from . import diagnostics
+from .name_helpers import _build_name_part_table, _generate_poetic_meaning, alias_table, distinct_texts, gloss_index, match_text, text_matcher, weighted_choice
+from .seeding import KeyedPermutation, make_rng
+
+# === Race Name Grammars ===
+# Each race's naming scheme is described by a short spec string, compiled once
+# at load time into a flat CompiledGrammar. Spec syntax:
+#   'text'          literal text copied into the name
+#   P[M]S           prefix + optional middle (30%) + suffix, with vowel smoothing
+#   key             one entry drawn from race_data[key]
+#   key(flags)      flags: gendered (male_key/female_key pair, or filter by the
+#                   entry's "gender" field) and nogloss (excluded from poetic meaning)
+#   key?            optional list: the enclosing group is dropped if it is missing
+#   ( ... )@0.5     group included with the given probability
+#   +               optional separator between terms, purely cosmetic
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<literal>'[^']*')
+      | (?P<core>P\[M\]S)
+      | (?P<slot>[a-z_]+)(?:\((?P<flags>[a-z_,\s]*)\))?(?P<optional>\?)?
+      | (?P<open>\()
+      | (?P<close>\))(?:@(?P<prob>[0-9.]+))?
+      | (?P<plus>\+)
+    )""", re.VERBOSE)
+
+# Step opcodes used by the compiled sampler
+_LITERAL, _PICK, _CORE, _GROUP = range(4)
+GENDERS = ("Any", "Male", "Female")
+
+
+class GrammarError(ValueError):
+    """Raised when a grammar spec string cannot be parsed."""
+
+
+def _tokenize(spec):
+    pos = 0
+    tokens = []
+    spec = spec.rstrip()
+    while pos < len(spec):
+        match = _TOKEN_RE.match(spec, pos)
+        if not match or match.end() == pos:
+            raise GrammarError(f"Unexpected text in grammar spec at {pos}: {spec[pos:]!r}")
+        pos = match.end()
+        if match.group("plus") is None:
+            tokens.append(match)
+    return tokens
+
+
+def _parse(tokens, index=0, depth=0):
+    """Parses tokens into a nested list of ('literal'|'core'|'slot'|'group', ...) nodes."""
+    nodes = []
+    while index < len(tokens):
+        token = tokens[index]
+        if token.group("literal") is not None:
+            nodes.append(("literal", token.group("literal")[1:-1]))
+        elif token.group("core") is not None:
+            nodes.append(("core",))
+        elif token.group("slot") is not None:
+            flags = {f.strip() for f in (token.group("flags") or "").split(",") if f.strip()}
+            if token.group("optional") and depth == 0:
+                raise GrammarError(f"Optional slot '{token.group('slot')}?' must sit inside a group.")
+            nodes.append(("slot", token.group("slot"), flags, bool(token.group("optional"))))
+        elif token.group("open") is not None:
+            children, index, prob = _parse(tokens, index + 1, depth + 1)
+            nodes.append(("group", children, prob))
+        elif token.group("close") is not None:
+            if depth == 0:
+                raise GrammarError("Unbalanced ')' in grammar spec.")
+            prob = float(token.group("prob")) if token.group("prob") else 1.0
+            return nodes, index, prob
+        index += 1
+    if depth:
+        raise GrammarError("Unbalanced '(' in grammar spec.")
+    return nodes, index, 1.0
+
+
+def _valid_entries(entries):
+    """Keeps only dict entries that carry a 'text' key; returns None for unusable lists."""
+    if not entries or not isinstance(entries, list):
+        return None
+    valid = [e for e in entries if isinstance(e, dict) and "text" in e]
+    return valid or None
+
+
+def _gender_pools(race_data, key, gendered):
+    """
+    Resolves a slot to {gender: tuple_of_lists}. A draw picks one list from the
+    tuple, then one entry from that list, matching the old male/female coin flip.
+    """
+    if gendered and f"male_{key}" in race_data:
+        male = _valid_entries(race_data.get(f"male_{key}"))
+        female = _valid_entries(race_data.get(f"female_{key}"))
+        if not male or not female:
+            return None
+        return {"Any": (male, female), "Male": (male,), "Female": (female,)}
+
+    entries = _valid_entries(race_data.get(key))
+    if not entries:
+        return None
+    pools = {"Any": (entries,)}
+    if gendered:
+        for gender in GENDERS[1:]:
+            filtered = [e for e in entries if e.get("gender") in (gender, "Unisex")]
+            pools[gender] = (filtered or entries,) # Fallback to any if nothing matches
+    return pools
+
+
+def _pick_aliases(pools):
+    """{gender: alias table per list} mirroring pools, or None when no list is weighted."""
+    aliases = {gender: tuple(alias_table(entries) for entries in lists) for gender, lists in pools.items()}
+    return aliases if any(table is not None for tables in aliases.values() for table in tables) else None
+
+
+class CompiledGrammar:
+    """A race grammar compiled into a flat list of steps over pre-validated part lists."""
+    __slots__ = ("race_key", "label", "spec", "gloss", "steps", "error", "_spaces", "_pick_matchers")
+
+    def __init__(self, race_key, label, spec, gloss, steps, error=None):
+        self.race_key = race_key
+        self.label = label
+        self.spec = spec
+        self.gloss = gloss
+        self.steps = steps
+        self.error = error
+        self._spaces = {}
+        self._pick_matchers = {}
+
+    def sample(self, gender="Any", rng=None):
+        """
+        Draws one name. Returns a dict with 'name', 'parts', 'poetic' and 'error'.
+        rng may be None, a seed, random.Random or SeedSequence (see seeding.make_rng).
+        """
+        if self.error:
+            diagnostics.error(self.error)
+            return {"name": None, "parts": [], "poetic": "", "error": self.error}
+
+        rng = make_rng(rng)
+        pieces = []
+        parts = []
+        glossed = []
+        _run_steps(self.steps, gender, rng, pieces, parts, glossed)
+        poetic = _generate_poetic_meaning(glossed, self.gloss, rng) if self.gloss is not None else ""
+        return {"name": "".join(pieces), "parts": parts, "poetic": poetic, "error": None}
+
+    def _space(self, gender):
+        """(count, per-step sizes) of every name sample(gender) can produce."""
+        space = self._spaces.get(gender)
+        if space is None:
+            space = self._spaces[gender] = _steps_space(self.steps, gender) if not self.error else (0, [])
+        return space
+
+    def count(self, gender="Any"):
+        """How many distinct names sample(gender) can produce (0 if the grammar failed to compile)."""
+        return self._space(gender)[0]
+
+    def name_at(self, index, gender="Any"):
+        """The name of combination number index, for 0 <= index < count(gender)."""
+        if not 0 <= index < self.count(gender):
+            raise IndexError(f"{self.label} name index out of range")
+        pieces = []
+        _decode_steps(self.steps, self._space(gender)[1], gender, index, pieces, [], [])
+        return "".join(pieces)
+
+    def index_of(self, name, gender="Any"):
+        """
+        The smallest index k with name_at(k, gender) == name. Raises ValueError if
+        this grammar can't produce name. Matching is exact (case and punctuation).
+        """
+        sizes = self._space(gender)[1]
+        indices = [index for end, index in _match_steps(self, self.steps, sizes, gender, name, 0) if end == len(name)]
+        if not indices:
+            raise ValueError(f"{name!r} is not a {self.label} name")
+        return min(indices)
+
+    def _pick_matcher(self, step, gender):
+        key = (id(step), gender)
+        matcher = self._pick_matchers.get(key)
+        if matcher is None:
+            matcher = self._pick_matchers[key] = text_matcher(_pick_entries(step, gender))
+        return matcher
+
+    def _sample_at(self, index, gender, rng):
+        """The sample() dict for combination number index; rng only picks the poetic template."""
+        pieces = []
+        parts = []
+        glossed = []
+        _decode_steps(self.steps, self._space(gender)[1], gender, index, pieces, parts, glossed)
+        poetic = _generate_poetic_meaning(glossed, self.gloss, rng) if self.gloss is not None else ""
+        return {"name": "".join(pieces), "parts": parts, "poetic": poetic, "error": None}
+
+    def unique(self, gender="Any", seed=None, position=0):
+        """A UniqueNameSampler over this grammar's names; see that class."""
+        return UniqueNameSampler(self, gender, seed, position)
+
+
+def _run_steps(steps, gender, rng, pieces, parts, glossed):
+    """Hot path: index draws and appends only."""
+    for step in steps:
+        op = step[0]
+        if op == _LITERAL:
+            pieces.append(step[1])
+        elif op == _PICK:
+            lists = step[1].get(gender) or step[1]["Any"]
+            if step[3] is None:
+                entry = rng.choice(lists[0] if len(lists) == 1 else rng.choice(lists))
+            else:
+                which = 0 if len(lists) == 1 else rng.randrange(len(lists))
+                tables = step[3].get(gender) or step[3]["Any"]
+                entry = weighted_choice(lists[which], tables[which], rng)
+            pieces.append(entry["text"])
+            parts.append(entry)
+            if step[2]:
+                glossed.append(entry)
+        elif op == _CORE:
+            core = step[1].draw(gender, rng)
+            pieces.extend(p["text"] for p in core)
+            parts.extend(core)
+            glossed.extend(core)
+        elif rng.random() < step[1]: # _GROUP
+            _run_steps(step[2], gender, rng, pieces, parts, glossed)
+
+
+# === Combination Space ===
+# Every name a grammar can produce is one combination of choices: which entry
+# each pick takes, which prefix/middle/suffix sequence each core takes, and
+# whether each optional group is present. Steps are mixed-radix digits (last
+# step least significant), so combinations are numbered 0..count-1 without
+# listing them. Group probabilities and part weights don't affect the numbering.
+# A pick's digit ranges over its entries with distinct texts, as cores' do (see
+# NamePartTable), so different combinations spell different names.
+
+def _pick_entries(step, gender):
+    lists = step[1].get(gender) or step[1]["Any"]
+    return distinct_texts(lists[0] if len(lists) == 1 else [entry for entries in lists for entry in entries])
+
+
+def _steps_space(steps, gender):
+    """
+    (count, sizes): the number of combinations and each step's (digit size, detail),
+    where detail is a group's sub-sizes or a pick's distinct entries.
+    """
+    count = 1
+    sizes = []
+    for step in steps:
+        op = step[0]
+        if op == _LITERAL:
+            size = 1
+        elif op == _PICK:
+            entries = _pick_entries(step, gender)
+            sizes.append((len(entries), entries))
+            count *= len(entries)
+            continue
+        elif op == _CORE:
+            size = step[1].combination_count(gender)
+        else: # _GROUP: absent, or one of the group's own combinations
+            sub_count, sub_sizes = _steps_space(step[2], gender)
+            size = 1 + sub_count
+            sizes.append((size, sub_sizes))
+            count *= size
+            continue
+        sizes.append((size, None))
+        count *= size
+    return count, sizes
+
+
+def _decode_steps(steps, sizes, gender, index, pieces, parts, glossed):
+    """Appends combination number index of steps, like _run_steps does for a random draw."""
+    digits = []
+    for size, _ in reversed(sizes):
+        index, digit = divmod(index, size)
+        digits.append(digit)
+    digits.reverse()
+    for step, (_, detail), digit in zip(steps, sizes, digits):
+        op = step[0]
+        if op == _LITERAL:
+            pieces.append(step[1])
+        elif op == _PICK:
+            entry = detail[digit]
+            pieces.append(entry["text"])
+            parts.append(entry)
+            if step[2]:
+                glossed.append(entry)
+        elif op == _CORE:
+            core = step[1].combination_at(digit, gender)
+            pieces.extend(p["text"] for p in core)
+            parts.extend(core)
+            glossed.extend(core)
+        elif digit: # _GROUP present; digit 0 means absent
+            _decode_steps(step[2], detail, gender, digit - 1, pieces, parts, glossed)
+
+
+def _match_steps(grammar, steps, sizes, gender, name, pos):
+    """Yields (end, index) for every way steps can spell a prefix of name[pos:]; index is in steps' own space."""
+    if not steps:
+        yield pos, 0
+        return
+    step, (size, sub_sizes) = steps[0], sizes[0]
+    rest_count = 1
+    for rest_size, _ in sizes[1:]:
+        rest_count *= rest_size
+    op = step[0]
+    if op == _LITERAL:
+        heads = [(pos + len(step[1]), 0)] if name.startswith(step[1], pos) else []
+    elif op == _PICK:
+        heads = match_text(grammar._pick_matcher(step, gender), name, pos)
+    elif op == _CORE:
+        heads = step[1].match_combinations(name, pos, gender)
+    else: # _GROUP: absent (digit 0) or present (1 + the group's own index)
+        heads = [(pos, 0)] + [(end, 1 + index) for end, index in _match_steps(grammar, step[2], sub_sizes, gender, name, pos)]
+    for head_end, digit in heads:
+        for end, rest_index in _match_steps(grammar, steps[1:], sizes[1:], gender, name, head_end):
+            yield end, digit * rest_count + rest_index
+
+
+class UniqueNameSampler:
+    """
+    Draws a grammar's names without replacement. Draw i is the combination at
+    KeyedPermutation(count, key)(i), so there is no rejection loop and no set of
+    names seen so far: state is the key and a position, and each draw is O(1)
+    until `remaining` reaches 0. Names are uniform over the combination space
+    (group probabilities and the 30% middle don't apply). Parts sharing a text
+    count once in that space, so no name is drawn twice as long as no two part
+    sequences concatenate to the same text (true of every shipped race). With
+    an int seed the names depend only on (seed, position), so a roster can be
+    resumed by passing the saved position back in.
+    """
+    __slots__ = ("grammar", "gender", "count", "position", "_rng", "_permutation")
+
+    def __init__(self, grammar, gender="Any", seed=None, position=0):
+        self.grammar = grammar
+        self.gender = gender
+        self.count = grammar._space(gender)[0]
+        self.position = position
+        self._rng = make_rng(seed)
+        self._permutation = KeyedPermutation(self.count, self._rng.getrandbits(64))
+
+    @property
+    def remaining(self):
+        """Distinct names not drawn yet."""
+        return max(0, self.count - self.position)
+
+    def draw(self):
+        """The next unique name as a sample() dict; an error dict once every name has been drawn."""
+        if self.grammar.error:
+            diagnostics.error(self.grammar.error)
+            return {"name": None, "parts": [], "poetic": "", "error": self.grammar.error}
+        if self.position >= self.count:
+            return {"name": None, "parts": [], "poetic": "", "error": f"All {self.count} {self.grammar.label} names have been drawn."}
+        index = self._permutation(self.position)
+        self.position += 1
+        return self.grammar._sample_at(index, self.gender, self._rng)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.grammar.error or self.position >= self.count:
+            raise StopIteration
+        return self.draw()
+
+
+def _compile_nodes(nodes, race_data):
+    """Compiles parsed nodes to steps. Returns (steps, missing_required, dropped_optional)."""
+    steps = []
+    for node in nodes:
+        kind = node[0]
+        if kind == "literal":
+            steps.append((_LITERAL, node[1]))
+        elif kind == "core":
+            table = _build_name_part_table(
+                race_data.get("prefixes"), race_data.get("middles") or [], race_data.get("suffixes")
+            )
+            if table is None:
+                return None, True, False
+            steps.append((_CORE, table))
+        elif kind == "slot":
+            _, key, flags, optional = node
+            pools = _gender_pools(race_data, key, "gendered" in flags)
+            if pools is None:
+                if optional:
+                    return None, False, True
+                return None, True, False
+            steps.append((_PICK, pools, "nogloss" not in flags, _pick_aliases(pools)))
+        else: # group
+            children, missing, dropped = _compile_nodes(node[1], race_data)
+            if missing:
+                return None, True, False
+            if dropped:
+                continue
+            if node[2] >= 1.0:
+                steps.extend(children)
+            else:
+                steps.append((_GROUP, node[2], children))
+    return steps, False, False
+
+
+def _needs_gloss(nodes):
+    for node in nodes:
+        if node[0] == "core" or (node[0] == "slot" and "nogloss" not in node[2]):
+            return True
+        if node[0] == "group" and _needs_gloss(node[1]):
+            return True
+    return False
+
+
+def compile_grammar(race_key, label, spec, race_data):
+    """Compiles a grammar spec against one race's data. Errors are stored, not raised."""
+    nodes, _, _ = _parse(_tokenize(spec))
+    if race_data is None or not isinstance(race_data, dict):
+        return CompiledGrammar(race_key, label, spec, None, [], f"{label} name data not loaded.")
+
+    gloss = None
+    if _needs_gloss(nodes):
+        gloss = race_data.get("gloss")
+        if not gloss or not isinstance(gloss, dict):
+            return CompiledGrammar(race_key, label, spec, None, [], f"Missing core {label} data.")
+
+    steps, missing, _ = _compile_nodes(nodes, race_data)
+    if missing:
+        return CompiledGrammar(race_key, label, spec, gloss, [], f"Missing core {label} data.")
+    if gloss is not None:
+        gloss_index(gloss).prime(_glossed_entries(steps))
+    return CompiledGrammar(race_key, label, spec, gloss, steps)
+
+
+def _glossed_entries(steps):
+    """Every part entry that can reach the poetic meaning."""
+    for step in steps:
+        op = step[0]
+        if op == _PICK and step[2]:
+            for entries in step[1].values():
+                for entry_list in entries:
+                    yield from entry_list
+        elif op == _CORE:
+            yield from step[1].prefixes
+            yield from step[1].middles
+            yield from step[1].suffixes
+        elif op == _GROUP:
+            yield from _glossed_entries(step[2])
+
+
+class LazyGrammars(Mapping):
+    """
+    Mapping of race_key -> CompiledGrammar that compiles each grammar on first
+    access, so only the races a process actually uses get their data loaded.
+    source_for(race_key) returns that race's data dict (or None if unavailable).
+    """
+
+    def __init__(self, grammar_specs, source_for):
+        self._specs = grammar_specs
+        self._source_for = source_for
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, race_key):
+        grammar = self._compiled.get(race_key)
+        if grammar is None:
+            label, spec = self._specs[race_key] # KeyError for unknown races
+            with self._lock:
+                grammar = self._compiled.get(race_key)
+                if grammar is None:
+                    grammar = self._compiled[race_key] = compile_grammar(race_key, label, spec, self._source_for(race_key))
+        return grammar
+
+    def __contains__(self, race_key):
+        return race_key in self._specs
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def refresh(self, race_keys):
+        """
+        Recompiles the already-compiled grammars among race_keys from their
+        current data and swaps each in with one assignment, so samplers holding
+        the old grammar finish with it. A grammar that stops compiling keeps
+        its old version. Returns [(old, new)] for the grammars replaced.
+        """
+        replaced = []
+        for race_key in race_keys:
+            old = self._compiled.get(race_key)
+            if old is None:
+                continue # Never used yet; compiles from the new data on first access
+            label, spec = self._specs[race_key]
+            new = compile_grammar(race_key, label, spec, self._source_for(race_key))
+            if new.error and not old.error:
+                diagnostics.error(f"Reloaded {label} data no longer compiles ({new.error}); keeping the previous version.")
+                continue
+            replaced.append((old, new))
+        with self._lock:
+            for old, new in replaced:
+                self._compiled[new.race_key] = new
+        return replaced
+
+
+def compile_grammars(grammar_specs, source_for):
+    """Returns a LazyGrammars over grammar_specs; see LazyGrammars for source_for."""
+    return LazyGrammars(grammar_specs, source_for)
@@ -0,0 +1,415 @@
+import random
+import re
+from . import diagnostics
+from . import instrumentation
+
+VOWELS = "aeiouyáéíóúàèìòùâêîôûäëïöü" # Define vowels (adjust if needed)
+
+def _is_vowel(char):
+    """Checks if a single character is a vowel (case-insensitive)."""
+    return char.lower() in VOWELS
+
+def _is_smooth_transition(prev_part_ends_vowel, current_part_starts_vowel):
+    """Checks if joining two parts is phonetically smooth (avoids vowel+vowel)."""
+    # Simple: Avoid vowel + vowel. Could add consonant cluster checks later.
+    return not (prev_part_ends_vowel and current_part_starts_vowel)
+
+def _smooth_bucket(part_list, prev_part_ends_vowel):
+    """Returns the parts that join smoothly after the previous part, or the whole list as a fallback."""
+    # Parts lacking 'starts_vowel' make smoothing meaningless, so fall back to any part
+    if not all("starts_vowel" in part for part in part_list if isinstance(part, dict)):
+        diagnostics.error("Some parts in list lack 'starts_vowel' key.")
+        return part_list
+    smooth_options = [
+        part for part in part_list
+        if isinstance(part, dict) and _is_smooth_transition(prev_part_ends_vowel, part.get("starts_vowel", False))
+    ]
+    return smooth_options or part_list # Fallback: pick any part if no smooth options exist
+
+
+# === Weighted Choice ===
+# Entries may carry an optional "weight" (default 1). A list with any other
+# weight gets an AliasTable (Vose's alias method) when its owner is built, so a
+# weighted draw is one rng.random() and two lookups whatever the list length.
+# Lists where every weight is 1 get no table and keep plain rng.choice, so
+# seeded output from unweighted data doesn't change.
+
+DEFAULT_WEIGHT = 1
+
+class AliasTable:
+    """O(1) sampling of indices 0..size-1 in proportion to their weights."""
+    __slots__ = ("size", "prob", "alias")
+
+    def __init__(self, weights):
+        size = len(weights)
+        total = sum(weights)
+        scaled = [w * size / total for w in weights]
+        prob = [1.0] * size
+        alias = list(range(size))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left over is 1 up to rounding and keeps prob 1.0
+        self.size = size
+        self.prob = prob
+        self.alias = alias
+
+    def draw(self, rng=random):
+        """One index; the integer part of a single uniform picks the column, the fraction the coin."""
+        u = rng.random() * self.size
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+
+def _entry_weight(entry):
+    weight = entry.get("weight", DEFAULT_WEIGHT) if isinstance(entry, dict) else DEFAULT_WEIGHT
+    if weight.__class__ not in (int, float) or not 0 <= weight < float("inf"):
+        diagnostics.warning(f"Ignoring invalid weight {weight!r} on {entry.get('text', entry.get('name'))!r}; using {DEFAULT_WEIGHT}.")
+        return DEFAULT_WEIGHT
+    return weight
+
+
+def alias_table(entries):
+    """AliasTable over entries' "weight" fields, or None if every entry has the default weight."""
+    weights = [_entry_weight(entry) for entry in entries]
+    if all(w == DEFAULT_WEIGHT for w in weights):
+        return None
+    if not any(weights):
+        diagnostics.warning("Every entry in a weighted list has weight 0; drawing uniformly.")
+        return None
+    return AliasTable(weights)
+
+
+def weighted_choice(entries, table, rng=random):
+    """rng.choice(entries), or a weighted draw when the list has an alias table."""
+    return rng.choice(entries) if table is None else entries[table.draw(rng)]
+
+
+class NamePartTable:
+    """
+    Prefix/middle/suffix lists validated and pre-partitioned once per race.
+    Middles are bucketed by whether the previous part ends in a vowel; suffixes
+    by (gender, previous ends in vowel). Drawing a part is then a single choice,
+    weighted through each list's alias table (None for unweighted lists).
+    """
+    __slots__ = ("prefixes", "prefix_alias", "middles", "middle_buckets", "middle_aliases",
+                 "suffixes", "suffix_buckets", "suffix_aliases", "_spaces", "_matchers")
+
+    def __init__(self, prefixes, middles, suffixes):
+        self.prefixes = prefixes
+        self.prefix_alias = alias_table(prefixes)
+        self.middles = middles
+        self.middle_buckets = {ends_vowel: _smooth_bucket(middles, ends_vowel) for ends_vowel in (False, True)} if middles else {}
+        self.middle_aliases = {ends_vowel: alias_table(bucket) for ends_vowel, bucket in self.middle_buckets.items()}
+        self.suffixes = suffixes
+        self.suffix_buckets = {}
+        self.suffix_aliases = {}
+        self._spaces = {}
+        self._matchers = {}
+
+    def suffix_bucket(self, gender_filter, prev_part_ends_vowel):
+        key = (gender_filter, prev_part_ends_vowel)
+        bucket = self.suffix_buckets.get(key)
+        if bucket is None:
+            # Built on first use per gender, so unusual gender values keep the old filter semantics
+            suffix_options = self.suffixes
+            if gender_filter != "Any":
+                # Filter based on gender, always including Unisex
+                filtered_options = [
+                    s for s in suffix_options
+                    if s.get("gender") == gender_filter or s.get("gender") == "Unisex"
+                ]
+                if filtered_options:
+                    suffix_options = filtered_options
+                else:
+                    diagnostics.warning(f"No specific {gender_filter} or Unisex suffixes found, using any.")
+            bucket = _smooth_bucket(suffix_options, prev_part_ends_vowel)
+            self.suffix_aliases[key] = alias_table(bucket)
+            self.suffix_buckets[key] = bucket
+        return bucket
+
+    def draw(self, gender_filter="Any", rng=random):
+        """Selects prefix, optional middle (30%) and suffix. Returns list of chosen parts."""
+        use_middle = rng.random() < 0.3 and bool(self.middles)
+        # weighted_choice inlined; this runs for every name
+        table = self.prefix_alias
+        prefix = rng.choice(self.prefixes) if table is None else self.prefixes[table.draw(rng)]
+        chosen_parts = [prefix]
+        last_part_ends_vowel = prefix["ends_vowel"]
+        if use_middle:
+            middles = self.middle_buckets[bool(last_part_ends_vowel)]
+            table = self.middle_aliases[bool(last_part_ends_vowel)]
+            middle = rng.choice(middles) if table is None else middles[table.draw(rng)]
+            chosen_parts.append(middle)
+            last_part_ends_vowel = middle["ends_vowel"]
+        key = (gender_filter, bool(last_part_ends_vowel))
+        suffixes = self.suffix_buckets.get(key) or self.suffix_bucket(*key)
+        table = self.suffix_aliases[key]
+        chosen_parts.append(rng.choice(suffixes) if table is None else suffixes[table.draw(rng)])
+        return chosen_parts
+
+    # --- Combination space ---
+    # Every prefix/[middle]/suffix sequence draw() can produce, smoothing included,
+    # numbered 0..count-1. Entries repeating an earlier entry's text (e.g. one
+    # suffix listed as both Male and Female) are left out, so sequences spell
+    # distinct names. Prefixes are grouped by whether they end in a vowel and
+    # middles by (bucket, ends in a vowel), so each group is a plain product of
+    # three lists and an index decodes with a few divmods.
+
+    def _space(self, gender_filter):
+        """(count, blocks) for gender_filter; each block is (size, prefixes, middles or None, suffixes)."""
+        space = self._spaces.get(gender_filter)
+        if space is None:
+            prefixes_by_end = {False: [], True: []}
+            for prefix in distinct_texts(self.prefixes):
+                prefixes_by_end[bool(prefix["ends_vowel"])].append(prefix)
+            blocks = []
+            for ends_vowel, prefixes in prefixes_by_end.items():
+                suffixes = distinct_texts(self.suffix_bucket(gender_filter, ends_vowel))
+                blocks.append((len(prefixes) * len(suffixes), prefixes, None, suffixes))
+            if self.middles:
+                for ends_vowel, prefixes in prefixes_by_end.items():
+                    for middle_ends_vowel in (False, True):
+                        middles = [m for m in distinct_texts(self.middle_buckets[ends_vowel]) if bool(m["ends_vowel"]) == middle_ends_vowel]
+                        suffixes = distinct_texts(self.suffix_bucket(gender_filter, middle_ends_vowel))
+                        blocks.append((len(prefixes) * len(middles) * len(suffixes), prefixes, middles, suffixes))
+            blocks = [block for block in blocks if block[0]]
+            space = self._spaces[gender_filter] = (sum(block[0] for block in blocks), blocks)
+        return space
+
+    def combination_count(self, gender_filter="Any"):
+        """Number of part sequences with distinct texts draw(gender_filter) can return."""
+        return self._space(gender_filter)[0]
+
+    def combination_at(self, index, gender_filter="Any"):
+        """The part sequence numbered index (0 <= index < combination_count)."""
+        for size, prefixes, middles, suffixes in self._space(gender_filter)[1]:
+            if index < size:
+                index, suffix_index = divmod(index, len(suffixes))
+                if middles is None:
+                    return [prefixes[index], suffixes[suffix_index]]
+                prefix_index, middle_index = divmod(index, len(middles))
+                return [prefixes[prefix_index], middles[middle_index], suffixes[suffix_index]]
+            index -= size
+        raise IndexError("combination index out of range")
+
+    def match_combinations(self, name, pos, gender_filter="Any"):
+        """Yields (end, index) for every combination whose text appears in name at pos."""
+        matchers = self._matchers.get(gender_filter)
+        if matchers is None:
+            matchers = self._matchers[gender_filter] = [
+                (size, text_matcher(prefixes), text_matcher(middles) if middles is not None else None, text_matcher(suffixes), len(middles or ()), len(suffixes))
+                for size, prefixes, middles, suffixes in self._space(gender_filter)[1]
+            ]
+        offset = 0
+        for size, prefix_matcher, middle_matcher, suffix_matcher, n_middles, n_suffixes in matchers:
+            for prefix_end, prefix_index in match_text(prefix_matcher, name, pos):
+                if middle_matcher is None:
+                    for end, suffix_index in match_text(suffix_matcher, name, prefix_end):
+                        yield end, offset + prefix_index * n_suffixes + suffix_index
+                    continue
+                for middle_end, middle_index in match_text(middle_matcher, name, prefix_end):
+                    for end, suffix_index in match_text(suffix_matcher, name, middle_end):
+                        yield end, offset + (prefix_index * n_middles + middle_index) * n_suffixes + suffix_index
+            offset += size
+
+
+def distinct_texts(entries):
+    """entries without those repeating an earlier entry's text (first one wins)."""
+    seen = set()
+    return [entry for entry in entries if entry["text"] not in seen and not seen.add(entry["text"])]
+
+
+def text_matcher(entries):
+    """(distinct text lengths, {text: [positions]}) for matching entries' texts inside a string."""
+    by_text = {}
+    for position, entry in enumerate(entries):
+        by_text.setdefault(entry["text"], []).append(position)
+    return sorted({len(text) for text in by_text}), by_text
+
+
+def match_text(matcher, name, pos):
+    """Yields (end, position) for every entry whose text occurs in name at pos."""
+    lengths, by_text = matcher
+    for length in lengths:
+        for position in by_text.get(name[pos:pos + length], ()):
+            yield pos + length, position
+
+
+def _build_name_part_table(prefixes, middles, suffixes, gender_filter="Any"):
+    """Validates raw part lists once and returns a NamePartTable, or None if unusable."""
+    # Ensure input lists contain valid data
+    if not prefixes or not isinstance(prefixes, list) or not all(isinstance(p, dict) for p in prefixes):
+        diagnostics.error("Invalid or empty prefixes list provided to _assemble_name_parts.")
+        return None
+    if not suffixes or not isinstance(suffixes, list) or not all(isinstance(s, dict) for s in suffixes):
+        diagnostics.error("Invalid or empty suffixes list provided to _assemble_name_parts.")
+        return None
+    if middles and (not isinstance(middles, list) or not all(isinstance(m, dict) for m in middles)):
+        diagnostics.warning("Invalid middles list provided to _assemble_name_parts; ignoring middles.")
+        middles = []
+
+    middles_list = middles or [] # Ensure middles_list is always a list
+
+    # Check for required keys early
+    if not all("text" in p and "ends_vowel" in p for p in prefixes):
+        diagnostics.error("Prefix parts are missing required 'text' or 'ends_vowel' keys.")
+        return None
+    if middles_list and not all("text" in m and "ends_vowel" in m and "starts_vowel" in m for m in middles_list):
+        diagnostics.error("Middle parts are missing required keys ('text', 'ends_vowel', 'starts_vowel').")
+        # Proceed without middles
+        middles_list = []
+    if not all("text" in s and "starts_vowel" in s and ("gender" in s or gender_filter == "Any") for s in suffixes):
+         # Allow missing 'gender' if filter is 'Any', otherwise require it
+         requires_gender = gender_filter != "Any"
+         for s in suffixes:
+             if requires_gender and "gender" not in s:
+                 diagnostics.error(f"Suffix '{s.get('text')}' missing required 'gender' key for filtering.")
+             if "text" not in s or "starts_vowel" not in s:
+                  diagnostics.error(f"Suffix '{s.get('text', '[Missing Text]')}' missing required 'text' or 'starts_vowel' key.")
+         diagnostics.warning("Some suffix parts missing required keys, results may be unpredictable.")
+
+    return NamePartTable(list(prefixes), list(middles_list), list(suffixes))
+
+
+@instrumentation.timed("name_helpers._assemble_name_parts")
+def _assemble_name_parts(prefixes, middles, suffixes, gender_filter="Any", rng=random):
+    """
+    Internal logic to select name parts using smoothing. Returns list of chosen parts.
+    Validates and buckets the lists on every call; hot paths should build a
+    NamePartTable once with _build_name_part_table and call its draw() instead.
+    """
+    table = _build_name_part_table(prefixes, middles, suffixes, gender_filter)
+    if table is None:
+        return []
+    return table.draw(gender_filter, rng)
+
+
+# === Poetic Meaning ===
+# Each gloss dict is compiled once into a GlossIndex: keys pre-normalised to
+# lower case, and each meaning string resolved when a grammar is compiled (or
+# on first sight, up to a bounded number of others) to its option list, or to
+# its capitalised keyword when the gloss has no options for it. Templates are
+# str.format methods; only the one chosen gets rendered. {0}, {1}, ... are the
+# glosses and {T0}, {T1}, ... the title-cased forms.
+
+def _compile_templates(*texts):
+    return tuple((text.format, tuple(int(i) for i in re.findall(r"\{T(\d)\}", text))) for text in texts)
+
+
+_TEMPLATES = {
+    1: _compile_templates(
+        "Embodiment of {0}",
+        "Bearer of {0}",
+        "A soul defined by {0}",
+    ),
+    2: _compile_templates(
+        "{T0} of {1}",
+        "Bearer of {1}, born of {0}",
+        "A soul touched by {0} and {1}",
+        "Walker between {0} and {1}",
+        "Voice of the {1}, spirit of {0}",
+    ),
+    3: _compile_templates(
+        "One who walks with {0}, guided by {1}, keeper of {2}",
+        "A spirit shaped by {0}, voice of {1}, hand of {2}",
+        "Child of {0}, gifted by {1}, soul of {2}",
+        "{T2} made flesh, carved from {0} and {1}",
+        "Heart of {0}, mind of {1}, destiny of {2}",
+    ),
+}
+_MANY_TEMPLATES = _compile_templates("One connected to {0}, and {1}") # 4 or more glosses
+_RESOLVED_LIMIT = 4096 # Meanings cached beyond those primed from the data (e.g. from decomposed or posted parts)
+
+
+class GlossIndex:
+    """One poetic gloss dict compiled for lookups; see gloss_index()."""
+    __slots__ = ("gloss", "_options", "_resolved")
+
+    def __init__(self, gloss):
+        self.gloss = gloss
+        self._options = {} # lower-cased keyword -> option list, or None if unusable
+        for key in gloss:
+            keyword = key.lower()
+            if keyword in self._options:
+                continue
+            # An exact lower-case key wins; otherwise the first key matching case-insensitively
+            options = gloss.get(keyword) or gloss[key]
+            self._options[keyword] = options if isinstance(options, list) and options else None
+        self._resolved = {} # meaning string -> option list or fallback text
+
+    def _resolve(self, meaning):
+        keyword = meaning.split("/")[0].strip().lower()
+        return self._options.get(keyword) or keyword.capitalize()
+
+    def resolve(self, part):
+        """The option list for part's primary meaning keyword, or the keyword capitalised."""
+        meaning = part["meaning"]
+        resolved = self._resolved.get(meaning)
+        if resolved is None:
+            resolved = self._resolve(meaning)
+            if len(self._resolved) < _RESOLVED_LIMIT:
+                self._resolved[meaning] = resolved
+        return resolved
+
+    def prime(self, parts):
+        """Resolves parts ahead of time, e.g. every glossed entry of a grammar at compile time."""
+        for part in parts:
+            if isinstance(part, dict) and "meaning" in part and part["meaning"] not in self._resolved:
+                self._resolved[part["meaning"]] = self._resolve(part["meaning"])
+
+    def poetic(self, parts, rng=random):
+        """Poetic meaning for parts that all carry a 'meaning'."""
+        glosses = []
+        resolved_parts = self._resolved
+        for part in parts:
+            resolved = resolved_parts.get(part["meaning"]) or self.resolve(part)
+            glosses.append(resolved if resolved.__class__ is str else rng.choice(resolved))
+        templates = _TEMPLATES.get(len(glosses))
+        if templates is None:
+            if not glosses:
+                return "Meaning generation failed (no glosses)."
+            render = rng.choice(_MANY_TEMPLATES)[0]
+            return render(", ".join(glosses[:-1]), glosses[-1])
+        render, titled = rng.choice(templates)
+        if titled:
+            return render(*glosses, **{f"T{i}": glosses[i].title() for i in titled})
+        return render(*glosses)
+
+
+_gloss_indexes = {} # id(gloss dict) -> GlossIndex
+
+
+def gloss_index(gloss):
+    """The shared GlossIndex for a gloss dict, compiled on first use."""
+    index = _gloss_indexes.get(id(gloss))
+    if index is None or index.gloss is not gloss:
+        index = _gloss_indexes[id(gloss)] = GlossIndex(gloss)
+    return index
+
+
+def forget_gloss_index(gloss):
+    """Drops gloss's GlossIndex, e.g. once a reload has replaced the gloss dict."""
+    index = _gloss_indexes.get(id(gloss))
+    if index is not None and index.gloss is gloss:
+        del _gloss_indexes[id(gloss)]
+
+
+def _generate_poetic_meaning(parts, poetic_gloss_dict, rng=random):
+    """Generates a poetic meaning string from chosen name parts and a gloss dictionary."""
+    if not parts or not isinstance(parts, list):
+        return "Invalid parts list for poetic meaning."
+    if not poetic_gloss_dict or not isinstance(poetic_gloss_dict, dict):
+        return "Poetic gloss data missing or invalid."
+
+    # Ensure parts are dictionaries with 'meaning' key
+    valid_parts = [p for p in parts if isinstance(p, dict) and "meaning" in p]
+    if not valid_parts:
+         return "No parts with meanings found."
+
+    return gloss_index(poetic_gloss_dict).poetic(valid_parts, rng)
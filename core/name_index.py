@@ -0,0 +1,226 @@
+import threading
+from . import data_loader
+from . import diagnostics
+from .name_generators import GRAMMARS, NameResult, reloaded_race_keys
+from .name_grammar import _CORE, _LITERAL, _PICK, _pick_entries
+from .name_helpers import _generate_poetic_meaning, distinct_texts
+from .seeding import make_rng
+
+# === Name Decomposition ===
+# Splits any name, generated or not, back into a race's name parts, following
+# the race's compiled grammar: each pick, core prefix/middle/suffix and literal
+# in order, optional groups and middles skippable. The grammar becomes a small
+# automaton whose part edges are character tries over that slot's entries, so
+# results have the same shape (and the same entries) as sampled names.
+# Matching is case-insensitive and the separators below may follow any part.
+# One pass over (state, position) records the fewest parts needed to finish
+# the name, so segmentations are enumerated without ever following a dead end.
+
+_SEPARATORS = (" ", "-", "'", "’")
+_END = None # Trie key holding the entries that end at a node
+
+
+def _part_trie(entries):
+    """Character trie over the casefolded texts of entries (distinct texts only)."""
+    root = {}
+    for entry in distinct_texts(entries):
+        node = root
+        for char in entry["text"].casefold():
+            node = node.setdefault(char, {})
+        node.setdefault(_END, []).append(entry)
+    return root
+
+
+def _trie_matches(trie, key, pos):
+    """(end, entries) for each trie entry spelled by key at pos."""
+    node = trie
+    for end in range(pos, len(key)):
+        node = node.get(key[end])
+        if node is None:
+            return
+        if _END in node:
+            yield end + 1, node[_END]
+
+
+class NameIndex:
+    """Grammar automaton for one race; see decompose() and annotate()."""
+    __slots__ = ("race_key", "label", "gloss", "error", "_edges", "_final")
+
+    def __init__(self, grammar):
+        self.race_key = grammar.race_key
+        self.label = grammar.label
+        self.gloss = grammar.gloss
+        self.error = grammar.error
+        # state -> [(text, None, next)] for literals (text "" skips) or [(trie, glossed, next)] for parts
+        self._edges = [[]]
+        self._final = self._add_steps(grammar.steps, 0) if not grammar.error else None
+
+    def _state(self):
+        self._edges.append([])
+        return len(self._edges) - 1
+
+    def _add_part(self, state, entries, glossed):
+        after = self._state()
+        self._edges[state].append((_part_trie(entries), glossed, after))
+        self._edges[after].extend((sep, None, after) for sep in _SEPARATORS)
+        return after
+
+    def _add_steps(self, steps, state):
+        for step in steps:
+            op = step[0]
+            if op == _LITERAL:
+                after = self._state()
+                self._edges[state].append((step[1].casefold(), None, after))
+                state = after
+            elif op == _PICK:
+                state = self._add_part(state, _pick_entries(step, "Any"), step[2])
+            elif op == _CORE:
+                table = step[1]
+                state = self._add_part(state, table.prefixes, True)
+                if table.middles:
+                    after = self._add_part(state, table.middles, True)
+                    self._edges[state].append(("", None, after)) # No middle
+                    state = after
+                state = self._add_part(state, table.suffixes, True)
+            else: # _GROUP: its steps, or nothing
+                after = self._add_steps(step[2], state)
+                self._edges[state].append(("", None, after))
+                state = after
+        return state
+
+    def _moves(self, key, state, pos):
+        """(end, next state, entries or None) for every edge leaving state at pos."""
+        for target, glossed, after in self._edges[state]:
+            if glossed is None:
+                if key.startswith(target, pos):
+                    yield pos + len(target), after, None
+            else:
+                for end, entries in _trie_matches(target, key, pos):
+                    yield end, after, [(entry, glossed) for entry in entries]
+
+    def segmentations(self, name, limit=50):
+        """
+        Up to limit segmentations of name, fewest parts first. Each is a list of
+        (entry, glossed) pairs in grammar order; literals and separators are left out.
+        """
+        key = name.casefold()
+        if not key or self._final is None:
+            return []
+        best = {} # (state, pos) -> fewest parts to finish, or None if the end is unreachable
+
+        def cost(state, pos):
+            if (state, pos) not in best:
+                best[state, pos] = None # Zero-length moves only go forward, so this is never read mid-computation
+                costs = [0] if state == self._final and pos == len(key) else []
+                for end, after, entries in self._moves(key, state, pos):
+                    rest = cost(after, end)
+                    if rest is not None:
+                        costs.append(rest + (1 if entries else 0))
+                best[state, pos] = min(costs) if costs else None
+            return best[state, pos]
+
+        if cost(0, 0) is None:
+            return []
+        found = []
+
+        def walk(state, pos, chosen):
+            if state == self._final and pos == len(key):
+                found.append(list(chosen))
+                return
+            ranked = []
+            for end, after, entries in self._moves(key, state, pos):
+                rest = cost(after, end)
+                if rest is not None:
+                    ranked.append((rest + (1 if entries else 0), end, after, entries))
+            ranked.sort(key=lambda move: move[:3])
+            for _, end, after, entries in ranked:
+                if len(found) >= limit:
+                    return
+                if entries is None:
+                    walk(after, end, chosen)
+                    continue
+                for part in entries:
+                    chosen.append(part)
+                    walk(after, end, chosen)
+                    chosen.pop()
+                    if len(found) >= limit:
+                        return
+
+        walk(0, 0, [])
+        found.sort(key=len)
+        return found
+
+    def _result(self, name, parts, rng):
+        if not parts:
+            return {"name": name, "parts": [], "poetic": "", "error": self.error or f"Could not split {name!r} into {self.label} name parts."}
+        glossed = [entry for entry, is_glossed in parts if is_glossed and "meaning" in entry]
+        poetic = _generate_poetic_meaning(glossed, self.gloss, rng) if self.gloss is not None and glossed else ""
+        return {"name": name, "parts": [entry for entry, _ in parts], "poetic": poetic, "error": None}
+
+    def decompose(self, name, limit=50, rng=None):
+        """
+        Every way (up to limit) name splits into this race's parts, fewest parts
+        first, as sample()-style dicts with 'name', 'parts', 'poetic' and 'error'.
+        Returns [] if the name can't be split.
+        """
+        rng = make_rng(rng)
+        return [self._result(name, parts, rng) for parts in self.segmentations(name, limit)]
+
+    def annotate(self, names, rng=None):
+        """
+        Yields a NameResult for each name in a roster, using its best (fewest
+        parts) segmentation. Names that don't split get a NameResult with an
+        error. Repeated names are split once.
+        """
+        rng = make_rng(rng)
+        best_parts = {}
+        for name in names:
+            name = name.strip()
+            key = name.casefold()
+            parts = best_parts.get(key)
+            if parts is None:
+                found = self.segmentations(name, limit=1)
+                parts = best_parts[key] = found[0] if found else []
+            yield NameResult.from_sample(self.race_key, self._result(name, parts, rng))
+
+
+def build_name_index(race_key):
+    """Builds the NameIndex for one RACE_GRAMMARS race from its compiled grammar."""
+    grammar = GRAMMARS[race_key] # KeyError for unknown races
+    if grammar.error:
+        diagnostics.error(grammar.error)
+    return NameIndex(grammar)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def name_index(race_key):
+    """The shared NameIndex for race_key, built on first use."""
+    index = _indexes.get(race_key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(race_key)
+            if index is None:
+                index = _indexes[race_key] = build_name_index(race_key)
+    return index
+
+
+def _on_data_reload(event):
+    with _indexes_lock:
+        for race_key in reloaded_race_keys(event):
+            _indexes.pop(race_key, None) # Rebuilt from the new data on next use
+
+
+data_loader.add_reload_listener(_on_data_reload)
+
+
+def decompose_name(race_key, name, limit=50, rng=None):
+    """Every segmentation of name into race_key's parts; see NameIndex.decompose."""
+    return name_index(race_key).decompose(name, limit, rng)
+
+
+def annotate_roster(race_key, names, rng=None):
+    """Yields a NameResult per name (best segmentation, or an error); see NameIndex.annotate."""
+    return name_index(race_key).annotate(names, rng)
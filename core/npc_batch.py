@@ -0,0 +1,76 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import data_loader
+from .npc_generator import generate_npc_range
+
+# === Parallel NPC Generation ===
+# Jobs are cut into chunks of consecutive NPC indices. NPC i always draws from
+# stream_rng(seed, i) (see seeding.py), so the output only depends on (n, seed):
+# any worker count or chunk size gives the same NPCs as generate_npc_range(0, n, seed).
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _init_worker():
+    # Forked workers inherit whatever the parent already loaded; spawned ones read the corpus here, once
+    data_loader.preload()
+
+
+def job_seed(seed):
+    """seed itself, or fresh entropy shared by every shard of the job when seed is None."""
+    if seed is not None:
+        return seed
+    from numpy.random import SeedSequence
+    return SeedSequence().entropy
+
+
+def map_chunks(chunk_func, n, *args, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields chunk_func(start, stop, *args) for consecutive index ranges covering
+    0..n-1, in order. chunk_func must be a module-level (picklable) function.
+    workers=None uses every core; workers=1 runs in this process without a pool.
+    At most two chunks per worker are in flight, so memory stays bounded however
+    slowly the caller consumes the results.
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    bounds = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+    if workers <= 1 or len(bounds) <= 1:
+        for start, stop in bounds:
+            yield chunk_func(start, stop, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds)), initializer=_init_worker) as executor:
+        pending = deque()
+        next_chunk = 0
+        try:
+            while pending or next_chunk < len(bounds):
+                while next_chunk < len(bounds) and len(pending) < 2 * workers:
+                    start, stop = bounds[next_chunk]
+                    pending.append(executor.submit(chunk_func, start, stop, *args))
+                    next_chunk += 1
+                yield pending.popleft().result()
+        finally:
+            for future in pending: # Caller stopped early: drop work that hasn't started
+                future.cancel()
+
+
+def generate_npc_chunks(n, workers=None, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, gender="Any", race_names=None):
+    """Yields lists of NPCs for indices 0..n-1, in order, chunk_size at a time."""
+    race_names = tuple(race_names) if race_names is not None else None
+    yield from map_chunks(generate_npc_range, n, job_seed(seed), gender, race_names, workers=workers, chunk_size=chunk_size)
+
+
+def generate_npcs(n, workers=None, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, gender="Any", race_names=None):
+    """
+    Yields n NPCs in order, generated across `workers` processes.
+    Same NPCs as generate_npc_range(0, n, seed) for the same seed.
+    """
+    for chunk in generate_npc_chunks(n, workers, seed, chunk_size, gender, race_names):
+        yield from chunk
@@ -0,0 +1,262 @@
+# Import necessary data
+# Import TOP-LEVEL generator functions ONLY
+from . import diagnostics
+from . import data_loader
+from . import instrumentation
+from .data_loader import icons, name_data # name_data needed for Tabaxi clan lookup
+from .seeding import make_rng, stream_rngs
+from .name_generators import (
+    NameResult,
+    generate_elven_name, generate_orc_name, generate_infernal_name,
+    generate_tabaxi_name, generate_drow_name, generate_dragonborn_name,
+    generate_aarakocra_name, generate_owlin_name, generate_tortle_name,
+    generate_triton_name, generate_fire_genasi_name, generate_earth_genasi_name,
+    generate_air_genasi_name, generate_water_genasi_name, generate_eladrin_name,
+    generate_kenku_name, generate_lizardfolk_name, generate_yuan_ti_name,
+    generate_goblin_name, generate_gnome_name, generate_halfling_name,
+    generate_goliath_name, generate_minotaur_name, generate_bugbear_name,
+    generate_harengon_name, generate_leonin_name, generate_loxodon_name,
+    generate_aasimar_name, generate_shifter_name, generate_githyanki_name,
+    generate_common_name, # Keep this for Human, Half-Elf, Half-Orc common style
+    tabaxi_clan_choices
+)
+from .name_helpers import alias_table, weighted_choice
+
+
+class NPC:
+    """
+    One generated NPC: race entry, name, clan (Tabaxi only) and (category, choice)
+    attribute pairs in display order. The markdown card is only built when
+    markdown() or str() is called.
+    """
+    __slots__ = ("race", "name", "clan", "attributes", "name_result", "error")
+
+    def __init__(self, race=None, name=None, clan=None, attributes=(), name_result=None, error=None):
+        self.race = race
+        self.name = name
+        self.clan = clan
+        self.attributes = attributes
+        self.name_result = name_result
+        self.error = error
+
+    def markdown(self):
+        if self.error: return f"Error: {self.error}"
+        race_data = self.race
+        npc_lines = [f"👤 **Name:** {self.name}"]
+        if self.clan:
+            npc_lines.append(f"🏡 **Clan:** {self.clan}")
+        npc_lines.extend([
+            "---", "💼 **Basic Info**",
+            f"🧬 **Race:** {race_data['name']} ({race_data.get('rarity', 'N/A')})",
+            f"🌍 **Region:** {race_data.get('region', 'N/A')}",
+            f"📖 **Lore:** {race_data.get('description', 'N/A')}",
+            "✶" * 25, "🎭 **Personality & Story**"
+        ])
+        npc_lines.extend(f"{icons.get(category, '•')} **{category}:** {choice}" for category, choice in self.attributes)
+        return "\n\n".join(npc_lines)
+
+    __str__ = markdown
+
+    def __repr__(self):
+        return f"NPC({self.name!r}, {self.race['name']!r})" if not self.error else f"NPC(error={self.error!r})"
+
+    def to_dict(self):
+        """Plain, JSON-serialisable form."""
+        if self.error: return {"error": self.error}
+        return {
+            "name": self.name,
+            "race": self.race["name"],
+            "rarity": self.race.get("rarity"),
+            "region": self.race.get("region"),
+            "clan": self.clan,
+            "attributes": dict(self.attributes),
+            "name_parts": self.name_result.to_dict()["parts"] if self.name_result else [],
+            "poetic": self.name_result.poetic if self.name_result else "",
+        }
+
+
+_attribute_choices = (None, {}) # (the npc_attributes dict it was built from, category -> (options, alias table))
+
+
+def _attribute_options(npc_attributes):
+    """
+    category -> (option strings, alias table or None). An option is a string or a
+    {"text": ..., "weight": ...} dict. Rebuilt only when npc_attributes is replaced.
+    """
+    global _attribute_choices
+    if _attribute_choices[0] is not npc_attributes:
+        options = {}
+        for category, entries in npc_attributes.items():
+            if entries and isinstance(entries, list):
+                texts = [e.get("text", "") if isinstance(e, dict) else e for e in entries]
+                options[category] = (texts, alias_table(entries))
+        _attribute_choices = (npc_attributes, options)
+    return _attribute_choices[1]
+
+
+@instrumentation.timed("npc.generate_npc")
+def generate_npc(rng=None, gender="Any", race_names=None):
+    """
+    Generates one NPC. str() of the result gives the markdown card shown in the UI.
+    rng may be None (global random), an int seed, random.Random or SeedSequence.
+    race_names optionally limits the races drawn from (names as in races.json).
+    """
+    rng = make_rng(rng)
+    races = data_loader.races
+    npc_attributes = data_loader.npc_attributes
+    if not races or not isinstance(races, list):
+        diagnostics.error("Race data is missing or invalid.")
+        return NPC(error="Missing race data.")
+    if not npc_attributes or not isinstance(npc_attributes, dict):
+        diagnostics.error("NPC attributes data is missing or invalid.")
+        return NPC(error="Missing attribute data.")
+    if race_names is not None:
+        races = [r for r in races if isinstance(r, dict) and r.get("name") in race_names]
+        if not races:
+            return NPC(error="No races match the requested filter.")
+
+    # --- Select Race ---
+    try:
+        race_data = rng.choice(races)
+        if not isinstance(race_data, dict) or 'name' not in race_data:
+             diagnostics.error("Invalid race entry selected."); return NPC(error="Invalid race data format.")
+        race_name = race_data['name']
+    except IndexError:
+         diagnostics.error("Races list is empty."); return NPC(error="No races available.")
+    except Exception as e:
+         diagnostics.error(f"Error selecting race: {e}"); return NPC(error="Race selection failed.")
+
+    npc_name = f"Unnamed {race_name}" # Default placeholder
+    clan_name = None # Initialize clan_name
+    npc_gender = gender # "Any" unless the caller asked for one
+
+    # --- Generate Name based on Race using Top-Level Functions ---
+    try:
+        name_result = None # Structured NameResult from the generator functions
+
+        # Create a mapping similar to the UI, but simpler for NPC gen
+        # We only need the function, and maybe gender arg if applicable
+        # Note: 'Any' gender is often the default in the functions themselves now
+        NPC_NAME_FUNC_MAP = {
+            "Elf": generate_elven_name,
+            "Eladrin": generate_eladrin_name,
+            "Tabaxi": generate_tabaxi_name, # Requires special handling for clan
+            "Human": generate_common_name,
+            "Halfling": generate_halfling_name,
+            "Orc": generate_orc_name,
+            "Tiefling": generate_infernal_name,
+            "Drow": generate_drow_name,
+            "Dragonborn": generate_dragonborn_name,
+            "Aarakocra": generate_aarakocra_name,
+            "Owlin": generate_owlin_name,
+            "Tortle": generate_tortle_name,
+            "Triton": generate_triton_name,
+            # Genasi needs special handling
+            "Kenku": generate_kenku_name,
+            "Lizardfolk": generate_lizardfolk_name,
+            "Yuan-ti": generate_yuan_ti_name,
+            "Goblin": generate_goblin_name,
+            "Bugbear": generate_bugbear_name,
+            "Gnome": generate_gnome_name,
+            "Goliath": generate_goliath_name,
+            "Minotaur": generate_minotaur_name,
+            "Harengon": generate_harengon_name,
+            "Leonin": generate_leonin_name,
+            "Loxodon": generate_loxodon_name,
+            "Aasimar": generate_aasimar_name,
+            "Shifter": generate_shifter_name,
+            "Githyanki": generate_githyanki_name,
+        }
+
+        # Handle races requiring gender choice (can set npc_gender if needed later)
+        races_needing_gender = ["Human", "Halfling", "Orc", "Tiefling", "Drow",
+                                "Aarakocra", "Tortle", "Gnome", "Minotaur",
+                                "Leonin", "Loxodon", "Githyanki"]
+
+        if race_name == "Half-Elf":
+            chosen_style = rng.choice(["Elven", "Common"])
+            if chosen_style == "Elven":
+                name_result = generate_elven_name(rng=rng) # gender="Any" is default
+            else:
+                name_result = generate_common_name(gender=npc_gender, rng=rng)
+        elif race_name == "Half-Orc":
+            chosen_style = rng.choice(["Orc", "Common"])
+            if chosen_style == "Orc":
+                name_result = generate_orc_name(gender=npc_gender, rng=rng)
+            else:
+                name_result = generate_common_name(gender=npc_gender, rng=rng)
+        elif race_name == "Fire Genasi": name_result = generate_fire_genasi_name(rng=rng)
+        elif race_name == "Earth Genasi": name_result = generate_earth_genasi_name(rng=rng)
+        elif race_name == "Air Genasi": name_result = generate_air_genasi_name(rng=rng)
+        elif race_name == "Water Genasi": name_result = generate_water_genasi_name(rng=rng)
+        elif race_name == "Tabaxi":
+             # Need to pick a random clan for NPC gen
+             tabaxi_data = name_data.get("tabaxi", {})
+             clan_list = tabaxi_data.get("clans", [])
+             if clan_list and isinstance(clan_list, list):
+                  valid_clans, clan_alias = tabaxi_clan_choices(clan_list)
+                  if valid_clans:
+                      selected_clan_info = weighted_choice(valid_clans, clan_alias, rng)
+                      selected_clan_name = selected_clan_info['name']
+                      name_result = generate_tabaxi_name(selected_clan_name, rng=rng)
+                      # Store clan name for output section
+                      clan_name = selected_clan_name
+                  else: name_result = NameResult("tabaxi", error="No valid Tabaxi clans found.")
+             else: name_result = NameResult("tabaxi", error="Tabaxi clan data missing/invalid.")
+        elif race_name in NPC_NAME_FUNC_MAP:
+             generator_func = NPC_NAME_FUNC_MAP[race_name]
+             if race_name in races_needing_gender:
+                  name_result = generator_func(gender=npc_gender, rng=rng)
+             else:
+                  name_result = generator_func(rng=rng) # Call without gender
+        else:
+             # Fallback for races not explicitly handled
+             diagnostics.warning(f"No specific name generator mapped for {race_name} in NPC gen. Trying Common.")
+             name_result = generate_common_name(gender=npc_gender, rng=rng)
+
+        # --- Use the structured name directly ---
+        if name_result is None or name_result.error or not name_result.name:
+            npc_name = f"[{race_name} Name Error]"
+        else:
+            npc_name = name_result.name
+
+
+    except Exception as e:
+         # Catch any unexpected error during name generation phase
+         diagnostics.error(f"Unexpected error generating name for {race_name}: {e}")
+         # Ensure npc_name has a fallback value even after error
+         if npc_name.startswith("Unnamed"): # Only overwrite if it's still the default
+             npc_name = f"[{race_name} Name Error]"
+
+
+    # --- Pick Attributes ---
+    attributes = []
+    if isinstance(npc_attributes, dict):
+        attribute_options = _attribute_options(npc_attributes)
+        # Shuffle categories for variety if desired
+        categories = list(npc_attributes.keys())
+        rng.shuffle(categories)
+        for category in categories:
+            options = npc_attributes[category]
+            if not options or not isinstance(options, list): continue
+            try:
+                texts, table = attribute_options[category]
+                attributes.append((category.strip(), weighted_choice(texts, table, rng)))
+            except IndexError:
+                 diagnostics.warning(f"Attribute list for '{category}' is empty.")
+            except Exception as e:
+                 diagnostics.error(f"Error processing attribute '{category}': {e}")
+    else:
+         diagnostics.warning("NPC attributes data is not in the expected dictionary format.")
+
+    # Clan is only set during Tabaxi generation
+    return NPC(race_data, npc_name, clan_name, attributes, name_result)
+
+
+def generate_npc_range(start, stop, seed, gender="Any", race_names=None):
+    """
+    Generates NPCs start..stop-1 of the job seeded with `seed`. NPC i always uses
+    stream_rng(seed, i), so shards of one job can run in separate processes and
+    concatenate to the same output as a single generate_npc_range(0, n, seed).
+    """
+    return [generate_npc(rng, gender, race_names) for rng in stream_rngs(seed, start, stop)]
@@ -0,0 +1,208 @@
+import random
+
+# === Seeded RNG Streams ===
+# Every public generator takes an `rng` argument resolved by make_rng:
+#   None                 -> the process-global `random` module (old, unseeded behaviour)
+#   random.Random        -> used as-is
+#   int                  -> random.Random(seed)
+#   numpy SeedSequence   -> random.Random seeded from the sequence's state
+# Bulk jobs give item i its own stream with stream_rng(seed, i). The stream only
+# depends on (seed, i), so any split of the index range across processes
+# reproduces the single-process output exactly.
+
+
+def make_rng(rng=None):
+    """Resolves an rng/seed argument to an object with random(), choice() and shuffle()."""
+    if rng is None or rng is random:
+        return random
+    if isinstance(rng, random.Random):
+        return rng
+    if isinstance(rng, int):
+        return random.Random(rng)
+    if hasattr(rng, "generate_state"): # numpy.random.SeedSequence
+        return random.Random(int.from_bytes(rng.generate_state(4, dtype="uint64").tobytes(), "little"))
+    raise TypeError(f"Expected None, an int seed, random.Random or SeedSequence, got {type(rng).__name__}")
+
+
+def stream_seed(seed, index):
+    """
+    Returns the SeedSequence for item `index` of a job seeded with `seed`.
+    Equal to SeedSequence(seed).spawn(index + 1)[index], without spawning the siblings.
+    """
+    from numpy.random import SeedSequence # Deferred: only seeded bulk jobs pay for numpy
+    if isinstance(seed, SeedSequence):
+        return SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (index,), pool_size=seed.pool_size)
+    return SeedSequence(seed, spawn_key=(index,))
+
+
+def stream_rng(seed, index):
+    """Returns an independent random.Random for item `index` of the job seeded with `seed`."""
+    return make_rng(stream_seed(seed, index))
+
+
+# === Vectorised Streams ===
+# stream_rngs builds a whole range of stream_rng(seed, i) generators at once. For
+# a fixed parent seed, SeedSequence's entropy mixing only differs in the final
+# spawn-key word (the index), so the shared prefix is mixed once in Python and the
+# last word plus generate_state run over every index as NumPy uint32 arithmetic.
+# The constants and steps are SeedSequence's own (numpy/random/bit_generator.pyx).
+
+_MASK32 = 0xFFFFFFFF
+_INIT_A, _MULT_A = 0x43B0D7E5, 0x931E8875
+_INIT_B, _MULT_B = 0x8B51F9DD, 0x58F38DED
+_MIX_MULT_L, _MIX_MULT_R = 0xCA01F9DD, 0x4973F715
+
+
+def _hashmix(value, hash_const):
+    """Returns (mixed value, next hash constant). Works on ints and uint64 arrays alike."""
+    value = (value ^ hash_const) & _MASK32
+    hash_const = (hash_const * _MULT_A) & _MASK32
+    value = (value * hash_const) & _MASK32
+    return value ^ (value >> 16), hash_const
+
+
+def _mix(x, y):
+    result = (_MIX_MULT_L * x - _MIX_MULT_R * y) & _MASK32
+    return result ^ (result >> 16)
+
+
+def _uint32_words(value):
+    """SeedSequence's int/sequence -> uint32 word coercion; None for anything else."""
+    if isinstance(value, int) and value >= 0:
+        words = [value & _MASK32]
+        value >>= 32
+        while value:
+            words.append(value & _MASK32)
+            value >>= 32
+        return words
+    if isinstance(value, (list, tuple)):
+        words = []
+        for item in value:
+            item_words = _uint32_words(item)
+            if item_words is None:
+                return None
+            words.extend(item_words)
+        return words
+    return None
+
+
+def _mixed_prefix(seed):
+    """(mixer, hash constant) after mixing everything but the index word, or None if unsupported."""
+    if hasattr(seed, "spawn_key"): # SeedSequence parent
+        entropy, spawn_key, pool_size = _uint32_words(seed.entropy), _uint32_words(list(seed.spawn_key)), seed.pool_size
+    else:
+        entropy, spawn_key, pool_size = _uint32_words(seed), [], 4
+    if entropy is None or spawn_key is None:
+        return None
+    entropy = entropy + [0] * (pool_size - len(entropy)) + spawn_key # Padded because a spawn key follows
+
+    hash_const = _INIT_A
+    mixer = []
+    for word in entropy[:pool_size]:
+        value, hash_const = _hashmix(word, hash_const)
+        mixer.append(value)
+    for i_src in range(pool_size):
+        for i_dst in range(pool_size):
+            if i_src != i_dst:
+                value, hash_const = _hashmix(mixer[i_src], hash_const)
+                mixer[i_dst] = _mix(mixer[i_dst], value)
+    for word in entropy[pool_size:]:
+        for i_dst in range(pool_size):
+            value, hash_const = _hashmix(word, hash_const)
+            mixer[i_dst] = _mix(mixer[i_dst], value)
+    return mixer, hash_const
+
+
+def _stream_states(seed, start, stop):
+    """uint32 array (stop - start, 8): generate_state(4, uint64) of each stream_seed(seed, i)."""
+    import numpy as np
+    prefix = _mixed_prefix(seed)
+    if prefix is None:
+        return None
+    mixer, hash_const = prefix
+    index_words = np.arange(start, stop, dtype=np.uint64)
+    pool = []
+    for i_dst in range(len(mixer)):
+        value, hash_const = _hashmix(index_words, hash_const)
+        pool.append(_mix(np.uint64(mixer[i_dst]), value))
+
+    state = np.empty((stop - start, 8), dtype="<u4")
+    hash_const = _INIT_B
+    for i_dst in range(8):
+        data_val = pool[i_dst % len(pool)] ^ hash_const
+        hash_const = (hash_const * _MULT_B) & _MASK32
+        data_val = (data_val * hash_const) & _MASK32
+        state[:, i_dst] = data_val ^ (data_val >> 16)
+    return state
+
+
+def stream_rngs(seed, start, stop):
+    """
+    Returns [stream_rng(seed, i) for i in range(start, stop)], hashing the whole
+    range at once. Falls back to per-index stream_rng for seeds it can't vectorise.
+    """
+    if stop <= start:
+        return []
+    if stop <= 2 ** 32: # Larger indices take more than one spawn-key word
+        state = _stream_states(seed, start, stop)
+        # Checked against SeedSequence itself, so a numpy change can only cost speed, not reproducibility
+        if state is not None and state[0].tobytes() == stream_seed(seed, start).generate_state(4, dtype="uint64").astype("<u8").tobytes():
+            raw = state.tobytes()
+            return [random.Random(int.from_bytes(raw[k:k + 32], "little")) for k in range(0, len(raw), 32)]
+    return [stream_rng(seed, index) for index in range(start, stop)]
+
+
+# === Keyed Permutations ===
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _splitmix64(value):
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class KeyedPermutation:
+    """
+    Pseudorandom bijection on range(size), chosen by an integer key. A balanced
+    Feistel network permutes the smallest even-width power of two >= size, and
+    values landing outside the range are walked forward through the same
+    permutation (cycle walking) until they fall inside it. Memory is O(1); a
+    lookup takes fewer than four passes on average. Sizes up to 2**128.
+    """
+    __slots__ = ("size", "_half_bits", "_mask", "_round_keys")
+    ROUNDS = 4
+
+    def __init__(self, size, key):
+        if size < 0 or size > 2 ** 128:
+            raise ValueError("KeyedPermutation size must be between 0 and 2**128")
+        self.size = size
+        self._half_bits = max(1, ((size - 1).bit_length() + 1) // 2) if size > 1 else 1
+        self._mask = (1 << self._half_bits) - 1
+        round_keys = []
+        state = (key ^ (key >> 64)) & _MASK64
+        for _ in range(self.ROUNDS):
+            state = _splitmix64(state)
+            round_keys.append(state)
+        self._round_keys = tuple(round_keys)
+
+    def _feistel(self, value):
+        half_bits, mask = self._half_bits, self._mask
+        left, right = value >> half_bits, value & mask
+        for round_key in self._round_keys:
+            # _splitmix64(right ^ round_key), inlined: this loop is the whole cost of a lookup
+            z = ((right ^ round_key) + 0x9E3779B97F4A7C15) & _MASK64
+            z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+            left, right = right, left ^ ((z ^ (z >> 31)) & mask)
+        return (left << half_bits) | right
+
+    def __call__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        value = self._feistel(index)
+        while value >= self.size:
+            value = self._feistel(value)
+        return value
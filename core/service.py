@@ -0,0 +1,417 @@
+"""
+Local HTTP/JSON generation service for tools that can't import the app.
+
+Run from the repo root:
+    python -m core.service --port 8765
+
+Endpoints (JSON bodies and responses):
+    GET  /health   {"status": "ok", "pending": <queued items>}
+    GET  /races    {"names": [...], "npcs": [...]}
+    POST /names    {"race": "Elf", "count": 5, "gender": "Any", "clan": null, "seed": null}
+    POST /npcs     {"count": 5, "gender": "Any", "races": null, "seed": null}
+Both POSTs answer {"results": [...]}, each item being NameResult.to_dict() /
+NPC.to_dict(). With a seed, item i draws from stream_rng(seed, i), as in the CLI.
+
+Requests are coalesced and generated (and serialised) in one call on a worker
+thread, then fanned back out: everything that queues while a batch runs goes
+into the next one, and --window makes a batch also wait that many seconds
+after its first request for others to join. Within a batch, unseeded /names
+requests for the same race and gender are drawn together by one vectorised
+name_batch.generate_samples call; seeded ones keep their per-item streams.
+When more than --max-pending items are queued, new requests get 503 with
+Retry-After instead of queueing without bound, as do the requests of a batch
+whose worker call fails outright; oversized headers, bodies and counts are
+refused with 431, 413 and 400. --watch reloads edited data files without a
+restart (see data_watch.py).
+"""
+import argparse
+import asyncio
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import data_loader, diagnostics
+from .cli import name_races
+from .data_watch import DEFAULT_INTERVAL, watch_data
+from .name_batch import generate_samples
+from .name_generators import NAME_GENERATOR_MAP, NameResult, direct_grammar, generate_name
+from .npc_generator import generate_npc, generate_npc_range
+from .seeding import stream_rngs
+
+DEFAULT_WINDOW = 0.0 # extra seconds a batch waits after its first request
+MAX_BATCH_ITEMS = 2000 # names/NPCs generated per batch call
+MAX_PENDING_ITEMS = 20000 # queued items before new requests get 503
+MAX_COUNT = 1000 # items per request
+MAX_HEADER_BYTES = 8 * 1024
+MAX_BODY_BYTES = 64 * 1024
+GENDERS = ("Any", "Male", "Female")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error",
+            503: "Service Unavailable"}
+
+
+class ServiceError(Exception):
+    """A request the service refuses; status is the HTTP status to answer with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# === Request Validation ===
+
+def _count(body):
+    count = body.get("count", 1)
+    if not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= MAX_COUNT:
+        raise ServiceError(400, f"'count' must be an integer from 1 to {MAX_COUNT}.")
+    return count
+
+
+def _seed(body):
+    seed = body.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+        raise ServiceError(400, "'seed' must be a non-negative integer or null.")
+    return seed
+
+
+def _gender(body):
+    gender = body.get("gender", "Any")
+    if gender not in GENDERS:
+        raise ServiceError(400, f"'gender' must be one of {', '.join(GENDERS)}.")
+    return gender
+
+
+def _names_job(body, selectable):
+    race = body.get("race")
+    if race not in selectable:
+        raise ServiceError(400, "'race' must be one of the names listed by GET /races.")
+    race_key, element = selectable[race]
+    clan = body.get("clan")
+    if clan is not None and not isinstance(clan, str):
+        raise ServiceError(400, "'clan' must be a string or null.")
+    return ("names", _count(body), _seed(body), (race_key, _gender(body), clan, element))
+
+
+def _npcs_job(body, npc_races):
+    races = body.get("races")
+    if races is not None:
+        if not isinstance(races, list) or not races or not all(r in npc_races for r in races):
+            raise ServiceError(400, "'races' must be a non-empty list of names listed by GET /races.")
+        races = tuple(races)
+    return ("npcs", _count(body), _seed(body), (_gender(body), races))
+
+
+# === Batched Generation (worker thread) ===
+
+def _run_job(job):
+    kind, count, seed, options = job
+    if kind == "names":
+        race_key, gender, clan, element = options
+        rngs = stream_rngs(seed, 0, count) if seed is not None else [None] * count
+        return [generate_name(race_key, gender, rng, clan=clan, element=element).to_dict() for rng in rngs]
+    gender, races = options
+    if seed is not None:
+        npcs = generate_npc_range(0, count, seed, gender, races)
+    else:
+        npcs = [generate_npc(None, gender, races) for _ in range(count)]
+    return [npc.to_dict() for npc in npcs]
+
+
+def _sample_group(job):
+    """(grammar key, gender) for an unseeded names job generate_samples can serve, else None."""
+    kind, _, seed, options = job
+    if kind != "names" or seed is not None:
+        return None
+    race, gender, _, element = options
+    grammar = direct_grammar(race, element)
+    if grammar is None:
+        return None
+    return grammar, gender if NAME_GENERATOR_MAP[race].get("needs_gender") else "Any"
+
+
+def _run_sample_groups(jobs):
+    """{job position: results or exception} for the jobs that share one generate_samples call per group."""
+    groups = {}
+    for position, job in enumerate(jobs):
+        group = _sample_group(job)
+        if group is not None:
+            groups.setdefault(group, []).append(position)
+    results = {}
+    for (grammar, gender), positions in groups.items():
+        try:
+            samples = generate_samples(grammar, sum(jobs[p][1] for p in positions), gender)
+        except Exception as e:
+            diagnostics.error(f"Generation failed for {len(positions)} {grammar} names request(s): {e}")
+            results.update((p, ServiceError(500, "Generation failed.")) for p in positions)
+            continue
+        start = 0
+        for position in positions:
+            stop = start + jobs[position][1]
+            results[position] = [NameResult.from_sample(grammar, data).to_dict() for data in samples[start:stop]]
+            start = stop
+    return results
+
+
+def run_batch(jobs):
+    """Generates every job of a batch; returns one response body (bytes) or exception per job."""
+    grouped = _run_sample_groups(jobs)
+    bodies = []
+    for position, job in enumerate(jobs):
+        results = grouped.get(position)
+        if isinstance(results, Exception):
+            bodies.append(results)
+            continue
+        try:
+            if results is None:
+                results = _run_job(job)
+            bodies.append(json.dumps({"results": results}, ensure_ascii=False).encode("utf-8"))
+        except Exception as e: # One bad job must not fail its batch-mates
+            diagnostics.error(f"Generation failed for a {job[0]} request: {e}")
+            bodies.append(ServiceError(500, "Generation failed."))
+    return bodies
+
+
+class MicroBatcher:
+    """
+    Queues jobs and runs them in batches on one worker thread. A batch starts
+    `window` seconds after its first job arrives, or as soon as max_batch items
+    are waiting; while a batch runs, the next one fills up.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, max_batch=MAX_BATCH_ITEMS, max_pending=MAX_PENDING_ITEMS):
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.pending = 0 # queued items (not jobs)
+        self.batches = 0
+        self._queue = deque()
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tivmir-gen")
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, job):
+        """Queues job and returns its response body once its batch has run."""
+        size = job[1]
+        if self.pending + size > self.max_pending:
+            raise ServiceError(503, "Server busy; retry shortly.")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((job, future, loop.time()))
+        self.pending += size
+        self._ready.set()
+        if self.pending >= self.max_batch:
+            self._full.set()
+        body = await future
+        if isinstance(body, Exception):
+            raise body
+        return body
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._ready.wait()
+            wait = self._queue[0][2] + self.window - loop.time() # Jobs queued during the last batch have waited already
+            if wait > 0 and not self._full.is_set():
+                try:
+                    await asyncio.wait_for(self._full.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            batch, size = [], 0
+            while self._queue and (not batch or size + self._queue[0][0][1] <= self.max_batch):
+                job, future, _ = self._queue.popleft()
+                batch.append((job, future))
+                size += job[1]
+            self.pending -= size
+            if not self._queue:
+                self._ready.clear()
+            if self.pending < self.max_batch:
+                self._full.clear()
+            live = [(job, future) for job, future in batch if not future.cancelled()] # Clients that hung up
+            if not live:
+                continue
+            self.batches += 1
+            try:
+                bodies = await loop.run_in_executor(self._executor, run_batch, [job for job, _ in live])
+            except Exception as e: # e.g. MemoryError or a broken executor; fail this batch, keep serving
+                diagnostics.error(f"A batch of {len(live)} request(s) failed: {e!r}")
+                self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tivmir-gen")
+                bodies = [ServiceError(503, "Generation failed; retry shortly.")] * len(live)
+            for (_, future), body in zip(live, bodies):
+                if not future.done():
+                    future.set_result(body)
+
+
+# === HTTP ===
+
+def _response(status, body, keep_alive):
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+    if status == 503:
+        head += "Retry-After: 1\r\n"
+    return head.encode("latin-1") + b"\r\n" + body
+
+
+def _error_body(message):
+    return json.dumps({"error": message}).encode("utf-8")
+
+
+async def _read_request(reader):
+    """(method, path, headers, body), or None at a clean end of stream."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise ServiceError(400, "Incomplete request.")
+    except asyncio.LimitOverrunError:
+        raise ServiceError(431, f"Request headers exceed {MAX_HEADER_BYTES} bytes.")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise ServiceError(400, "Malformed request line.")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise ServiceError(400, "Chunked request bodies are not supported; send Content-Length.")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise ServiceError(400, "Invalid Content-Length.")
+    if length < 0 or length > MAX_BODY_BYTES:
+        raise ServiceError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes.")
+    body = await reader.readexactly(length) if length else b""
+    if version == "HTTP/1.0":
+        headers.setdefault("connection", "close")
+    return method, target.split("?", 1)[0], headers, body
+
+
+class GenerationService:
+    """The HTTP front end: parses requests, validates them and hands jobs to a MicroBatcher."""
+
+    def __init__(self, window=DEFAULT_WINDOW, max_pending=MAX_PENDING_ITEMS):
+        self.batcher = MicroBatcher(window, max_pending=max_pending)
+        self.selectable = name_races()
+        self._set_npc_races()
+        data_loader.add_reload_listener(self._on_data_reload)
+        self._server = None
+
+    def _set_npc_races(self):
+        npc_races = {r["name"] for r in data_loader.races if isinstance(r, dict) and "name" in r}
+        self._races_body = json.dumps({"names": list(self.selectable), "npcs": sorted(npc_races)}).encode("utf-8")
+        self.npc_races = npc_races
+
+    def _on_data_reload(self, event):
+        if "races" in event.globals:
+            self._set_npc_races()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER_BYTES)
+        return self._server
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.close()
+
+    async def _dispatch(self, method, path, body):
+        if path == "/health":
+            return json.dumps({"status": "ok", "pending": self.batcher.pending}).encode("utf-8")
+        if path == "/races":
+            return self._races_body
+        if path not in ("/names", "/npcs"):
+            raise ServiceError(404, f"No such endpoint: {path}")
+        if method != "POST":
+            raise ServiceError(405, f"{path} only accepts POST.")
+        try:
+            request = json.loads(body or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            raise ServiceError(400, "Request body is not valid JSON.")
+        if not isinstance(request, dict):
+            raise ServiceError(400, "Request body must be a JSON object.")
+        job = _names_job(request, self.selectable) if path == "/names" else _npcs_job(request, self.npc_races)
+        return await self.batcher.submit(job)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ServiceError as e: # Can't tell where the next request starts; answer and hang up
+                    writer.write(_response(e.status, _error_body(str(e)), False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, payload = 200, await self._dispatch(method, path, body)
+                except ServiceError as e:
+                    status, payload = e.status, _error_body(str(e))
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host="127.0.0.1", port=8765, window=DEFAULT_WINDOW, max_pending=MAX_PENDING_ITEMS):
+    service = GenerationService(window, max_pending)
+    server = await service.start(host, port)
+    diagnostics.info(f"tivmir service listening on http://{host}:{service.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.service", description="Serve names and NPCs over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="Extra seconds a batch waits for more requests (default 0).")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING_ITEMS, help="Queued items before requests get 503.")
+    parser.add_argument("--watch", type=float, nargs="?", const=DEFAULT_INTERVAL, metavar="SECONDS",
+                        help=f"Reload edited data files, checking every SECONDS (default {DEFAULT_INTERVAL:g}).")
+    args = parser.parse_args(argv)
+    data_loader.preload() # Load everything before the first request rather than during it
+    if args.watch:
+        watch_data(args.watch)
+    try:
+        asyncio.run(serve(args.host, args.port, args.window, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
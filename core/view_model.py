@@ -0,0 +1,65 @@
+from . import data_loader
+from .data_loader import index_by_name
+
+# === UI View Model ===
+# Every index the UI derives from static data (race lists by rarity, lookups by
+# name, sorted option lists), built once per data version instead of on every
+# Streamlit rerun. The app caches it with st.cache_resource keyed on
+# data_fingerprint(), so new data produces a new one.
+
+RARITIES = ("Common", "Uncommon", "Rare", "Very Rare")
+
+
+def data_fingerprint(data_dir=data_loader.DATA_DIR):
+    """
+    Key for the data being served: the compiled corpus's sha256 of the JSON it
+    was built from, or, without a corpus, every JSON file's name, size and mtime.
+    """
+    corpus = data_loader.get_corpus() if data_dir == data_loader.DATA_DIR else None
+    if corpus is not None:
+        return corpus.source_hash
+    from .corpus import source_manifest # Keeps `python -m core.corpus` free of a runpy double import
+    return hash(tuple(tuple(entry) for entry in source_manifest(data_dir)))
+
+
+class ViewModel:
+    """
+    Derived UI indexes for one version of the data. `problems` holds the
+    warnings found while building (unknown rarities, invalid entries) so the
+    page can still show them on every run.
+    """
+    __slots__ = ("races_by_rarity", "all_race_names", "race_by_name", "deity_by_name", "deity_names",
+                 "clan_by_name", "clan_names", "problems", "races_loaded")
+
+    def __init__(self, races, deities, clans, fallback_race_names=()):
+        self.problems = []
+        self.races_by_rarity = {rarity: [] for rarity in RARITIES}
+        self.race_by_name = {}
+        self.races_loaded = bool(races) and isinstance(races, list)
+        if self.races_loaded:
+            for race_info in races:
+                if isinstance(race_info, dict) and "name" in race_info and "rarity" in race_info:
+                    name, rarity = race_info["name"], race_info["rarity"]
+                    if rarity in self.races_by_rarity:
+                        self.races_by_rarity[rarity].append(name)
+                    else:
+                        self.problems.append(f"Race '{name}' has unknown rarity '{rarity}'.")
+                    self.race_by_name.setdefault(name, race_info)
+                else:
+                    self.problems.append(f"Skipping invalid race entry in races.json: {race_info}")
+            for names in self.races_by_rarity.values():
+                names.sort()
+            self.all_race_names = sorted(self.race_by_name)
+        else:
+            self.all_race_names = sorted(fallback_race_names)
+
+        self.deity_by_name = index_by_name(deities)
+        self.deity_names = sorted(d.get("name", "Unknown Deity") for d in deities or () if isinstance(d, dict))
+        self.clan_by_name = index_by_name(clans)
+        self.clan_names = sorted(self.clan_by_name)
+
+
+def build_view_model(fallback_race_names=()):
+    """A ViewModel over the currently loaded races, deities and Tabaxi clans."""
+    clans = data_loader.name_data.get("tabaxi", {}).get("clans", [])
+    return ViewModel(data_loader.races, data_loader.deities, clans if isinstance(clans, list) else [], fallback_race_names)
@@ -1,98 +1,68 @@
 import streamlit as st
-import os
+import logging
+import sqlite3
 st.set_page_config(page_title="Tivmir World Tools", layout="centered")
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from core import diagnostics
+
+# Route core diagnostics to the page instead of the log. The sink is process-wide,
+# so messages from threads without a script run (e.g. the data watcher, or
+# another session's background work) go to the log instead.
+def _streamlit_sink(level, message):
+    if get_script_run_ctx() is None: diagnostics.logging_sink(level, message)
+    elif level >= logging.ERROR: st.error(message)
+    elif level >= logging.WARNING: st.warning(message)
+    elif level >= logging.INFO: st.info(message)
+diagnostics.set_sink(_streamlit_sink)
+
 # Import necessary data and TOP-LEVEL generator functions
-from data_loader import name_data, races, calendar_data, npc_attributes, icons, deities
-from npc_generator import generate_npc
+from core import data_loader
+from core.data_loader import name_data
+from core.data_watch import watch_data
+from core.npc_generator import generate_npc
 # --- ADD Calendar Imports ---
-from calendar_tracker import (
+from core.calendar_tracker import (
     initialize_calendar_state,
     get_current_date_string,
     advance_day,
     advance_week,
-    advance_month
-)
-from name_generators import (
-    generate_elven_name, generate_orc_name, generate_infernal_name,
-    generate_tabaxi_name, generate_drow_name, generate_dragonborn_name,
-    generate_aarakocra_name, generate_owlin_name, generate_tortle_name,
-    generate_triton_name, generate_fire_genasi_name, generate_earth_genasi_name,
-    generate_air_genasi_name, generate_water_genasi_name, generate_eladrin_name,
-    generate_kenku_name, generate_lizardfolk_name, generate_yuan_ti_name,
-    generate_goblin_name, generate_gnome_name, generate_halfling_name,
-    generate_goliath_name, generate_minotaur_name, generate_bugbear_name,
-    generate_harengon_name, generate_leonin_name, generate_loxodon_name,
-    generate_aasimar_name, generate_shifter_name, generate_githyanki_name,
-    generate_common_name # Used for Human
+    advance_month,
+    add_event,
+    upcoming_events,
+    attach_clock,
+    sync_clock
 )
-
-# --- Define the Name Generator Map ---
-# Maps Race Name -> { func: generator_function, needs_gender: bool, needs_clan: bool, needs_element: bool }
-# Use generate_common_name for Human
-# Use None for func if special handling is needed (like Genasi composite)
-NAME_GENERATOR_MAP = {
-    "Elf": {"func": generate_elven_name, "needs_gender": False},
-    "Eladrin": {"func": generate_eladrin_name, "needs_gender": False},
-    "Tabaxi": {"func": generate_tabaxi_name, "needs_gender": False, "needs_clan": True},
-    "Human": {"func": generate_common_name, "needs_gender": True},
-    "Halfling": {"func": generate_halfling_name, "needs_gender": True},
-    "Orc": {"func": generate_orc_name, "needs_gender": True},
-    "Tiefling": {"func": generate_infernal_name, "needs_gender": True},
-    "Drow": {"func": generate_drow_name, "needs_gender": True},
-    "Dragonborn": {"func": generate_dragonborn_name, "needs_gender": False},
-    "Aarakocra": {"func": generate_aarakocra_name, "needs_gender": True},
-    "Owlin": {"func": generate_owlin_name, "needs_gender": False},
-    "Tortle": {"func": generate_tortle_name, "needs_gender": True},
-    "Triton": {"func": generate_triton_name, "needs_gender": False},
-    "Genasi": {"func": None, "needs_gender": False, "needs_element": True}, # Special case
-    "Kenku": {"func": generate_kenku_name, "needs_gender": False},
-    "Lizardfolk": {"func": generate_lizardfolk_name, "needs_gender": False},
-    "Yuan-Ti": {"func": generate_yuan_ti_name, "needs_gender": False},
-    "Goblin": {"func": generate_goblin_name, "needs_gender": False},
-    "Bugbear": {"func": generate_bugbear_name, "needs_gender": False},
-    "Gnome": {"func": generate_gnome_name, "needs_gender": True},
-    "Goliath": {"func": generate_goliath_name, "needs_gender": False},
-    "Minotaur": {"func": generate_minotaur_name, "needs_gender": True},
-    "Harengon": {"func": generate_harengon_name, "needs_gender": False},
-    "Leonin": {"func": generate_leonin_name, "needs_gender": True},
-    "Loxodon": {"func": generate_loxodon_name, "needs_gender": True},
-    "Aasimar": {"func": generate_aasimar_name, "needs_gender": False},
-    "Shifter": {"func": generate_shifter_name, "needs_gender": False},
-    "Githyanki": {"func": generate_githyanki_name, "needs_gender": True},
-}
-
-# === Pre-process Races for UI ===
-# Group races by rarity and sort alphabetically
-RACES_BY_RARITY = {
-    "Common": [],
-    "Uncommon": [],
-    "Rare": [],
-    "Very Rare": []
-}
-ALL_RACE_NAMES_SORTED = []
-
-if races and isinstance(races, list):
-    all_names = []
-    for race_info in races:
-        if isinstance(race_info, dict) and "name" in race_info and "rarity" in race_info:
-            name = race_info["name"]
-            rarity = race_info["rarity"]
-            if rarity in RACES_BY_RARITY:
-                RACES_BY_RARITY[rarity].append(name)
-            else:
-                st.warning(f"Race '{name}' has unknown rarity '{rarity}'.") # Handle unexpected rarity
-            all_names.append(name)
-        else:
-            st.warning(f"Skipping invalid race entry in races.json: {race_info}")
-
-    # Sort lists alphabetically
-    for rarity_key in RACES_BY_RARITY:
-        RACES_BY_RARITY[rarity_key].sort()
-    ALL_RACE_NAMES_SORTED = sorted(all_names)
-else:
+from core.campaign_clock import get_clock_store
+from core import image_cache
+from core import instrumentation
+# Race Name -> generator config (func, needs_gender, needs_clan, needs_element); shared with the CLI
+from core.name_generators import NAME_GENERATOR_MAP, GENASI_GENERATORS
+from core.view_model import build_view_model, data_fingerprint
+
+# === Derived UI Data ===
+# Rarity groups, name lookups and sorted option lists, built once per data
+# version and shared by every session instead of being rebuilt on each rerun.
+@st.cache_resource
+def get_view_model(data_fingerprint):
+    return build_view_model(fallback_race_names=NAME_GENERATOR_MAP.keys())
+
+# Edits to data/*.json are reloaded in place by one watcher thread per server process
+@st.cache_resource
+def start_data_watcher():
+    return watch_data()
+
+start_data_watcher()
+DATA_FINGERPRINT = data_fingerprint()
+VIEW = get_view_model(DATA_FINGERPRINT)
+for problem in VIEW.problems:
+    st.warning(problem)
+if not VIEW.races_loaded:
     st.error("Failed to load or process race data for UI.")
-    # Provide fallback race list if needed, or handle error state
-    ALL_RACE_NAMES_SORTED = list(NAME_GENERATOR_MAP.keys()).sort()
+
+@st.cache_resource
+def preload_deity_symbols(data_fingerprint):
+    """Builds the symbol thumbnails once per server process (and data version)."""
+    return image_cache.preload([d.get("symbol_image") for d in data_loader.deities], "thumb")
 
 # === UI ===
 st.title("🌸 Tivmir World Tools")
@@ -106,9 +76,21 @@ if 'selected_rarity' not in st.session_state: st.session_state.selected_rarity =
 if 'name_race' not in st.session_state: st.session_state.name_race = None
 # --- ADD Calendar State Initialization ---
 # Call this only once per session start
-initialize_calendar_state(start_year=1478, start_month_index=0, start_day=1)
-
-tabs = st.tabs(["🌿 NPC Generator", "🔤 Name Generator", "📅 Calendar", "🌌 Lore"])
+initialize_calendar_state(st.session_state, start_year=1478, start_month_index=0, start_day=1)
+# Share the date with every other session through the persistent campaign clock
+if 'clock_store' not in st.session_state and not st.session_state.get('clock_unavailable'):
+    try:
+        attach_clock(st.session_state, get_clock_store())
+    except sqlite3.Error as e:
+        st.session_state.clock_unavailable = True # Fall back to a per-session date
+        st.warning(f"Shared campaign clock unavailable ({e}); the date will only be kept for this session.")
+sync_clock(st.session_state)
+
+CLOCK_POLL_SECONDS = 5 # How often an idle Calendar tab picks up another session's advance
+
+# The Diagnostics tab is hidden unless the URL has ?diagnostics=1 or instrumentation is already on
+SHOW_DIAGNOSTICS = st.query_params.get("diagnostics") == "1" or instrumentation.enabled()
+tabs = st.tabs(["🌿 NPC Generator", "🔤 Name Generator", "📅 Calendar", "🌌 Lore"] + (["🩺 Diagnostics"] if SHOW_DIAGNOSTICS else []))
 
 # --- NPC Generator Tab (Remains the same) ---
 with tabs[0]:
@@ -121,10 +103,11 @@ with tabs[0]:
         if st.button("Clear Output", key="npc_clear"):
             st.session_state.npc_output = ""
 
-    if st.session_state.npc_output: st.markdown("---")
+    npc_text = str(st.session_state.npc_output) # NPC markdown is only rendered here, for display
+    if npc_text: st.markdown("---")
     with st.container(border=True):
-         if st.session_state.npc_output and "Error:" in st.session_state.npc_output: st.error(st.session_state.npc_output)
-         elif st.session_state.npc_output: st.markdown(st.session_state.npc_output)
+         if npc_text and "Error:" in npc_text: st.error(npc_text)
+         elif npc_text: st.markdown(npc_text)
          else: st.markdown("*Click 'Generate NPC' to create a character...*")
 
 
@@ -133,7 +116,7 @@ with tabs[1]:
     st.header("🔤 Name Generator")
 
     # Define rarity order + Add "All" option
-    rarity_options = ["All"] + list(RACES_BY_RARITY.keys())
+    rarity_options = ["All"] + list(VIEW.races_by_rarity.keys())
 
     # Callback to reset race when rarity changes
     def rarity_changed():
@@ -151,9 +134,9 @@ with tabs[1]:
     # Determine race options based on selected rarity
     current_race_options = []
     if selected_rarity == "All":
-        current_race_options = ALL_RACE_NAMES_SORTED
-    elif selected_rarity in RACES_BY_RARITY:
-        current_race_options = RACES_BY_RARITY[selected_rarity]
+        current_race_options = VIEW.all_race_names
+    elif selected_rarity in VIEW.races_by_rarity:
+        current_race_options = VIEW.races_by_rarity[selected_rarity]
 
     # Race Selection (conditional based on rarity having races)
     if current_race_options:
@@ -210,13 +193,10 @@ with tabs[1]:
                 # Function call handled below
 
             if race_config.get("needs_clan"): # Special case for Tabaxi
-                tabaxi_data = name_data.get("tabaxi", {})
-                clan_list = tabaxi_data.get("clans", [])
+                clan_list = name_data.get("tabaxi", {}).get("clans", [])
                 if clan_list and isinstance(clan_list, list):
-                     clan_names = [c["name"] for c in clan_list if isinstance(c, dict) and "name" in c]
+                     clan_names = VIEW.clan_names # Already sorted alphabetically
                      if clan_names:
-                         # Sort clan names alphabetically
-                         clan_names.sort()
                          selected_clan = st.selectbox("Choose a Tabaxi clan:", clan_names, key="tabaxi_clan_ng")
                          kwargs_for_func["selected_clan"] = selected_clan # Pass clan name
                      else: st.warning("No valid clan names found.")
@@ -229,10 +209,7 @@ with tabs[1]:
                 generator_func = race_config["func"]
 
                 if race == "Genasi": # Handle Genasi separately
-                    if selected_element == "Air": st.session_state.name_output = generate_air_genasi_name()
-                    elif selected_element == "Water": st.session_state.name_output = generate_water_genasi_name()
-                    elif selected_element == "Fire": st.session_state.name_output = generate_fire_genasi_name()
-                    elif selected_element == "Earth": st.session_state.name_output = generate_earth_genasi_name()
+                    if selected_element in GENASI_GENERATORS: st.session_state.name_output = GENASI_GENERATORS[selected_element]()
                 elif race == "Tabaxi": # Handle Tabaxi separately
                      if selected_clan:
                          st.session_state.name_output = generator_func(selected_clan)
@@ -260,20 +237,26 @@ with tabs[1]:
 
 
     # Display Name Generator output (Remains the same)
-    if st.session_state.name_output:
+    name_text = str(st.session_state.name_output) # NameResult markdown is only rendered here
+    if name_text:
         st.markdown("---")
-        if "Error:" in st.session_state.name_output:
-            st.error(st.session_state.name_output)
+        if "Error:" in name_text:
+            st.error(name_text)
         else:
-            st.markdown(st.session_state.name_output)
+            st.markdown(name_text)
 
 # --- ADD Calendar Tracker Tab ---
 with tabs[2]:
     st.header("📅 Tivmir Calendar Tracker")
 
-    # Display current date
-    st.subheader("Current Date:")
-    st.markdown(f"## {get_current_date_string()}") # Display formatted date prominently
+    # Display current date; re-polled on its own so advances made in other sessions show up
+    @st.fragment(run_every=CLOCK_POLL_SECONDS)
+    def current_date_panel():
+        sync_clock(st.session_state)
+        st.subheader("Current Date:")
+        st.markdown(f"## {get_current_date_string(st.session_state)}") # Display formatted date prominently
+
+    current_date_panel()
 
     st.markdown("---") # Separator
 
@@ -282,21 +265,44 @@ with tabs[2]:
     col1, col2, col3 = st.columns(3)
     with col1:
         if st.button("Advance 1 Day", key="adv_day_1"):
-            advance_day(1)
+            advance_day(st.session_state, 1)
             st.rerun() # Rerun script immediately to show updated date
     with col2:
         if st.button("Advance 1 Week", key="adv_week"):
-            advance_week()
+            advance_week(st.session_state)
             st.rerun()
     with col3:
         if st.button("Advance 1 Month", key="adv_month"):
-            advance_month()
+            advance_month(st.session_state)
             st.rerun()
 
+    st.markdown("---")
+
+    # Events from today through the next 30 days (holy days, festivals, campaign events)
+    st.subheader("Upcoming Events:")
+    upcoming = upcoming_events(st.session_state, days=30)
+    if upcoming:
+        for date_string, event in upcoming:
+            st.markdown(f"- **{date_string}** — {event.name}")
+    else:
+        st.markdown("*No events in the next 30 days.*")
+
+    with st.expander("Add Event"):
+        event_name = st.text_input("Event name:", key="event_name")
+        event_starts_in = st.number_input("Starts in (days):", min_value=0, value=0, step=1, key="event_starts_in")
+        event_duration = st.number_input("Lasts (days):", min_value=1, value=1, step=1, key="event_duration")
+        if st.button("Add Event", key="add_event_button"):
+            if event_name.strip():
+                add_event(st.session_state, event_name.strip(), int(event_starts_in), int(event_duration))
+                st.rerun()
+            else:
+                st.warning("Please enter an event name.")
+
 # --- ADD Lore / Deity Browser Tab ---
 with tabs[3]: # Index 3 corresponds to the 4th tab, "🌌 Lore"
     st.header("🌌 Tivmir Pantheon")
 
+    deities = data_loader.deities # Read each run, so reloaded deity data shows up
     if not deities:
         st.warning("Deity information could not be loaded.")
     else:
@@ -323,10 +329,10 @@ with tabs[3]: # Index 3 corresponds to the 4th tab, "🌌 Lore"
             symbol_text = deity_data.get('symbol', 'N/A')
             image_path = None
             if symbol_filename:
-                # Assume images are in an 'images' folder at the root
-                image_path = os.path.join("images", symbol_filename)
+                # A 200px derivative of the full-size symbol in images/, made on first use
+                image_path = image_cache.image_path(symbol_filename, "thumb")
 
-            if image_path and os.path.exists(image_path):
+            if image_path:
                 st.image(image_path, caption=f"Symbol: {symbol_text}", width=100) # Adjust width as needed
             else:
                 st.markdown(f"**Symbol:** {symbol_text}")
@@ -343,10 +349,10 @@ with tabs[3]: # Index 3 corresponds to the 4th tab, "🌌 Lore"
 
         if display_mode == "Browse All":
             st.subheader("Browse Deities")
+            preload_deity_symbols(DATA_FINGERPRINT) # Every deity's thumbnail, so switching between them is instant
 
-            deity_names = sorted([d.get("name", "Unknown Deity") for d in deities]) # Sort names
-            selected_deity_name = st.selectbox("Select a Deity:", deity_names)
-            selected_deity = next((d for d in deities if d.get("name") == selected_deity_name), None)
+            selected_deity_name = st.selectbox("Select a Deity:", VIEW.deity_names)
+            selected_deity = VIEW.deity_by_name.get(selected_deity_name)
 
             if selected_deity:
                 display_deity_info(selected_deity) # Use the helper function
@@ -369,4 +375,23 @@ with tabs[3]: # Index 3 corresponds to the 4th tab, "🌌 Lore"
             if st.session_state.get('random_deity'):
                 display_deity_info(st.session_state.random_deity)
             else:
-                 st.info("Click 'Show Another Random Deity' or select 'Browse All'.")
\ No newline at end of file
+                 st.info("Click 'Show Another Random Deity' or select 'Browse All'.")
+
+# --- Diagnostics Tab (hidden) ---
+if SHOW_DIAGNOSTICS:
+    with tabs[4]:
+        st.header("🩺 Diagnostics")
+        st.caption("Call counts and latencies for the generators and per-file data load times, for this server process.")
+        recording = st.toggle("Record timings", value=instrumentation.enabled(), key="diagnostics_recording")
+        if recording and not instrumentation.enabled():
+            instrumentation.enable()
+        elif not recording and instrumentation.enabled():
+            instrumentation.disable()
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Reset", key="diagnostics_reset"):
+                instrumentation.reset()
+        with col2:
+            st.download_button("Download JSON", instrumentation.report_json(), file_name="tivmir_timings.json",
+                               mime="application/json", key="diagnostics_download")
+        st.code(instrumentation.report_text(), language=None)
@@ -0,0 +1,11 @@
+import pytest
+
+from core import diagnostics
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    """Discards core diagnostics; tests that check messages install their own sink."""
+    previous = diagnostics.set_sink(diagnostics.null_sink)
+    yield
+    diagnostics.set_sink(previous)
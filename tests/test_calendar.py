@@ -0,0 +1,175 @@
+import numpy as np
+import pytest
+
+from core import calendar_bulk
+from core.calendar_engine import CalendarEngine, LeapRule
+
+MONTHS = ["Jaysong", "Fellwind", "Marion", "Apstus"]
+
+
+@pytest.fixture
+def engine():
+    # Leap day in the second month, Gregorian-style exceptions, and years either side of 0
+    return CalendarEngine(MONTHS, [31, 28, 31, 30], "LD", LeapRule(1, 4, 100, 400))
+
+
+def test_bulk_conversion_matches_the_engine(engine):
+    start, stop = engine.year_start(-405), engine.year_start(405)
+    ordinals = np.arange(start, stop)
+    years, months, days = calendar_bulk.ordinals_to_dates(ordinals, engine)
+    expected = [engine.from_ordinal(o) for o in range(start, stop)]
+    assert list(zip(years.tolist(), months.tolist(), days.tolist())) == expected
+    assert (calendar_bulk.dates_to_ordinals(years, months, days, engine) == ordinals).all()
+    leap_days = [date for date in expected if date[1:] == (1, 29)]
+    assert leap_days and all(engine.is_leap(year) for year, _, _ in leap_days)
+
+
+def test_bulk_formatting_matches_the_engine(engine):
+    rng = np.random.default_rng(0)
+    ordinals = rng.integers(engine.year_start(-50), engine.year_start(50), 2000) # Sparse: formats row by row
+    ordinals[:3] = [engine.to_ordinal(0, 1, 29), engine.to_ordinal(-4, 1, 29), engine.to_ordinal(100, 1, 28)]
+    assert calendar_bulk.format_ordinals(ordinals, engine).tolist() == [engine.format(engine.from_ordinal(o))
+                                                                         for o in ordinals.tolist()]
+
+
+def test_bulk_rejects_dates_the_engine_rejects(engine):
+    with pytest.raises(ValueError):
+        engine.to_ordinal(100, 1, 29)
+    with pytest.raises(ValueError):
+        calendar_bulk.dates_to_ordinals([100], [1], [29], engine)
+    assert calendar_bulk.dates_to_ordinals([400], [1], [29], engine).tolist() == [engine.to_ordinal(400, 1, 29)]
+
+
+def test_month_starts_are_read_only(engine):
+    assert engine.month_starts() == (0, 31, 59, 90, 120)
+    assert engine.month_starts(leap_year=True) == (0, 31, 60, 91, 121)
+    assert CalendarEngine(MONTHS, [31, 28, 31, 30]).month_starts(leap_year=True) == (0, 31, 59, 90, 120)
+    assert engine.mean_year == pytest.approx(120 + 97 / 400)
+
+
+def _step_days(engine, date, days):
+    """Reference for add_days: walks one day at a time."""
+    year, month, day = date
+    for _ in range(abs(days)):
+        if days > 0:
+            day += 1
+            if day > engine.days_in_month(year, month):
+                day, month = 1, month + 1
+                if month == len(engine.month_names):
+                    month, year = 0, year + 1
+        else:
+            day -= 1
+            if day < 1:
+                month -= 1
+                if month < 0:
+                    month, year = len(engine.month_names) - 1, year - 1
+                day = engine.days_in_month(year, month)
+    return year, month, day
+
+
+@pytest.mark.parametrize("days", [1, -1, 29, -29, 365, -365, 1461, -1461, 36524, -36525, 146097, -146097])
+@pytest.mark.parametrize("start", [(0, 1, 28), (-1, 3, 30), (99, 1, 28), (400, 0, 31), (1478, 2, 1)])
+def test_advance_day_matches_day_by_day_stepping(engine, monkeypatch, start, days):
+    from core import calendar_tracker
+    monkeypatch.setattr(calendar_tracker, "CALENDAR", engine)
+    state = {}
+    calendar_tracker.set_current_date(state, start)
+    calendar_tracker.advance_day(state, days)
+    assert calendar_tracker.get_current_date(state) == _step_days(engine, start, days)
+
+
+@pytest.mark.parametrize("leap", [{"every": 0}, {"every": 4, "skip_every": 0, "keep_every": 400}, {"every": -4},
+                                  {"every": 4, "extra_days": 0}, {"every": 4, "month": "Nowhere"}])
+def test_invalid_leap_rules_are_rejected_and_the_old_calendar_kept(leap, monkeypatch):
+    from core import calendar_tracker, diagnostics
+    messages = []
+    monkeypatch.setattr(diagnostics, "_sink", lambda level, message: messages.append(message))
+    for name in ("MONTHS", "YEAR_SUFFIX", "DAYS_IN_MONTH", "MONTH_NAMES", "CALENDAR"):
+        monkeypatch.setattr(calendar_tracker, name, getattr(calendar_tracker, name))
+    working = calendar_tracker.CALENDAR
+    data = {"months": [{"name": name, "days": 30} for name in MONTHS], "leap": {"month": "Fellwind", **leap}}
+    with pytest.raises(ValueError):
+        CalendarEngine.from_data(data)
+    calendar_tracker._set_calendar_data(data)
+    assert calendar_tracker.CALENDAR is working
+    assert any("Invalid calendar data" in m for m in messages)
+
+
+def _brute_occurrences(engine, rule, low, high):
+    """Every start of rule whose occurrence overlaps low..high, by checking each day."""
+    found = []
+    for ordinal in range(low - rule.duration + 1, high + 1):
+        if (rule.first is not None and ordinal < rule.first) or (rule.last is not None and ordinal > rule.last):
+            continue
+        _, month, day = engine.from_ordinal(ordinal)
+        if (rule.kind == "yearly" and (month, day) == (rule.month_index, rule.day)
+                or rule.kind == "monthly" and day == rule.day
+                or rule.kind == "interval" and (ordinal - rule.anchor) % rule.every == 0):
+            found.append(ordinal)
+    return found
+
+
+@pytest.fixture
+def store(engine):
+    from core.calendar_events import EventStore
+    rng = np.random.default_rng(1)
+    store = EventStore(engine)
+    low, high = engine.year_start(96), engine.year_start(106)
+    for i in range(300):
+        start = int(rng.integers(low, high))
+        store.add(f"event {i % 7}", start, start + int(rng.choice([0, 0, 1, 6, 40, 400])))
+    for i in range(40):
+        name, duration = f"rule {i % 5}", int(rng.choice([1, 1, 3, 45]))
+        kind = ("yearly", "monthly", "interval")[i % 3]
+        if kind == "yearly":
+            month = int(rng.integers(0, 4))
+            rule = {"month_index": month, "day": int(rng.integers(1, engine.month_days[month] + 2))} # Feb 29 and impossible days too
+        elif kind == "monthly":
+            rule = {"day": int(rng.integers(1, 32))}
+        else:
+            rule = {"every": int(rng.integers(1, 200)), "anchor": int(rng.integers(low, high))}
+        if i % 4 == 0:
+            rule["first"], rule["last"] = sorted(int(x) for x in rng.integers(low, high, 2))
+        store.add_recurring(name, kind, duration=duration, **rule)
+    return store
+
+
+def test_between_matches_a_brute_force_scan(store, engine):
+    from core.calendar_events import RecurringEvent
+    rng = np.random.default_rng(2)
+    events = [e for _, events in store._buckets.values() for e in events]
+    for length in [1, 2, 5, 20, 29, 31, 32, 60, 119, 120, 121, 400, 1500]:
+        for _ in range(4):
+            low = int(rng.integers(engine.year_start(95), engine.year_start(106)))
+            high = low + length - 1
+            expected = [(e.start, e.end, e) for e in events if e.start <= high and e.end >= low]
+            expected += [(o, o + rule.duration - 1, rule) for rule in store._rules
+                         for o in _brute_occurrences(engine, rule, low, high)]
+            found = store.between(low, high)
+            key = lambda item: (item[0], item[1], item[2].name, id(item[2]))
+            assert sorted(found, key=key) == sorted(expected, key=key)
+            assert [item[0] for item in found] == sorted(item[0] for item in found)
+    rule = next(r for r in store._rules if isinstance(r, RecurringEvent))
+    store.remove(rule)
+    assert all(item[2] is not rule for item in store.between(engine.year_start(95), engine.year_start(106)))
+
+
+def test_next_occurrence_matches_a_brute_force_scan(store, engine):
+    rng = np.random.default_rng(3)
+    events = [e for _, events in store._buckets.values() for e in events]
+    occurrences = [(rule, _brute_occurrences(engine, rule, engine.year_start(95), engine.year_start(120)))
+                   for rule in store._rules]
+    for _ in range(30):
+        after = int(rng.integers(engine.year_start(95), engine.year_start(106)))
+        for name in ["event 3", "rule 1", "rule 4", "missing"]:
+            starts = [e.start for e in events if e.name == name and e.start >= after]
+            starts += [o for rule, ordinals in occurrences if rule.name == name for o in ordinals if o >= after]
+            found = store.next_occurrence(name, after)
+            assert (found and found[0]) == (min(starts) if starts else None)
+
+
+def test_next_start_only_counts_leap_days_in_the_leap_month(engine):
+    from core.calendar_events import RecurringEvent
+    assert RecurringEvent("never", "yearly", month_index=0, day=32).next_start(engine, 0) is None
+    leap_day = RecurringEvent("leap day", "yearly", month_index=1, day=29)
+    assert engine.from_ordinal(leap_day.next_start(engine, engine.year_start(97))) == (104, 1, 29)
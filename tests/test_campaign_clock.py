@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from core import calendar_tracker, campaign_clock
+from core.campaign_clock import ClockStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "clocks.sqlite3")
+
+
+def _next_day(date):
+    return date[0], date[1], date[2] + 1
+
+
+def test_concurrent_updates_from_two_connections_all_count(db_path):
+    stores = [ClockStore(db_path), ClockStore(db_path)] # Separate connections, as separate processes would have
+    stores[0].create("main", (1478, 0, 0))
+    threads = [threading.Thread(target=lambda store=store: [store.update("main", _next_day) for _ in range(50)])
+               for store in stores for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stores[1].get("main") == ((1478, 0, 300), 301)
+    for store in stores:
+        store.close()
+
+
+def test_change_token_moves_on_every_write_and_only_then(db_path):
+    reader, writer = ClockStore(db_path), ClockStore(db_path)
+    token = reader.change_token()
+    assert reader.change_token() == token
+    writer.create("main", (1478, 0, 1))
+    assert reader.change_token() != token
+    token = reader.change_token()
+    reader.set("main", (1478, 0, 2)) # Own writes don't bump data_version for this connection
+    assert reader.change_token() != token
+    token = reader.change_token()
+    writer.create("main", (1, 0, 1)) # Exists already: nothing written
+    assert reader.change_token() == token
+    reader.close()
+    writer.close()
+
+
+def test_sessions_share_an_attached_clock(db_path, monkeypatch):
+    if calendar_tracker.CALENDAR is None:
+        pytest.skip("Calendar data not loaded.")
+    store = ClockStore(db_path)
+    first, second = {}, {}
+    for state in (first, second):
+        calendar_tracker.initialize_calendar_state(state)
+        calendar_tracker.attach_clock(state, store, "table")
+    calendar_tracker.advance_day(first, 3)
+    assert calendar_tracker.sync_clock(second)
+    assert calendar_tracker.get_current_date(second) == calendar_tracker.get_current_date(first) == (1478, 0, 4)
+    assert not calendar_tracker.sync_clock(second)
+    store.close()
+
+
+def test_default_path_is_outside_the_data_folder(monkeypatch):
+    monkeypatch.delenv("TIVMIR_CLOCK_DB", raising=False)
+    path = campaign_clock.default_clock_path()
+    assert os.path.dirname(path) == campaign_clock.STATE_DIR != campaign_clock.DATA_DIR
+    monkeypatch.setenv("TIVMIR_CLOCK_DB", "/elsewhere/clocks.db")
+    assert campaign_clock.default_clock_path() == "/elsewhere/clocks.db"
+
+
+def test_legacy_database_is_moved_once(tmp_path):
+    legacy, path = str(tmp_path / "data.sqlite3"), str(tmp_path / "state.sqlite3")
+    store = ClockStore(legacy)
+    store.create("main", (1478, 5, 6))
+    store.close()
+    campaign_clock._move_legacy_db(path, legacy)
+    assert ClockStore(path).get("main") == ((1478, 5, 6), 1)
+    with pytest.raises(sqlite3.OperationalError): # Gone from the old place
+        sqlite3.connect(f"file:{legacy}?mode=ro", uri=True).execute("SELECT 1 FROM clocks")
@@ -0,0 +1,16 @@
+import pytest
+
+from core.cli import build_parser
+
+
+@pytest.mark.parametrize("seed", ["-5", "x"])
+def test_seed_must_be_a_non_negative_integer(seed, capsys):
+    with pytest.raises(SystemExit) as exited:
+        build_parser().parse_args(["names", "--seed", seed])
+    assert exited.value.code == 2
+    assert "non-negative integer" in capsys.readouterr().err
+
+
+def test_seed_accepts_zero_and_large_values():
+    assert build_parser().parse_args(["names", "--seed", "0"]).seed == 0
+    assert build_parser().parse_args(["names", "--seed", str(2 ** 70)]).seed == 2 ** 70
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from core import corpus, data_loader, diagnostics
+
+
+def _write(data_dir, filename, text):
+    (data_dir / filename).write_text(text, encoding="utf-8")
+
+
+def test_malformed_file_degrades_only_that_file(tmp_path, monkeypatch):
+    _write(tmp_path, "good_names.json", json.dumps([{"text": "Ari"}]))
+    _write(tmp_path, "bad_names.json", '[{"text": "Bo"},')
+    messages = []
+    monkeypatch.setattr(diagnostics, "_sink", lambda level, message: messages.append(message))
+
+    assert corpus.open_corpus(str(tmp_path)) is None
+    assert any("compiled corpus" in m for m in messages)
+
+    monkeypatch.setattr(data_loader, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(data_loader, "_json_cache", {})
+    monkeypatch.setattr(data_loader, "_corpus", None)
+    monkeypatch.setattr(data_loader, "_corpus_checked", False)
+    assert data_loader.load_json("good_names.json") == [{"text": "Ari"}]
+    assert data_loader.load_json("bad_names.json") == []
+    assert any("bad_names.json" in m for m in messages)
+
+
+def test_corpus_round_trips_the_json(tmp_path):
+    parts = [{"text": "Ae", "meaning": "star", "gender": "Unisex", "starts_vowel": True, "ends_vowel": True}]
+    other = {"months": [{"name": "Frost", "days": 30}], "year_suffix": "AR", "weight": 1.5}
+    _write(tmp_path, "parts.json", json.dumps(parts))
+    _write(tmp_path, "other.json", json.dumps(other))
+    compiled = corpus.open_corpus(str(tmp_path))
+    assert compiled.load("parts.json") == parts
+    assert compiled.load("other.json") == other
+
+
+def test_loads_are_labelled_by_source_without_a_second_corpus_lookup(tmp_path, monkeypatch):
+    from core import instrumentation
+    _write(tmp_path, "parts_names.json", json.dumps([{"text": "Ae"}]))
+    compiled = corpus.open_corpus(str(tmp_path))
+    _write(tmp_path, "late_names.json", json.dumps([{"text": "Bo"}])) # Not in the corpus
+    lookups = []
+    monkeypatch.setattr(data_loader, "get_corpus", lambda: lookups.append(1) or compiled)
+    monkeypatch.setattr(data_loader, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(data_loader, "_json_cache", {})
+    monkeypatch.setattr(instrumentation, "_enabled", True)
+    monkeypatch.setattr(instrumentation, "_loads", {})
+
+    assert data_loader.load_json("parts_names.json") == [{"text": "Ae"}]
+    assert data_loader.load_json("late_names.json") == [{"text": "Bo"}]
+    assert len(lookups) == 2
+    assert instrumentation._loads["parts_names.json"][2] == "corpus"
+    assert instrumentation._loads["late_names.json"][2] == "json"
+
+
+def _use_data_dir(monkeypatch, data_dir):
+    monkeypatch.setattr(data_loader, "DATA_DIR", str(data_dir))
+    monkeypatch.setattr(data_loader, "_json_cache", {})
+    monkeypatch.setattr(data_loader, "_corpus", None)
+    monkeypatch.setattr(data_loader, "_corpus_checked", False)
+
+
+def test_failed_build_leaves_no_temp_file(tmp_path, monkeypatch):
+    _write(tmp_path, "parts.json", json.dumps([{"text": "Ae"}]))
+    def refuse(src, dst):
+        raise PermissionError("corpus is mapped")
+    monkeypatch.setattr(corpus.os, "replace", refuse)
+    out_path = str(tmp_path / corpus.CORPUS_FILENAME)
+    with pytest.raises(PermissionError):
+        corpus.build_corpus(str(tmp_path), out_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["parts.json"]
+
+
+def test_json_null_is_parsed_once(tmp_path, monkeypatch):
+    _write(tmp_path, "empty.json", "null")
+    _use_data_dir(monkeypatch, tmp_path)
+    monkeypatch.setattr(data_loader, "USE_CORPUS", False)
+    parses = []
+    real = data_loader._read_json
+    monkeypatch.setattr(data_loader, "_read_json", lambda filename: parses.append(filename) or real(filename))
+    assert data_loader.load_json("empty.json") is None
+    assert data_loader.load_json("empty.json") is None
+    assert parses == ["empty.json"]
+
+
+def test_corpus_comes_back_after_a_partly_failed_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "_reload_listeners", [])
+    _write(tmp_path, "a.json", json.dumps({"v": 1}))
+    _write(tmp_path, "b.json", json.dumps({"v": 1}))
+    _use_data_dir(monkeypatch, tmp_path)
+    assert data_loader.get_corpus() is not None
+
+    _write(tmp_path, "a.json", '{"v": ')
+    _write(tmp_path, "b.json", json.dumps({"v": 2}))
+    assert data_loader.reload_files(["a.json", "b.json"]).files == {"b.json"}
+    assert data_loader.get_corpus() is None
+
+    _write(tmp_path, "a.json", json.dumps({"v": 3}))
+    data_loader.reload_files(["a.json", "deleted.json"]) # Still partial: one file is gone
+    assert data_loader.get_corpus().load("a.json") == {"v": 3}
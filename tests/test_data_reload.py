@@ -0,0 +1,61 @@
+import json
+import shutil
+
+import pytest
+
+from core import data_loader
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A copy of data/ wired in as DATA_DIR, with fresh caches and a recording reload listener."""
+    shutil.copytree(data_loader.DATA_DIR, tmp_path, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("compiled_corpus.bin", "*.sqlite3*"))
+    monkeypatch.setattr(data_loader, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(data_loader, "USE_CORPUS", False)
+    monkeypatch.setattr(data_loader, "_json_cache", {})
+    monkeypatch.setattr(data_loader.name_data, "_loaded", {})
+    events = []
+    monkeypatch.setattr(data_loader, "_reload_listeners", [events.append])
+    monkeypatch.setattr(data_loader, "deities", data_loader._load_global("deities"), raising=False)
+    return tmp_path, events
+
+
+def _write(path, value):
+    path.write_text(value if isinstance(value, str) else json.dumps(value), encoding="utf-8")
+
+
+def test_changed_tables_are_swapped_and_bad_files_keep_the_old_snapshot(data_dir):
+    tmp_path, events = data_dir
+    old_elf, old_orc, old_deities = data_loader.name_data["elf"], data_loader.name_data["orc"], data_loader.deities
+    old_prefixes = list(old_elf["prefixes"])
+    new_prefixes = [{"text": "Zyl", "meaning": "new", "starts_vowel": False, "ends_vowel": False}]
+    _write(tmp_path / "elven_prefixes.json", new_prefixes)
+    _write(tmp_path / "deities.json", '[{"name": ') # Broken mid-save
+
+    event = data_loader.reload_files(["elven_prefixes.json", "deities.json"])
+    assert (event.files, event.races, event.globals) == ({"elven_prefixes.json"}, {"elf"}, frozenset())
+    assert events == [event]
+    new_elf = data_loader.name_data["elf"]
+    assert new_elf is not old_elf and new_elf["prefixes"] == new_prefixes
+    assert new_elf["suffixes"] is old_elf["suffixes"] # Unchanged tables are shared, not re-read
+    assert old_elf["prefixes"] == old_prefixes # Holders of the old race dict keep a consistent snapshot
+    assert data_loader.name_data["orc"] is old_orc
+    assert data_loader.deities is old_deities
+
+    _write(tmp_path / "deities.json", {"name": "Not a list"}) # Parses, but is the wrong type
+    assert data_loader.reload_files(["deities.json"]) is None
+    assert data_loader.deities is old_deities and len(events) == 1
+
+    _write(tmp_path / "deities.json", [{"name": "Aster"}])
+    event = data_loader.reload_files(["deities.json"])
+    assert event.globals == {"deities"} and data_loader.deities == [{"name": "Aster"}]
+
+
+def test_unloaded_races_pick_up_changes_on_first_use(data_dir):
+    tmp_path, events = data_dir
+    new_prefixes = [{"text": "Vorn", "meaning": "new", "starts_vowel": False, "ends_vowel": False}]
+    _write(tmp_path / "drow_prefixes.json", new_prefixes)
+    event = data_loader.reload_files(["drow_prefixes.json"])
+    assert event.races == frozenset() # Nothing loaded it yet, so nothing was rebuilt
+    assert data_loader.name_data["drow"]["prefixes"] == new_prefixes
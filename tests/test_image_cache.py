@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from core import image_cache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _save(path, color, size=(400, 300)):
+    Image.new("RGB", size, color).save(path)
+
+
+def test_changed_source_gets_new_derivatives_and_old_ones_go(tmp_path):
+    source = tmp_path / "sun.png"
+    _save(source, "gold")
+    _save(tmp_path / "sun-moon.png", "grey") # Shares the "sun-" prefix; its derivatives must survive
+    first = image_cache.image_path("sun.png", images_dir=str(tmp_path))
+    other = image_cache.image_path("sun-moon.png", images_dir=str(tmp_path))
+    png = image_cache.image_path("sun.png", fmt="png", images_dir=str(tmp_path))
+    with Image.open(first) as image:
+        assert image.size == (200, 150)
+    assert image_cache.image_path("sun.png", images_dir=str(tmp_path)) == first
+
+    _save(source, "navy", (300, 400))
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9)) # Coarse filesystem clocks
+    second = image_cache.image_path("sun.png", images_dir=str(tmp_path))
+    assert second != first and os.path.exists(second)
+    with Image.open(second) as image:
+        red, _, blue = image.convert("RGB").getpixel((0, 0))
+        assert image.size == (150, 200) and red < 16 and blue > 112 # Navy, give or take WebP's loss
+    assert not os.path.exists(first) and not os.path.exists(png)
+    assert os.path.exists(other)
+
+
+def test_missing_source_returns_none(tmp_path):
+    assert image_cache.image_path("nowhere.png", images_dir=str(tmp_path)) is None
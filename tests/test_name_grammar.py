@@ -0,0 +1,37 @@
+import pytest
+
+from core.name_generators import GRAMMARS
+
+
+@pytest.mark.parametrize("gender", ["Female", "Any"])
+def test_unique_sampler_drains_orc_without_repeats(gender):
+    # The orc suffixes list "ka" and "ar" more than once
+    sampler = GRAMMARS["orc"].unique(gender, seed=7)
+    total = sampler.remaining
+    names = [data["name"] for data in sampler]
+    assert len(names) == total
+    assert len(set(names)) == len(names)
+    assert sampler.remaining == 0
+    assert sampler.draw()["error"]
+
+
+def test_unique_sampler_resumes_from_position():
+    first = GRAMMARS["elf"].unique(seed=3)
+    names = [first.draw()["name"] for _ in range(10)]
+    resumed = GRAMMARS["elf"].unique(seed=3, position=5)
+    assert [resumed.draw()["name"] for _ in range(5)] == names[5:]
+
+
+@pytest.mark.parametrize("race_key", ["orc", "common", "tabaxi"])
+def test_name_at_and_index_of_round_trip(race_key):
+    grammar = GRAMMARS[race_key]
+    names = [grammar.name_at(i) for i in range(grammar.count())]
+    assert len(set(names)) == len(names)
+    assert all(grammar.index_of(name) == i for i, name in enumerate(names))
+
+
+def test_index_of_rejects_foreign_names():
+    with pytest.raises(ValueError):
+        GRAMMARS["orc"].index_of("Zzzzqx")
+    with pytest.raises(IndexError):
+        GRAMMARS["orc"].name_at(GRAMMARS["orc"].count())
@@ -0,0 +1,38 @@
+import random
+import weakref
+
+from core.name_helpers import GlossIndex, _RESOLVED_LIMIT
+
+
+class Part(dict):
+    """A part dict that can be weakly referenced."""
+
+
+GLOSS = {"star": ["starlight", "the stars"], "Fire": ["flame"]}
+
+
+def test_gloss_cache_is_keyed_by_meaning_not_part_identity():
+    index = GlossIndex(GLOSS)
+    parts = [Part(text="Ae", meaning="Star / sky"), Part(text="Ith", meaning="fire")]
+    refs = [weakref.ref(part) for part in parts]
+    index.poetic(parts, random.Random(1))
+    for _ in range(1000):
+        index.poetic([Part(text="Ae", meaning="Star / sky")], random.Random(1))
+    assert len(index._resolved) == 2
+    del parts
+    assert all(ref() is None for ref in refs)
+
+
+def test_gloss_cache_is_bounded():
+    index = GlossIndex(GLOSS)
+    for i in range(_RESOLVED_LIMIT + 100):
+        assert index.resolve({"text": "x", "meaning": f"word{i}"}) == f"Word{i}"
+    assert len(index._resolved) == _RESOLVED_LIMIT
+
+
+def test_primed_meanings_resolve_to_options():
+    index = GlossIndex(GLOSS)
+    index.prime([{"text": "Ae", "meaning": "star"}, {"text": "Ith", "meaning": "FIRE/heat"}, "not a part"])
+    assert index.resolve({"meaning": "star"}) == ["starlight", "the stars"]
+    assert index.resolve({"meaning": "FIRE/heat"}) == ["flame"]
+    assert index.poetic([{"meaning": "fire"}], random.Random(0)).endswith("flame")
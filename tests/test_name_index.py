@@ -0,0 +1,40 @@
+import pytest
+
+from core.name_generators import GRAMMARS
+from core.name_index import annotate_roster, decompose_name
+
+
+@pytest.mark.parametrize("race_key", ["tabaxi", "common", "orc", "draconic"])
+def test_generated_names_decompose_to_their_parts(race_key):
+    for seed in range(50):
+        sample = GRAMMARS[race_key].sample("Any", seed)
+        texts = [p["text"] for p in sample["parts"]]
+        found = [[p["text"] for p in data["parts"]] for data in decompose_name(race_key, sample["name"], limit=200)]
+        assert texts in found
+
+
+@pytest.mark.parametrize("race_key", ["tabaxi", "common"])
+def test_annotated_results_render(race_key):
+    names = [GRAMMARS[race_key].sample("Any", seed)["name"] for seed in range(20)]
+    for result in annotate_roster(race_key, names, rng=1):
+        assert result.error is None
+        assert result.name in result.markdown()
+        assert [p["text"] for p in result.to_dict()["parts"]]
+
+
+def test_common_names_split_into_first_name_and_surname():
+    sample = GRAMMARS["common"].sample("Any", 3)
+    for data in decompose_name("common", sample["name"].upper()):
+        assert len(data["parts"]) == 2
+    result = next(annotate_roster("common", [sample["name"]]))
+    assert sample["parts"][1]["text"] in result.markdown()
+
+
+@pytest.mark.parametrize("race_key, name", [("tabaxi", "Noste"), ("common", "Alaric")])
+def test_names_outside_the_grammar_render_as_errors(race_key, name):
+    # A lone clan name or first name doesn't follow the race's grammar
+    result = next(annotate_roster(race_key, [name]))
+    assert result.error
+    assert result.markdown().startswith("Error:")
+    assert result.to_dict()["parts"] == []
+    assert decompose_name(race_key, name) == []
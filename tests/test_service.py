@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from core import service
+
+
+def _results(body):
+    return json.loads(body)["results"]
+
+
+def test_same_race_name_jobs_share_one_batch_call(monkeypatch):
+    calls = []
+    real = service.generate_samples
+    monkeypatch.setattr(service, "generate_samples", lambda *args: calls.append(args) or real(*args))
+    jobs = [
+        ("names", 3, None, ("Elf", "Any", None, None)),
+        ("names", 2, None, ("Elf", "Female", None, None)), # Elf names ignore gender
+        ("names", 4, None, ("Orc", "Male", None, None)),
+        ("names", 1, None, ("Genasi", "Any", None, "Fire")),
+        ("names", 2, None, ("Tabaxi", "Any", None, None)), # Draws a clan per name: not batched
+        ("names", 2, 7, ("Elf", "Any", None, None)), # Seeded: keeps its per-item streams
+    ]
+    bodies = service.run_batch(jobs)
+    assert sorted(calls) == [("elf", 5, "Any"), ("ignan", 1, "Any"), ("orc", 4, "Male")]
+    assert [len(_results(body)) for body in bodies] == [3, 2, 4, 1, 2, 2]
+    for body in bodies:
+        for item in _results(body):
+            assert item["error"] is None
+            assert item["name"] and item["parts"]
+    assert _results(bodies[0])[0]["race"] == "elf"
+    assert all(item["clan"] for item in _results(bodies[4]))
+    assert _results(bodies[5]) == _results(service.run_batch([jobs[5]])[0])
+
+
+def test_failed_group_only_fails_its_jobs(monkeypatch):
+    def broken(*args):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(service, "generate_samples", broken)
+    bodies = service.run_batch([("names", 1, None, ("Elf", "Any", None, None)), ("npcs", 1, 3, ("Any", None))])
+    assert isinstance(bodies[0], service.ServiceError) and bodies[0].status == 500
+    assert len(_results(bodies[1])) == 1
+
+
+def test_batcher_survives_a_failed_batch(monkeypatch):
+    real = service.run_batch
+    calls = []
+
+    def flaky(jobs):
+        calls.append(jobs)
+        if len(calls) == 1:
+            raise MemoryError()
+        return real(jobs)
+    monkeypatch.setattr(service, "run_batch", flaky)
+
+    async def scenario():
+        batcher = service.MicroBatcher()
+        batcher.start()
+        try:
+            job = ("names", 2, 5, ("Elf", "Any", None, None))
+            with pytest.raises(service.ServiceError) as failed:
+                await asyncio.wait_for(batcher.submit(job), 5)
+            body = await asyncio.wait_for(batcher.submit(job), 5)
+        finally:
+            await batcher.close()
+        return failed.value.status, body
+
+    status, body = asyncio.run(scenario())
+    assert status == 503
+    assert len(_results(body)) == 2 and len(calls) == 2
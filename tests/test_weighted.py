@@ -0,0 +1,57 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from core import name_batch
+from core.name_batch import _Pools
+from core.name_grammar import compile_grammar
+from core.name_helpers import alias_table, weighted_choice
+
+WEIGHTS = [1, 0, 5, 0.5, 12, 3, 1, 0, 7.25, 2] # Skewed, with zero-weight entries
+DRAWS = 50_000
+
+
+def _parts(weights):
+    return [{"text": f"p{i}", "weight": w} for i, w in enumerate(weights)]
+
+
+def assert_fits(counts, weights):
+    """Chi-square goodness of fit at p = 0.001 (Wilson-Hilferty critical value); zero weights must never be drawn."""
+    assert all(c == 0 for c, w in zip(counts, weights) if w == 0)
+    total, weight_sum = sum(counts), sum(weights)
+    cells = [(c, total * w / weight_sum) for c, w in zip(counts, weights) if w > 0]
+    dof = len(cells) - 1
+    k = 2 / (9 * dof)
+    limit = dof * (1 - k + 3.090 * math.sqrt(k)) ** 3
+    assert sum((c - e) ** 2 / e for c, e in cells) <= limit
+
+
+def test_weighted_choice_follows_the_weights():
+    entries = _parts(WEIGHTS)
+    table = alias_table(entries)
+    rng = random.Random(1)
+    counts = [0] * len(entries)
+    for _ in range(DRAWS):
+        counts[int(weighted_choice(entries, table, rng)["text"][1:])] += 1
+    assert_fits(counts, WEIGHTS)
+
+
+def test_batch_pools_follow_each_lists_weights():
+    unweighted = [{"text": f"u{i}"} for i in range(4)]
+    weighted = _parts(WEIGHTS)
+    pools = _Pools([unweighted, weighted], [None, alias_table(weighted)])
+    rng = np.random.default_rng(2)
+    counts = np.bincount(pools.draw(rng, rng.integers(0, 2, DRAWS)), minlength=len(pools.texts)).tolist()
+    assert_fits(counts[:4], [1] * 4)
+    assert_fits(counts[4:], WEIGHTS)
+
+
+def test_batch_names_follow_the_weights(monkeypatch):
+    grammar = compile_grammar("weighted", "Weighted", "names(nogloss)", {"names": _parts(WEIGHTS)})
+    monkeypatch.setattr(name_batch, "GRAMMARS", {"weighted": grammar})
+    monkeypatch.setattr(name_batch, "_plans", {})
+    names = name_batch.generate_names("weighted", DRAWS, seed=3)
+    counts = np.bincount([int(name[1:]) for name in names], minlength=len(WEIGHTS)).tolist()
+    assert_fits(counts, WEIGHTS)